@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+▲ ATLAS vectorized intelligence scoring.
+
+Turns batches of pattern vector payloads into a padded float32 matrix and
+scores every row in one NumPy pass: the heuristic intelligence score used by
+``/intelligence/analyze``, L2 norms, mirror symmetry and cosine similarity to
+the stored design vectors. ``VectorIndex`` answers top-k similarity queries
+over stored analyses and designs.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def vector_matrix(payloads: Sequence[Any]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Flatten each payload to a row and zero-pad to a common width.
+
+    Returns the ``(n, dim)`` float32 matrix and the true length of every row.
+    Values too large for float32 become inf; see ``nonfinite_rows``.
+    """
+    with np.errstate(over="ignore"):
+        try:
+            matrix = np.asarray(payloads, dtype=np.float32).reshape(len(payloads), -1)
+            lengths = np.full(len(payloads), matrix.shape[1], dtype=np.int64)
+            return matrix, lengths
+        except ValueError:
+            pass
+
+        rows = [np.asarray(payload if payload is not None else [], dtype=np.float32).ravel() for payload in payloads]
+    lengths = np.fromiter((row.size for row in rows), dtype=np.int64, count=len(rows))
+    width = int(lengths.max()) if len(rows) else 0
+    matrix = np.zeros((len(rows), width), dtype=np.float32)
+    for index, row in enumerate(rows):
+        matrix[index, : row.size] = row
+    return matrix, lengths
+
+
+def nonfinite_rows(matrix: "np.ndarray") -> "np.ndarray":
+    """Indices of rows holding inf or NaN, which must not be scored or indexed."""
+    return np.flatnonzero(~np.isfinite(matrix).all(axis=1))
+
+
+def pad_columns(matrix: "np.ndarray", width: int) -> "np.ndarray":
+    if matrix.shape[1] >= width:
+        return matrix
+    padded = np.zeros((matrix.shape[0], width), dtype=matrix.dtype)
+    padded[:, : matrix.shape[1]] = matrix
+    return padded
+
+
+def normalize_rows(matrix: "np.ndarray") -> "np.ndarray":
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def mirror_symmetry(matrix: "np.ndarray", lengths: "np.ndarray") -> "np.ndarray":
+    """1.0 for palindromic rows, falling towards 0.0 as a row and its mirror diverge."""
+    width = matrix.shape[1]
+    columns = np.arange(width)
+    if width and np.all(lengths == width):
+        mirrored = matrix[:, ::-1]
+    else:
+        # Reverse only the populated prefix of each row; padding maps onto itself.
+        index = np.where(columns < lengths[:, None], lengths[:, None] - 1 - columns, columns)
+        mirrored = np.take_along_axis(matrix, index, axis=1)
+    norms = np.linalg.norm(matrix, axis=1)
+    distance = np.linalg.norm(matrix - mirrored, axis=1)
+    ratio = np.divide(distance, 2 * norms, out=np.zeros_like(norms), where=norms > 0)
+    return 1.0 - ratio
+
+
+def score_batch(
+    patterns: Sequence[str],
+    counts: "np.ndarray",
+    matrix: "np.ndarray",
+    lengths: "np.ndarray",
+    design_matrix: "np.ndarray",
+) -> Dict[str, "np.ndarray"]:
+    """Score a batch of patterns.
+
+    ``counts`` holds ``len(vectors)`` per pattern so scores match the
+    single-pattern endpoint; ``design_matrix`` holds unit-normalized design
+    vectors (one per row, possibly zero rows).
+    """
+    symmetric_name = np.fromiter(
+        ("symmetry" in pattern.lower() for pattern in patterns), dtype=bool, count=len(patterns)
+    )
+    scores = np.where(counts > 0, np.minimum(1.0, 0.5 + 0.1 * counts), 0.4)
+    scores = np.minimum(1.0, scores + 0.2 * symmetric_name)
+
+    result = {
+        "intelligence_score": scores,
+        "norm": np.linalg.norm(matrix, axis=1),
+        "symmetry": mirror_symmetry(matrix, lengths),
+    }
+    if design_matrix.shape[0]:
+        width = max(matrix.shape[1], design_matrix.shape[1])
+        similarity = normalize_rows(pad_columns(matrix, width)) @ pad_columns(design_matrix, width).T
+        result["nearest_design"] = np.argmax(similarity, axis=1)
+        result["design_similarity"] = similarity[np.arange(len(patterns)), result["nearest_design"]]
+    return result
+
+
+def compact(values: "np.ndarray", decimals: int = 4) -> List[Any]:
+    if np.issubdtype(values.dtype, np.floating):
+        return np.round(values.astype(np.float64), decimals).tolist()
+    return values.tolist()
+
+
+class VectorIndex:
+    """Incremental cosine top-k index.
+
+    Below ``ivf_threshold`` rows every query is an exact brute-force scan.
+    Above it an IVF layout (spherical k-means centroids plus inverted lists)
+    probes the ``nprobe`` closest lists and reranks their rows exactly. New
+    rows are routed to their nearest list on insert; the centroids are
+    retrained whenever the index has doubled since the last training.
+    Discarded rows are tombstoned and compacted away once they exceed
+    ``compact_min`` and a quarter of the stored rows; ``len`` counts live rows.
+    """
+
+    def __init__(
+        self, ivf_threshold: int = 50_000, nprobe: int = 8, seed: int = 528, compact_min: int = 1024
+    ) -> None:
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.compact_min = compact_min
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._data = np.zeros((0, 0), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._labels: List[Any] = []
+        self._size = 0
+        self._dead = 0
+        self._centroids: Optional["np.ndarray"] = None
+        self._lists: List[List["np.ndarray"]] = []
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return self._size - self._dead
+
+    @property
+    def method(self) -> str:
+        return "exact" if self._centroids is None else "ivf"
+
+    def add(self, matrix: "np.ndarray", labels: Sequence[Any]) -> None:
+        if not len(labels):
+            return
+        rows = normalize_rows(np.asarray(matrix, dtype=np.float32).reshape(len(labels), -1))
+        with self._lock:
+            start = self._size
+            self._reserve(len(labels), rows.shape[1])
+            self._data[start : start + len(labels), : rows.shape[1]] = rows
+            self._alive[start : start + len(labels)] = True
+            self._labels.extend(labels)
+            self._size += len(labels)
+            if self._size >= self.ivf_threshold and self._size >= 2 * self._trained_size:
+                self._train()
+            elif self._centroids is not None:
+                self._route(np.arange(start, self._size))
+
+    def discard(self, predicate: Any) -> int:
+        """Tombstone every row whose label satisfies ``predicate``."""
+        with self._lock:
+            removed = 0
+            for index, label in enumerate(self._labels):
+                if self._alive[index] and predicate(label):
+                    self._alive[index] = False
+                    removed += 1
+            self._dead += removed
+            if self._dead >= max(self.compact_min, self._size // 4):
+                self._compact()
+            return removed
+
+    def search(self, query: "np.ndarray", k: int = 10, nprobe: Optional[int] = None) -> List[Tuple[Any, float]]:
+        with self._lock:
+            if not self._size:
+                return []
+            width = self._data.shape[1]
+            vector = np.asarray(query, dtype=np.float32).ravel()
+            vector = normalize_rows(vector.reshape(1, -1))[0]
+            vector = np.pad(vector[:width], (0, max(0, width - vector.size)))
+
+            if self._centroids is None:
+                candidates = np.arange(self._size)
+                similarity = self._data[: self._size] @ vector
+            else:
+                probes = min(nprobe or self.nprobe, len(self._lists))
+                closest = np.argpartition(self._centroids @ vector, -probes)[-probes:]
+                chunks = [chunk for list_id in closest for chunk in self._lists[list_id]]
+                if not chunks:
+                    return []
+                candidates = np.concatenate(chunks)
+                similarity = self._data[candidates] @ vector
+            # Non-finite rows (stored before input was checked) must not claim top-k slots
+            similarity = np.where(self._alive[candidates] & np.isfinite(similarity), similarity, -np.inf)
+
+            k = min(k, similarity.size)
+            top = np.argpartition(similarity, -k)[-k:]
+            top = top[np.argsort(similarity[top])[::-1]]
+            return [
+                (self._labels[candidates[index]], float(similarity[index]))
+                for index in top
+                if np.isfinite(similarity[index])
+            ]
+
+    def _reserve(self, rows: int, width: int) -> None:
+        capacity, current_width = self._data.shape
+        needed = self._size + rows
+        new_width = max(current_width, width)
+        if needed <= capacity and new_width == current_width:
+            return
+        new_capacity = max(needed, 2 * capacity, 1024) if needed > capacity else capacity
+        data = np.zeros((new_capacity, new_width), dtype=np.float32)
+        data[: self._size, :current_width] = self._data[: self._size]
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[: self._size] = self._alive[: self._size]
+        self._data, self._alive = data, alive
+        if self._centroids is not None:
+            self._centroids = pad_columns(self._centroids, new_width)
+
+    def _compact(self) -> None:
+        keep = np.flatnonzero(self._alive[: self._size])
+        self._data[: keep.size] = self._data[keep]
+        self._data[keep.size : self._size] = 0
+        self._alive[: keep.size] = True
+        self._alive[keep.size : self._size] = False
+        self._labels = [self._labels[index] for index in keep.tolist()]
+        self._size, self._dead = keep.size, 0
+        if self._centroids is not None:
+            self._lists = [[] for _ in self._lists]
+            self._route(np.arange(self._size))
+
+    def _train(self, iterations: int = 10) -> None:
+        data = self._data[: self._size]
+        nlist = int(min(4096, max(16, math.sqrt(self._size))))
+        sample_size = min(self._size, 256 * nlist)
+        sample = data[self._rng.choice(self._size, sample_size, replace=False)]
+        centroids = sample[self._rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(assignment, kind="stable")
+            populated, starts = np.unique(assignment[order], return_index=True)
+            centroids[populated] = normalize_rows(np.add.reduceat(sample[order], starts, axis=0))
+        self._centroids = centroids
+        self._lists = [[] for _ in range(nlist)]
+        self._trained_size = self._size
+        self._route(np.arange(self._size))
+
+    def _route(self, rows: "np.ndarray", chunk: int = 65_536) -> None:
+        assert self._centroids is not None
+        for start in range(0, rows.size, chunk):
+            block = rows[start : start + chunk]
+            assignment = np.argmax(self._data[block] @ self._centroids.T, axis=1)
+            order = np.argsort(assignment, kind="stable")
+            list_ids, starts = np.unique(assignment[order], return_index=True)
+            for list_id, members in zip(list_ids, np.split(block[order], starts[1:])):
+                bucket = self._lists[list_id]
+                bucket.append(members)
+                if len(bucket) > 32:
+                    bucket[:] = [np.concatenate(bucket)]
@@ -6,13 +6,36 @@ Frequency: 528 Hz (Port 5280)
 
 from __future__ import annotations
 
+import heapq
 import json
-import logging
+import threading
+import uuid
+from bisect import bisect_left
 from datetime import datetime
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from socketserver import ThreadingMixIn
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import atlas_intelligence
+from atlas_intelligence import np
+import mcp_metrics
+import mcp_runtime
+from mcp_runtime import (
+    COMPACT_SEPARATORS,
+    DATA_DIR,
+    HTTPError,
+    JSONListStore,
+    NodeRequestHandler,
+    NodeSpec,
+    PageRequest,
+    ResponseCache,
+    TimeRange,
+    batch_summary,
+    item_error,
+    load_json,
+    ndjson_chunks,
+    node_logger,
+    run_nodes,
+)
 
 SYMBOL = "▲"
 NAME = "ATLAS"
@@ -20,104 +43,432 @@ PORT = 5280
 FREQUENCY = 528
 FUNCTION = "Intelligence / Design"
 VERSION = "1.0.0"
+MAX_BODY_BYTES = 64 * 1024 * 1024
 
-logging.basicConfig(
-    level=logging.INFO,
-    format=f"{SYMBOL} %(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
-logger = logging.getLogger(__name__)
+logger = node_logger(__name__, SYMBOL)
 
-DATA_DIR = Path(__file__).with_name("data")
 DESIGNS_PATH = DATA_DIR / "design_registry.json"
+DESIGN_LOG_PATH = DATA_DIR / "design_registry.jsonl"
 ANALYTICS_PATH = DATA_DIR / "intelligence_history.json"
-
-DATA_DIR.mkdir(exist_ok=True)
-
-
-def load_json(path: Path, default: Any) -> Any:
-    if not path.exists():
-        return default
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        logger.warning("Failed to parse %s; resetting.", path)
-        return default
-
-
-def save_json(path: Path, payload: Any) -> None:
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+BATCH_LOG_PATH = DATA_DIR / "intelligence_batches.jsonl"
+VECTORS_PATH = DATA_DIR / "intelligence_vectors.f32"
 
 
 def ensure_store() -> None:
-    if not DESIGNS_PATH.exists():
-        save_json(DESIGNS_PATH, [])
-    if not ANALYTICS_PATH.exists():
-        save_json(ANALYTICS_PATH, [])
-
-
-ensure_store()
-
-
-class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
-    """Handle requests in their own threads."""
-
-
-class ATLASRequestHandler(BaseHTTPRequestHandler):
+    mcp_runtime.ensure_store(ANALYTICS_PATH)
+
+
+class DesignRegistry:
+    """Versioned design index backed by an append-only JSONL log.
+
+    Every create appends a ``create`` entry carrying the next version for that
+    name; archiving appends an ``archive`` entry that hides the design from
+    lookups while keeping its history. The log is replayed once, on first use,
+    into a name -> latest-version index plus per-name history.
+
+    Listings page newest-first from the tail of ``_slots``: each design's
+    latest version in log order, with ``_positions`` holding the matching
+    log entry numbers for bisecting a cursor. A superseded or archived slot
+    becomes ``None`` and the lists are compacted once such slots outnumber
+    live ones. Cursors are log entry numbers, so they stay valid across
+    restarts (the log replays to the same positions).
+    """
+
+    def __init__(self, log_path: Path, legacy_path: Optional[Path] = None) -> None:
+        self.log_path = log_path
+        self.legacy_path = legacy_path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._history: Dict[str, List[Dict[str, Any]]] = {}
+        self._slots: List[Optional[Dict[str, Any]]] = []
+        self._positions: List[int] = []
+        self._slot_of: Dict[str, int] = {}
+        self._applied = 0
+        self._vector_cache: Optional[Any] = None
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        if not self.log_path.exists():
+            self._migrate_legacy()
+        else:
+            with self.log_path.open(encoding="utf-8") as handle:
+                for line_number, line in enumerate(handle, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        self._apply(json.loads(line))
+                    except (json.JSONDecodeError, KeyError):
+                        logger.warning("Skipping corrupt registry entry %s:%d", self.log_path, line_number)
+        self._loaded = True
+
+    def _migrate_legacy(self) -> None:
+        legacy: List[Dict[str, Any]] = load_json(self.legacy_path, []) if self.legacy_path else []
+        entries = []
+        for design in legacy:
+            if isinstance(design, dict) and "name" in design:
+                record = {**design, "version": len(self._history.get(design["name"], [])) + 1}
+                entry = {"op": "create", "design": record}
+                self._apply(entry)
+                entries.append(entry)
+        with self.log_path.open("a", encoding="utf-8") as handle:
+            handle.writelines(json.dumps(entry, separators=COMPACT_SEPARATORS) + "\n" for entry in entries)
+        if entries:
+            logger.info("Migrated %d legacy designs into %s", len(entries), self.log_path.name)
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        self._vector_cache = None
+        if entry["op"] == "create":
+            design = entry["design"]
+            self._history.setdefault(design["name"], []).append(design)
+            self._latest.pop(design["name"], None)
+            self._latest[design["name"]] = design
+            self._vacate(design["name"])
+            self._slot_of[design["name"]] = len(self._slots)
+            self._slots.append(design)
+            self._positions.append(self._applied)
+        elif entry["op"] == "archive":
+            self._latest.pop(entry["name"], None)
+            self._vacate(entry["name"])
+        self._applied += 1
+
+    def _vacate(self, name: str) -> None:
+        slot = self._slot_of.pop(name, None)
+        if slot is None:
+            return
+        self._slots[slot] = None
+        if len(self._slots) - len(self._latest) > max(1024, len(self._latest)):
+            live = [index for index, design in enumerate(self._slots) if design is not None]
+            self._slots = [self._slots[index] for index in live]
+            self._positions = [self._positions[index] for index in live]
+            self._slot_of = {design["name"]: index for index, design in enumerate(self._slots)}
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        with self.log_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry, separators=COMPACT_SEPARATORS) + "\n")
+        self._apply(entry)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._latest)
+
+    def get(self, name: str, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._ensure_loaded()
+            if version is None:
+                return self._latest.get(name)
+            history = self._history.get(name, [])
+            if 1 <= version <= len(history):
+                return history[version - 1]
+            return None
+
+    def versions(self, name: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._ensure_loaded()
+            return list(self._history.get(name, []))
+
+    def create(self, design: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self._ensure_loaded()
+            record = {**design, "version": len(self._history.get(design["name"], [])) + 1}
+            self._append({"op": "create", "design": record})
+            return record
+
+    def create_many(self, designs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create several designs with one log write; repeated names get successive versions."""
+        with self._lock:
+            self._ensure_loaded()
+            pending: Dict[str, int] = {}
+            entries = []
+            for design in designs:
+                name = design["name"]
+                pending[name] = pending.get(name, len(self._history.get(name, []))) + 1
+                entries.append({"op": "create", "design": {**design, "version": pending[name]}})
+            with self.log_path.open("a", encoding="utf-8") as handle:
+                handle.writelines(json.dumps(entry, separators=COMPACT_SEPARATORS) + "\n" for entry in entries)
+            for entry in entries:
+                self._apply(entry)
+            return [entry["design"] for entry in entries]
+
+    def archive(self, name: str) -> bool:
+        with self._lock:
+            self._ensure_loaded()
+            if name not in self._latest:
+                return False
+            self._append({"op": "archive", "name": name, "archived_at": datetime.now().isoformat()})
+            return True
+
+    def active(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._ensure_loaded()
+            return list(self._latest.values())
+
+    @property
+    def version(self) -> int:
+        """Number of log entries applied; bumps on every create and archive."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._applied
+
+    def page(self, request: PageRequest) -> Tuple[List[Dict[str, Any]], Optional[str], int]:
+        """Newest-first page of active designs, with the next cursor and total count."""
+        with self._lock:
+            self._ensure_loaded()
+            index = bisect_left(self._positions, request.after) if request.after is not None else len(self._slots)
+            designs: List[Dict[str, Any]] = []
+            while index > 0 and not (request.limit and len(designs) >= request.limit):
+                index -= 1
+                design = self._slots[index]
+                if design is not None:
+                    designs.append(request.project(design))
+            more = bool(designs) and any(self._slots[earlier] is not None for earlier in range(index - 1, -1, -1))
+            cursor = str(self._positions[index]) if more else None
+            return designs, cursor, len(self._latest)
+
+    def vector_matrix(self) -> Any:
+        """Return ``(names, unit-normalized matrix)`` for active designs carrying vectors."""
+        with self._lock:
+            self._ensure_loaded()
+            if self._vector_cache is None:
+                designs = []
+                for design in self._latest.values():
+                    if not design.get("vectors"):
+                        continue
+                    try:
+                        atlas_intelligence.vector_matrix([design["vectors"]])
+                    except (TypeError, ValueError):
+                        # Written before create validated vectors; skip rather than fail every caller
+                        logger.warning(
+                            "Skipping design %s v%s: vectors are not numeric", design["name"], design.get("version")
+                        )
+                        continue
+                    designs.append(design)
+                matrix, _ = atlas_intelligence.vector_matrix([design["vectors"] for design in designs])
+                names = [design["name"] for design in designs]
+                self._vector_cache = (names, atlas_intelligence.normalize_rows(matrix))
+            return self._vector_cache
+
+
+class IntelligenceBatchStore:
+    """Append-only store for batch analyses.
+
+    Vectors go to a raw little-endian float32 side file; each batch appends a
+    single JSONL entry holding its byte offset, shape and per-row results.
+    """
+
+    def __init__(self, log_path: Path, vectors_path: Path) -> None:
+        self.log_path = log_path
+        self.vectors_path = vectors_path
+        self._lock = threading.Lock()
+
+    def append(self, entry: Dict[str, Any], matrix: Any) -> Dict[str, Any]:
+        with self._lock:
+            with self.vectors_path.open("ab") as handle:
+                offset = handle.tell()
+                handle.write(matrix.astype("<f4", copy=False).tobytes())
+            entry = {**entry, "vector_offset": offset, "vector_shape": list(matrix.shape)}
+            with self.log_path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, separators=COMPACT_SEPARATORS) + "\n")
+            return entry
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """Yield every stored batch entry, oldest first, reading the log lazily."""
+        if not self.log_path.exists():
+            return
+        with self.log_path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn tail of an in-progress append
+
+    def iter_batches(self) -> Iterator[Tuple[Dict[str, Any], Any]]:
+        """Yield ``(entry, matrix)`` for every stored batch."""
+        for entry in self.iter_entries():
+            rows, columns = entry["vector_shape"]
+            matrix = np.fromfile(self.vectors_path, dtype="<f4", count=rows * columns, offset=entry["vector_offset"])
+            yield entry, matrix.reshape(rows, columns)
+
+
+class SimilarityCatalog:
+    """Lazily built ``VectorIndex`` over stored analyses and designs.
+
+    Writers hold ``lock`` across persisting a record and calling ``insert`` so
+    the first build, which replays the stores, never double-counts or misses
+    a concurrent write.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self._index: Optional[atlas_intelligence.VectorIndex] = None
+
+    def index(self) -> atlas_intelligence.VectorIndex:
+        with self.lock:
+            if self._index is None:
+                self._index = self._build()
+            return self._index
+
+    def insert(self, matrix: Any, labels: List[Tuple[str, str, Any]]) -> None:
+        with self.lock:
+            if self._index is not None:
+                self._index.add(matrix, labels)
+
+    def discard_design(self, *names: str) -> None:
+        with self.lock:
+            if self._index is not None:
+                self._index.discard(lambda label: label[0] == "design" and label[1] in names)
+
+    def _build(self) -> atlas_intelligence.VectorIndex:
+        index = atlas_intelligence.VectorIndex()
+        for design in DESIGN_REGISTRY.active():
+            if design.get("vectors"):
+                rows = _vector_rows(design["vectors"], ("design", design["name"], design["version"]))
+                if rows:
+                    index.add(*rows)
+        for record in HISTORY.snapshot():
+            if record.get("vectors"):
+                rows = _vector_rows(record["vectors"], ("analysis", record["pattern"], record["timestamp"]))
+                if rows:
+                    index.add(*rows)
+        for entry, matrix in BATCH_STORE.iter_batches():
+            index.add(matrix, [("analysis", pattern, entry["batch_id"]) for pattern in entry["pattern"]])
+        logger.info("Built similarity index (%d vectors, %s)", len(index), index.method)
+        return index
+
+
+def _design_record(data: Dict[str, Any]) -> Dict[str, Any]:
+    record = {
+        "name": data.get("name", "unnamed_design"),
+        "intent": data.get("intent", ""),
+        "geometry": data.get("geometry", "tetrahedral"),
+        "components": data.get("components", ["core", "boundary", "flow"]),
+        "created_at": datetime.now().isoformat(),
+    }
+    if data.get("vectors"):
+        record["vectors"] = data["vectors"]
+    return record
+
+
+def _design_error(data: Dict[str, Any]) -> Optional[str]:
+    name = data.get("name", "unnamed_design")
+    if not isinstance(name, str) or not name:
+        return "name must be a non-empty string"
+    if not isinstance(data.get("components", []), list):
+        return "components must be a list"
+    if data.get("vectors") and np is not None and _vector_rows(data["vectors"], ("design", name, 0)) is None:
+        return "vectors must be finite numbers"
+    return None
+
+
+def _vector_rows(vectors: Any, label: Tuple[str, str, Any]) -> Optional[Tuple[Any, List[Tuple[str, str, Any]]]]:
+    try:
+        matrix, _ = atlas_intelligence.vector_matrix([vectors])
+    except (TypeError, ValueError):
+        return None
+    if atlas_intelligence.nonfinite_rows(matrix).size:
+        return None
+    return matrix, [label]
+
+
+def _batch_rows(window: TimeRange) -> Iterator[Dict[str, Any]]:
+    """One row per pattern of every stored batch inside ``window`` (vectors stay on disk)."""
+    for entry in BATCH_STORE.iter_entries():
+        timestamp = entry.get("timestamp")
+        if timestamp not in window:
+            continue
+        for pattern, geometry, score, length in zip(
+            entry["pattern"], entry["recognized_geometry"], entry["intelligence_score"], entry["vector_lengths"]
+        ):
+            yield {
+                "kind": "batch",
+                "batch_id": entry["batch_id"],
+                "timestamp": timestamp,
+                "pattern": pattern,
+                "recognized_geometry": geometry,
+                "intelligence_score": score,
+                "vector_length": length,
+            }
+
+
+def _history_rows(window: TimeRange) -> Iterator[Dict[str, Any]]:
+    """Single analyses and batch rows inside ``window``, merged oldest first."""
+    analyses = ({"kind": "analysis", **record} for record in HISTORY.window(window))
+    return heapq.merge(analyses, _batch_rows(window), key=lambda row: row["timestamp"])
+
+
+DESIGN_REGISTRY = DesignRegistry(DESIGN_LOG_PATH, legacy_path=DESIGNS_PATH)
+HISTORY = JSONListStore(ANALYTICS_PATH, keep=300)
+DESIGN_RESPONSES = ResponseCache()
+BATCH_STORE = IntelligenceBatchStore(BATCH_LOG_PATH, VECTORS_PATH)
+SIMILARITY = SimilarityCatalog()
+mcp_metrics.STORE_RECORDS.set_function(lambda: len(DESIGN_REGISTRY), node=NAME, store="designs")
+mcp_metrics.STORE_RECORDS.set_function(lambda: len(HISTORY), node=NAME, store="intelligence_history")
+
+if np is None:
+    logger.warning(
+        "NumPy not available; /intelligence/analyze/batch and /intelligence/similar are disabled. "
+        "Install with: pip install numpy"
+    )
+
+
+class ATLASRequestHandler(NodeRequestHandler):
     server_version = f"{NAME}-MCP/{VERSION}"
-
-    def log_message(self, format: str, *args: Any) -> None:  # noqa: A003
-        logger.info("%s - %s", self.address_string(), format % args)
+    node_logger = logger
+    node_name = NAME
+    metric_prefixes = ("/design/",)
 
     def _write_json(self, payload: Dict[str, Any]) -> None:
-        body = json.dumps(payload).encode("utf-8")
-        self.send_response(200)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(body)))
-        self.end_headers()
-        self.wfile.write(body)
+        self.send_json(payload)
 
     def do_GET(self) -> None:  # noqa: N802
         if self.path == "/health":
             self._write_json(self._health_payload())
+        elif self.path == "/metrics":
+            self.send_metrics()
         elif self.path == "/resonance":
             self._write_json(self._resonance_payload())
+        elif self.path.startswith("/design/") and self.path.endswith("/versions"):
+            pattern = self.path[len("/design/"):-len("/versions")]
+            self._write_json(self._design_versions(pattern))
         elif self.path.startswith("/design/"):
             pattern = self.path.rsplit("/", 1)[-1]
-            self._write_json(self._design_pattern(pattern))
+            self._write_json(self._design_pattern(pattern, self._query_int("version")))
         elif self.path == "/designs":
-            self._write_json(self._list_designs())
+            self.send_versioned_json(DESIGN_RESPONSES, lambda: DESIGN_REGISTRY.version, self._list_designs)
+        elif self.path == "/intelligence/history/export":
+            self.send_stream(ndjson_chunks(_history_rows(self.time_range())))
         elif self.path == "/intelligence/history":
             self._write_json(self._intelligence_history())
         else:
             self._write_json(self._root_payload())
 
     def do_POST(self) -> None:  # noqa: N802
-        length = int(self.headers.get("Content-Length", "0") or "0")
-        raw = self.rfile.read(length)
-        try:
-            envelope = json.loads(raw.decode("utf-8"))
-        except json.JSONDecodeError:
-            self.send_error(400, "Invalid JSON payload")
+        if self.path == "/design/create/batch":
+            self._write_json(self._create_designs(self.read_batch()))
             return
-
-        context = envelope.get("geometric_context") if isinstance(envelope, dict) else None
-        if context:
-            logger.debug("Received geometric context: %s", context)
-        data = envelope.get("payload") if isinstance(envelope, dict) and "payload" in envelope else envelope
-        if not isinstance(data, dict):
-            self.send_error(400, "Payload must be a JSON object")
-            return
-
+        data = self.read_envelope()
         if self.path == "/design/create":
             self._write_json(self._create_design(data))
         elif self.path == "/intelligence/analyze":
             self._write_json(self._analyze_intelligence(data))
+        elif self.path == "/intelligence/analyze/batch":
+            self._write_json(self._analyze_intelligence_batch(data))
+        elif self.path == "/intelligence/similar":
+            self._write_json(self._similar_patterns(data))
         elif self.path == "/design/archive":
             self._write_json(self._archive_design(data))
         else:
             self.send_error(404, "Unknown endpoint")
 
+    def _query_int(self, name: str) -> Optional[int]:
+        values = self.query.get(name)
+        try:
+            return int(values[0]) if values else None
+        except ValueError:
+            return None
+
     def _health_payload(self) -> Dict[str, Any]:
         return {
             "status": "operational",
@@ -145,23 +496,30 @@ class ATLASRequestHandler(BaseHTTPRequestHandler):
             "function": FUNCTION,
             "endpoints": [
                 "/health",
+                "/metrics",
                 "/resonance",
                 "/design/{pattern}",
+                "/design/{pattern}/versions",
                 "/design/create",
-                 "/design/archive",
+                "/design/create/batch",
+                "/design/archive",
                 "/designs",
                 "/intelligence/analyze",
+                "/intelligence/analyze/batch",
+                "/intelligence/similar",
                 "/intelligence/history",
+                "/intelligence/history/export",
             ],
             "description": "Pattern intelligence and design synthesis node for the Sacred FIELD lattice.",
         }
 
-    def _design_pattern(self, pattern: str) -> Dict[str, Any]:
-        registry: List[Dict[str, Any]] = load_json(DESIGNS_PATH, [])
-        for design in registry:
-            if design["name"] == pattern:
-                logger.info("Retrieving stored design %s", pattern)
-                return {"status": "found", "design": design}
+    def _design_pattern(self, pattern: str, version: Optional[int] = None) -> Dict[str, Any]:
+        design = DESIGN_REGISTRY.get(pattern, version)
+        if design is not None:
+            logger.info("Retrieving stored design %s (version=%s)", pattern, design["version"])
+            return {"status": "found", "design": design}
+        if version is not None:
+            return {"status": "missing", "design_name": pattern, "version": version}
 
         logger.info("Synthetically generating design %s", pattern)
         return {
@@ -175,20 +533,50 @@ class ATLASRequestHandler(BaseHTTPRequestHandler):
         }
 
     def _create_design(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        error = _design_error(data)
+        if error:
+            raise HTTPError(400, error)
         name = data.get("name", "unnamed_design")
-        registry: List[Dict[str, Any]] = load_json(DESIGNS_PATH, [])
-        design_record = {
-            "name": name,
-            "intent": data.get("intent", ""),
-            "geometry": data.get("geometry", "tetrahedral"),
-            "components": data.get("components", ["core", "boundary", "flow"]),
-            "created_at": datetime.now().isoformat(),
-        }
-        logger.info("Creating design %s (geometry=%s)", name, design_record["geometry"])
-        registry.append(design_record)
-        save_json(DESIGNS_PATH, registry[-500:])
+        design_record = _design_record(data)
+        with SIMILARITY.lock:
+            design_record = DESIGN_REGISTRY.create(design_record)
+            if np is not None:
+                # A new version replaces the old one's vectors even when it has none itself
+                SIMILARITY.discard_design(name)
+                if design_record.get("vectors"):
+                    rows = _vector_rows(design_record["vectors"], ("design", name, design_record["version"]))
+                    if rows:
+                        SIMILARITY.insert(*rows)
+        logger.info(
+            "Creating design %s v%d (geometry=%s)", name, design_record["version"], design_record["geometry"]
+        )
         return {"status": "created", "design": design_record}
 
+    def _create_designs(self, items: List[Any]) -> Dict[str, Any]:
+        results: List[Dict[str, Any]] = []
+        accepted, positions = [], []
+        for index, item in enumerate(items):
+            error = item_error(item) or _design_error(item)
+            results.append({"index": index, "status": "error", "message": error} if error else {})
+            if not error:
+                accepted.append(_design_record(item))
+                positions.append(index)
+
+        with SIMILARITY.lock:
+            created = DESIGN_REGISTRY.create_many(accepted) if accepted else []
+            if np is not None and created:
+                latest = {design["name"]: design for design in created}
+                SIMILARITY.discard_design(*latest)
+                indexed = [design for design in latest.values() if design.get("vectors")]
+                if indexed:
+                    matrix, _ = atlas_intelligence.vector_matrix([design["vectors"] for design in indexed])
+                    SIMILARITY.insert(matrix, [("design", d["name"], d["version"]) for d in indexed])
+
+        for index, design in zip(positions, created):
+            results[index] = {"index": index, "status": "created", "design": design}
+        logger.info("Created design batch (created=%d rejected=%d)", len(created), len(items) - len(created))
+        return batch_summary(results)
+
     def _analyze_intelligence(self, data: Dict[str, Any]) -> Dict[str, Any]:
         pattern = data.get("pattern", "unspecified")
         vectors = data.get("vectors", [])
@@ -213,42 +601,130 @@ class ATLASRequestHandler(BaseHTTPRequestHandler):
             "vectors": vectors,
             "timestamp": datetime.now().isoformat(),
         }
-        history: List[Dict[str, Any]] = load_json(ANALYTICS_PATH, [])
-        history.append(record)
-        save_json(ANALYTICS_PATH, history[-300:])
+        with SIMILARITY.lock:
+            HISTORY.append(record)
+            rows = _vector_rows(vectors, ("analysis", pattern, record["timestamp"])) if vectors and np is not None else None
+            if rows:
+                SIMILARITY.insert(*rows)
 
         return {"status": "analyzed", **record}
 
+    def _analyze_intelligence_batch(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if np is None:
+            return {"status": "error", "message": "NumPy required for batch analysis"}
+        items = data.get("patterns")
+        if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+            raise HTTPError(400, "patterns must be a non-empty list of objects")
+
+        patterns = [str(item.get("pattern", "unspecified")) for item in items]
+        payloads = [item.get("vectors") or [] for item in items]
+        try:
+            matrix, lengths = atlas_intelligence.vector_matrix(payloads)
+        except (TypeError, ValueError):
+            return {"status": "error", "message": "vectors must be numeric"}
+        invalid = atlas_intelligence.nonfinite_rows(matrix)
+        if invalid.size:
+            listed = ", ".join(str(index) for index in invalid[:10].tolist())
+            raise HTTPError(400, f"vectors must be finite numbers (items {listed})")
+        counts = np.fromiter(
+            (len(payload) if isinstance(payload, list) else 1 for payload in payloads),
+            dtype=np.int64,
+            count=len(payloads),
+        )
+        design_names, design_matrix = DESIGN_REGISTRY.vector_matrix()
+        scored = atlas_intelligence.score_batch(patterns, counts, matrix, lengths, design_matrix)
+
+        default_geometry = data.get("geometry", "tetrahedral")
+        geometries = [item.get("geometry", default_geometry) for item in items]
+        results = {
+            "pattern": patterns,
+            "intelligence_score": atlas_intelligence.compact(scored["intelligence_score"]),
+            "norm": atlas_intelligence.compact(scored["norm"]),
+            "symmetry": atlas_intelligence.compact(scored["symmetry"]),
+        }
+        if "nearest_design" in scored:
+            results["nearest_design"] = [design_names[index] for index in scored["nearest_design"]]
+            results["design_similarity"] = atlas_intelligence.compact(scored["design_similarity"])
+
+        batch = {
+            "batch_id": f"batch-{uuid.uuid4().hex}",
+            "timestamp": datetime.now().isoformat(),
+            "count": len(patterns),
+            "pattern": patterns,
+            "recognized_geometry": geometries,
+            "intelligence_score": results["intelligence_score"],
+            "vector_lengths": lengths.tolist(),
+        }
+        with SIMILARITY.lock:
+            entry = BATCH_STORE.append(batch, matrix)
+            SIMILARITY.insert(matrix, [("analysis", pattern, entry["batch_id"]) for pattern in patterns])
+        logger.info("Analyzed intelligence batch %s (patterns=%d dim=%d)", entry["batch_id"], len(patterns), matrix.shape[1])
+        return {"status": "analyzed", "batch_id": entry["batch_id"], "count": len(patterns), "results": results}
+
+    def _similar_patterns(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if np is None:
+            return {"status": "error", "message": "NumPy required for similarity search"}
+        vectors = data.get("vectors")
+        if not vectors:
+            return {"status": "error", "message": "vectors required"}
+        try:
+            query, _ = atlas_intelligence.vector_matrix([vectors])
+            k = max(1, int(data.get("k", 10)))
+        except (TypeError, ValueError):
+            return {"status": "error", "message": "vectors must be numeric and k an integer"}
+        if atlas_intelligence.nonfinite_rows(query).size:
+            raise HTTPError(400, "vectors must be finite numbers")
+        kind = data.get("kind")
+
+        index = SIMILARITY.index()
+        matches = index.search(query[0], k * 4 if kind else k)
+        results = [
+            {"kind": label[0], "name": label[1], "ref": label[2], "similarity": round(similarity, 4)}
+            for label, similarity in matches
+            if not kind or label[0] == kind
+        ][:k]
+        return {"status": "ok", "method": index.method, "indexed": len(index), "k": k, "results": results}
+
     def _archive_design(self, data: Dict[str, Any]) -> Dict[str, Any]:
         name = data.get("name")
         if not name:
             return {"status": "error", "message": "Design name required"}
-        registry: List[Dict[str, Any]] = load_json(DESIGNS_PATH, [])
-        retained = [design for design in registry if design["name"] != name]
-        removed = len(registry) - len(retained)
-        save_json(DESIGNS_PATH, retained)
+        with SIMILARITY.lock:
+            removed = DESIGN_REGISTRY.archive(name)
+            if removed and np is not None:
+                SIMILARITY.discard_design(name)
         logger.info("Archived design %s (removed=%s)", name, bool(removed))
         return {"status": "archived" if removed else "missing", "design_name": name}
 
+    def _design_versions(self, pattern: str) -> Dict[str, Any]:
+        versions = DESIGN_REGISTRY.versions(pattern)
+        return {"design_name": pattern, "count": len(versions), "versions": versions}
+
     def _list_designs(self) -> Dict[str, Any]:
-        registry: List[Dict[str, Any]] = load_json(DESIGNS_PATH, [])
-        return {"count": len(registry), "designs": registry}
+        designs, cursor, total = DESIGN_REGISTRY.page(self.page_request())
+        return {"count": total, "designs": designs, "next": cursor}
 
     def _intelligence_history(self) -> Dict[str, Any]:
-        history: List[Dict[str, Any]] = load_json(ANALYTICS_PATH, [])
-        return {"count": len(history), "analyses": history}
+        analyses, cursor, total = HISTORY.page(self.page_request())
+        return {"count": total, "analyses": analyses, "next": cursor}
+
+
+NODE = NodeSpec(
+    name=NAME,
+    handler_class=ATLASRequestHandler,
+    host="",
+    port=PORT,
+    options={"max_body_bytes": MAX_BODY_BYTES},
+    startup=ensure_store,
+    banner=[
+        f"Starting {SYMBOL} {NAME} MCP server on port {PORT}",
+        f"Frequency: {FREQUENCY} Hz — Function: {FUNCTION}",
+    ],
+)
 
 
 def run() -> None:
-    server = ThreadedHTTPServer(("", PORT), ATLASRequestHandler)
-    logger.info("Starting %s %s MCP server on port %s", SYMBOL, NAME, PORT)
-    logger.info("Frequency: %s Hz — Function: %s", FREQUENCY, FUNCTION)
-    try:
-        server.serve_forever()
-    except KeyboardInterrupt:
-        logger.info("Stopping %s MCP server", NAME)
-    finally:
-        server.server_close()
+    run_nodes([NODE])
 
 
 if __name__ == "__main__":
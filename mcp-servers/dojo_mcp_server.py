@@ -6,14 +6,13 @@ Frequency: 396 Hz (Port 3960)
 
 from __future__ import annotations
 
-import json
-import logging
 from datetime import datetime
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from socketserver import ThreadingMixIn
-from pathlib import Path
 from typing import Any, Dict, List
 
+import mcp_metrics
+import mcp_runtime
+from mcp_runtime import DATA_DIR, JSONListStore, NodeRequestHandler, NodeSpec, node_logger, run_nodes
+
 SYMBOL = "◼︎"
 NAME = "DOJO"
 PORT = 3960
@@ -21,70 +20,46 @@ FREQUENCY = 396
 FUNCTION = "Training / Execution"
 VERSION = "1.0.0"
 
-logging.basicConfig(
-    level=logging.INFO,
-    format=f"{SYMBOL} %(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
-logger = logging.getLogger(__name__)
+logger = node_logger(__name__, SYMBOL)
 
-DATA_DIR = Path(__file__).with_name("data")
 TRAINING_PATH = DATA_DIR / "training_sessions.json"
 EXECUTION_PATH = DATA_DIR / "execution_log.json"
 
-DATA_DIR.mkdir(exist_ok=True)
-
 
-def load_json(path: Path, default: Any) -> Any:
-    if not path.exists():
-        return default
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        logger.warning("Failed to parse %s; resetting.", path)
-        return default
-
-
-def save_json(path: Path, payload: Any) -> None:
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+SESSIONS = JSONListStore(TRAINING_PATH)
+EXECUTIONS = JSONListStore(EXECUTION_PATH)
+mcp_metrics.STORE_RECORDS.set_function(lambda: len(SESSIONS), node=NAME, store="training_sessions")
+mcp_metrics.STORE_RECORDS.set_function(lambda: len(EXECUTIONS), node=NAME, store="executions")
 
 
 def ensure_store() -> None:
-    if not TRAINING_PATH.exists():
-        save_json(TRAINING_PATH, [])
-    if not EXECUTION_PATH.exists():
-        save_json(EXECUTION_PATH, [])
-
+    mcp_runtime.ensure_store(TRAINING_PATH, EXECUTION_PATH)
 
-ensure_store()
 
-
-class DojoHandler(BaseHTTPRequestHandler):
+class DojoHandler(NodeRequestHandler):
     """Handle DOJO training and execution requests."""
 
+    node_logger = logger
+    node_name = NAME
+
     def do_GET(self):
         """Handle GET requests."""
         if self.path == "/health":
             self._respond(200, {"status": "healthy", "server": NAME, "frequency": FREQUENCY})
+        elif self.path == "/metrics":
+            self.send_metrics()
         elif self.path == "/training":
-            sessions = load_json(TRAINING_PATH, [])
-            self._respond(200, {"sessions": sessions})
+            sessions, cursor, total = SESSIONS.page(self.page_request())
+            self._respond(200, {"sessions": sessions, "count": total, "next": cursor})
         elif self.path == "/executions":
-            logs = load_json(EXECUTION_PATH, [])
-            self._respond(200, {"executions": logs})
+            logs, cursor, total = EXECUTIONS.page(self.page_request())
+            self._respond(200, {"executions": logs, "count": total, "next": cursor})
         else:
             self._respond(404, {"error": "Not found"})
 
     def do_POST(self):
         """Handle POST requests."""
-        content_length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(content_length).decode("utf-8")
-        
-        try:
-            data = json.loads(body)
-        except json.JSONDecodeError:
-            self._respond(400, {"error": "Invalid JSON"})
-            return
+        data = self.read_json()
 
         if self.path == "/training/start":
             self._start_training(data)
@@ -95,55 +70,51 @@ class DojoHandler(BaseHTTPRequestHandler):
 
     def _start_training(self, data: Dict[str, Any]):
         """Start a training session."""
-        sessions = load_json(TRAINING_PATH, [])
-        session = {
-            "id": len(sessions) + 1,
-            "timestamp": datetime.now().isoformat(),
-            "config": data,
-            "status": "started"
-        }
-        sessions.append(session)
-        save_json(TRAINING_PATH, sessions)
+        with SESSIONS.lock:
+            session = {
+                "id": len(SESSIONS) + 1,
+                "timestamp": datetime.now().isoformat(),
+                "config": data,
+                "status": "started"
+            }
+            SESSIONS.append(session)
         logger.info(f"Training session started: {session['id']}")
         self._respond(201, {"session": session})
 
     def _run_execution(self, data: Dict[str, Any]):
         """Run an execution task."""
-        logs = load_json(EXECUTION_PATH, [])
-        execution = {
-            "id": len(logs) + 1,
-            "timestamp": datetime.now().isoformat(),
-            "task": data,
-            "status": "completed"
-        }
-        logs.append(execution)
-        save_json(EXECUTION_PATH, logs)
+        with EXECUTIONS.lock:
+            execution = {
+                "id": len(EXECUTIONS) + 1,
+                "timestamp": datetime.now().isoformat(),
+                "task": data,
+                "status": "completed"
+            }
+            EXECUTIONS.append(execution)
         logger.info(f"Execution completed: {execution['id']}")
         self._respond(200, {"execution": execution})
 
     def _respond(self, code: int, payload: Dict[str, Any]):
         """Send JSON response."""
-        self.send_response(code)
-        self.send_header("Content-Type", "application/json")
-        self.end_headers()
-        self.wfile.write(json.dumps(payload).encode("utf-8"))
-
-    def log_message(self, format: str, *args):
-        """Override to use custom logger."""
-        logger.info(format % args)
-
-
-class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
-    """Handle requests in separate threads."""
-    pass
+        self.send_json(payload, status=code)
+
+
+NODE = NodeSpec(
+    name=NAME,
+    handler_class=DojoHandler,
+    host="0.0.0.0",
+    port=PORT,
+    startup=ensure_store,
+    banner=[
+        f"{SYMBOL} DOJO MCP Server starting on port {PORT} ({FREQUENCY}Hz)",
+        f"{SYMBOL} Function: {FUNCTION}",
+    ],
+)
 
 
 def run_server():
     """Run the DOJO MCP server."""
-    server = ThreadedHTTPServer(("0.0.0.0", PORT), DojoHandler)
-    logger.info(f"{SYMBOL} DOJO MCP Server starting on port {PORT} ({FREQUENCY}Hz)")
-    logger.info(f"{SYMBOL} Function: {FUNCTION}")
-    server.serve_forever()
+    run_nodes([NODE])
 
 
 if __name__ == "__main__":
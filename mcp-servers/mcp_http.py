@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Shared asyncio HTTP core for the Sacred Trident MCP servers.
+
+Speaks HTTP/1.1 with keep-alive, caps open connections and in-flight handler
+calls, enforces header/body size limits and drains connections on shutdown.
+Request bodies may be sent with Content-Length or ``Transfer-Encoding:
+chunked`` (so clients can stream NDJSON uploads); either way the decoded
+body is capped at ``max_body_bytes``.
+Handlers keep the ``do_GET``/``do_POST`` shape of ``BaseHTTPRequestHandler``
+but run on a bounded worker pool instead of one thread per connection.
+Responses above a size threshold are gzip/deflate-encoded on that pool when
+the client's ``Accept-Encoding`` allows it. ``send_stream`` answers with a
+chunked body pulled from an iterator on the same pool, so large exports are
+never held in memory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import signal
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from http import HTTPStatus
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type
+from urllib.parse import parse_qs, unquote, urlsplit
+
+logger = logging.getLogger("mcp_http")
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+MAX_CONNECTIONS = 256
+MAX_WORKERS = 16
+MAX_KEEPALIVE_REQUESTS = 1000
+KEEPALIVE_TIMEOUT = 15.0
+SHUTDOWN_GRACE = 5.0
+BODYLESS_STATUSES = frozenset({204, 304})
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_LEVEL = 6
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class HTTPError(Exception):
+    """Raised by handlers or the parser to answer with an error status."""
+
+    def __init__(self, status: int, message: str = "") -> None:
+        super().__init__(message)
+        self.status = int(status)
+        self.message = message or HTTPStatus(self.status).phrase
+
+
+class Headers(dict):
+    """Request headers keyed by lower-cased field name."""
+
+    def get(self, key: str, default: Any = None) -> Any:  # type: ignore[override]
+        return super().get(key.lower(), default)
+
+    def __getitem__(self, key: str) -> str:
+        return super().__getitem__(key.lower())
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and super().__contains__(key.lower())
+
+
+class MCPRequestHandler:
+    """Per-request handler with a ``BaseHTTPRequestHandler``-like surface.
+
+    ``path`` excludes the query string, which is parsed into ``query``.
+    Subclasses implement ``do_<METHOD>`` and answer through ``send_json``,
+    ``send_body`` or ``send_error``.
+    """
+
+    server_version = "MCP/1.0"
+    compress_min_bytes = COMPRESS_MIN_BYTES
+    compress_level = COMPRESS_LEVEL
+
+    def __init__(
+        self,
+        command: str,
+        target: str,
+        request_version: str,
+        headers: Headers,
+        body: bytes,
+        client_address: Tuple[str, int],
+    ) -> None:
+        self.command = command
+        self.request_version = request_version
+        self.requestline = f"{command} {target} {request_version}"
+        self.headers = headers
+        self.body = body
+        self.client_address = client_address
+        parts = urlsplit(target)
+        self.path = unquote(parts.path) or "/"
+        self.query: Dict[str, List[str]] = parse_qs(parts.query, keep_blank_values=True)
+        self.status = 200
+        self.response_headers: List[Tuple[str, str]] = []
+        self.response_body = b""
+        self.response_stream: Optional[Iterator[bytes]] = None
+
+    def handle_one(self) -> None:
+        """Dispatch to ``do_<METHOD>`` and log the outcome."""
+        method = getattr(self, f"do_{self.command}", None)
+        try:
+            if method is None:
+                raise HTTPError(501, f"Unsupported method ({self.command})")
+            method()
+        except HTTPError as exc:
+            self.send_error(exc.status, exc.message)
+        except Exception:  # noqa: BLE001 - last line of defence for a request
+            logger.exception("Unhandled error serving %s", self.requestline)
+            self.response_stream = None
+            self.send_error(500, "Internal server error")
+        self.encode_response()
+        self.log_request(self.status, len(self.response_body))
+
+    def encode_response(self) -> None:
+        """Compress the body with the client's preferred gzip/deflate coding."""
+        body = self.response_body
+        streaming = self.response_stream is not None
+        if self.status in BODYLESS_STATUSES or (not streaming and len(body) < self.compress_min_bytes):
+            return
+        names = {name.lower() for name, _ in self.response_headers}
+        content_type = next((value for name, value in self.response_headers if name.lower() == "content-type"), "")
+        if "content-encoding" in names or not content_type.startswith(COMPRESSIBLE_TYPES):
+            return
+        coding = negotiate_encoding(self.headers.get("accept-encoding", ""))
+        headers = [(name, value) for name, value in self.response_headers if name.lower() != "etag"]
+        if "vary" not in names:
+            headers.append(("Vary", "Accept-Encoding"))
+        if coding is not None:
+            if coding == "gzip":
+                compressor = zlib.compressobj(self.compress_level, zlib.DEFLATED, 31)
+            else:
+                compressor = zlib.compressobj(self.compress_level)
+            if streaming:
+                self.response_stream = _compress_stream(self.response_stream, compressor)
+            else:
+                self.response_body = compressor.compress(body) + compressor.flush()
+            headers.append(("Content-Encoding", coding))
+        for name, value in self.response_headers:
+            if name.lower() == "etag":
+                # Encoded bytes differ from the identity body: downgrade to a weak validator.
+                headers.append((name, value if coding is None or value.startswith("W/") else f"W/{value}"))
+        self.response_headers = headers
+
+    def read_body(self) -> bytes:
+        return self.body
+
+    def send_body(
+        self,
+        body: bytes,
+        content_type: str = "application/json",
+        status: int = 200,
+        headers: Optional[List[Tuple[str, str]]] = None,
+    ) -> None:
+        self.status = status
+        self.response_headers = [("Content-Type", content_type), *(headers or [])]
+        self.response_body = body
+
+    def send_stream(
+        self,
+        chunks: Iterable[bytes],
+        content_type: str = "application/x-ndjson",
+        status: int = 200,
+        headers: Optional[List[Tuple[str, str]]] = None,
+    ) -> None:
+        """Answer with a chunked body; ``chunks`` is consumed lazily on the worker pool."""
+        self.send_body(b"", content_type, status, headers)
+        self.response_stream = iter(chunks)
+
+    def send_json(self, payload: Any, status: int = 200) -> None:
+        self.send_body(json.dumps(payload).encode("utf-8"), status=status)
+
+    def send_error(self, code: int, message: Optional[str] = None) -> None:
+        self.send_json({"error": message or HTTPStatus(code).phrase, "status": code}, status=code)
+
+    def address_string(self) -> str:
+        return self.client_address[0]
+
+    def log_request(self, code: int, size: int) -> None:
+        self.log_message('"%s" %s %s', self.requestline, str(code), str(size))
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A003
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+class AsyncHTTPServer:
+    """Bounded keep-alive HTTP/1.1 server driving an ``MCPRequestHandler``."""
+
+    def __init__(
+        self,
+        handler_class: Type[MCPRequestHandler],
+        host: str = "",
+        port: int = 0,
+        *,
+        max_connections: int = MAX_CONNECTIONS,
+        max_workers: int = MAX_WORKERS,
+        max_header_bytes: int = MAX_HEADER_BYTES,
+        max_body_bytes: int = MAX_BODY_BYTES,
+        max_keepalive_requests: int = MAX_KEEPALIVE_REQUESTS,
+        keepalive_timeout: float = KEEPALIVE_TIMEOUT,
+    ) -> None:
+        self.handler_class = handler_class
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.max_header_bytes = max_header_bytes
+        self.max_body_bytes = max_body_bytes
+        self.max_keepalive_requests = max_keepalive_requests
+        self.keepalive_timeout = keepalive_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=handler_class.__name__
+        )
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+        self._idle: Set[asyncio.Task] = set()
+        self._closing = False
+
+    @property
+    def sockets(self) -> List[Any]:
+        return list(self._server.sockets) if self._server else []
+
+    async def start(self) -> None:
+        self._server = await self._listen(self.port)
+        if self.port == 0 and self._server.sockets:
+            ports = {sock.getsockname()[1] for sock in self._server.sockets}
+            port = self._server.sockets[0].getsockname()[1]
+            if len(ports) > 1:
+                # Each address family drew its own ephemeral port; rebind them all on the first.
+                self._server.close()
+                await self._server.wait_closed()
+                self._server = await self._listen(port)
+            self.port = port
+
+    async def _listen(self, port: int) -> asyncio.AbstractServer:
+        return await asyncio.start_server(
+            self._handle_connection,
+            self.host or None,
+            port,
+            limit=self.max_header_bytes,
+        )
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def shutdown(self, grace: float = SHUTDOWN_GRACE) -> None:
+        """Stop accepting, let in-flight requests finish, then close."""
+        self._closing = True
+        if self._server is not None:
+            self._server.close()
+        for task in list(self._idle):
+            task.cancel()
+        if self._connections:
+            _, pending = await asyncio.wait(set(self._connections), timeout=grace)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=False)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        assert task is not None
+        if self._closing or len(self._connections) >= self.max_connections:
+            await self._write_error(writer, 503, "Server busy", keep_alive=False)
+            writer.close()
+            return
+        self._connections.add(task)
+        peer = writer.get_extra_info("peername") or ("", 0)
+        try:
+            served = 0
+            keep_alive = True
+            while keep_alive and not self._closing:
+                self._idle.add(task)
+                try:
+                    request = await self._read_request(reader, writer)
+                except HTTPError as exc:
+                    await self._write_error(writer, exc.status, exc.message, keep_alive=False)
+                    break
+                finally:
+                    self._idle.discard(task)
+                if request is None:
+                    break
+                command, target, version, headers, body = request
+                served += 1
+                keep_alive = (
+                    self._wants_keep_alive(version, headers)
+                    and served < self.max_keepalive_requests
+                    and not self._closing
+                )
+                handler = self.handler_class(command, target, version, headers, body, peer[:2])
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self._executor, handler.handle_one)
+                if handler.response_stream is not None:
+                    # HTTP/1.0 has no chunked coding: delimit the body by closing.
+                    keep_alive = keep_alive and version == "HTTP/1.1"
+                    if not await self._write_stream(writer, handler, keep_alive):
+                        break
+                    continue
+                await self._write_response(writer, handler, keep_alive)
+        except (asyncio.CancelledError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> Optional[Tuple[str, str, str, Headers, bytes]]:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.keepalive_timeout)
+        except asyncio.TimeoutError:
+            return None
+        except asyncio.IncompleteReadError as exc:
+            if exc.partial.strip():
+                raise HTTPError(400, "Incomplete request head")
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431)
+
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split()
+        if len(parts) != 3:
+            raise HTTPError(400, "Malformed request line")
+        command, target, version = parts
+        if version not in ("HTTP/1.1", "HTTP/1.0"):
+            raise HTTPError(505)
+
+        headers = Headers()
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, sep, value = line.partition(":")
+            if not sep:
+                raise HTTPError(400, "Malformed header line")
+            headers[name.strip().lower()] = value.strip()
+
+        chunked = "transfer-encoding" in headers
+        if chunked:
+            if headers["transfer-encoding"].lower() != "chunked":
+                raise HTTPError(501, "Only chunked transfer coding is supported")
+            if "content-length" in headers:
+                raise HTTPError(400, "Both Transfer-Encoding and Content-Length")
+            length = 0
+        else:
+            try:
+                length = int(headers.get("content-length", "0") or "0")
+            except ValueError:
+                raise HTTPError(400, "Invalid Content-Length")
+            if length < 0:
+                raise HTTPError(400, "Invalid Content-Length")
+            if length > self.max_body_bytes:
+                raise HTTPError(413)
+        if (length or chunked) and headers.get("expect", "").lower() == "100-continue":
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            await writer.drain()
+        body = b""
+        try:
+            if chunked:
+                body = await self._read_chunked(reader)
+            elif length:
+                body = await asyncio.wait_for(reader.readexactly(length), self.keepalive_timeout)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+            raise HTTPError(400, "Incomplete request body")
+        return command.upper(), target, version, headers, body
+
+    async def _read_chunked(self, reader: asyncio.StreamReader) -> bytes:
+        """Decode a chunked request body (extensions and trailers are ignored)."""
+        parts: List[bytes] = []
+        total = 0
+        while True:
+            line = await asyncio.wait_for(reader.readuntil(b"\r\n"), self.keepalive_timeout)
+            try:
+                size = int(line.split(b";", 1)[0].strip(), 16)
+            except ValueError:
+                raise HTTPError(400, "Invalid chunk size")
+            if size < 0:
+                raise HTTPError(400, "Invalid chunk size")
+            if size == 0:
+                break
+            total += size
+            if total > self.max_body_bytes:
+                raise HTTPError(413)
+            parts.append(await asyncio.wait_for(reader.readexactly(size), self.keepalive_timeout))
+            if await asyncio.wait_for(reader.readexactly(2), self.keepalive_timeout) != b"\r\n":
+                raise HTTPError(400, "Malformed chunk")
+        while await asyncio.wait_for(reader.readuntil(b"\r\n"), self.keepalive_timeout) != b"\r\n":
+            pass  # trailer fields
+        return b"".join(parts)
+
+    @staticmethod
+    def _wants_keep_alive(version: str, headers: Headers) -> bool:
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    async def _write_response(
+        self, writer: asyncio.StreamWriter, handler: MCPRequestHandler, keep_alive: bool
+    ) -> None:
+        body = handler.response_body
+        head = [
+            f"HTTP/1.1 {handler.status} {_reason(handler.status)}",
+            f"Server: {handler.server_version}",
+            f"Date: {formatdate(usegmt=True)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if handler.status in BODYLESS_STATUSES:
+            body = b""
+        else:
+            head.append(f"Content-Length: {len(body)}")
+        head.extend(f"{name}: {value}" for name, value in handler.response_headers)
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _write_stream(
+        self, writer: asyncio.StreamWriter, handler: MCPRequestHandler, keep_alive: bool
+    ) -> bool:
+        """Write a streamed body; False if it failed and the connection must close."""
+        chunked = handler.request_version == "HTTP/1.1"
+        head = [
+            f"HTTP/1.1 {handler.status} {_reason(handler.status)}",
+            f"Server: {handler.server_version}",
+            f"Date: {formatdate(usegmt=True)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if chunked:
+            head.append("Transfer-Encoding: chunked")
+        head.extend(f"{name}: {value}" for name, value in handler.response_headers)
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+
+        loop = asyncio.get_running_loop()
+        stream = handler.response_stream
+        try:
+            while True:
+                chunk = await loop.run_in_executor(self._executor, next, stream, None)
+                if chunk is None:
+                    break
+                if not chunk:
+                    continue
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk) if chunked else chunk)
+                await writer.drain()
+        except ConnectionError:
+            return False
+        except Exception:  # noqa: BLE001 - headers are out; abort the body
+            logger.exception("Stream failed serving %s", handler.requestline)
+            return False
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except ValueError:
+                    pass  # still running on a worker after cancellation
+        if chunked:
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        return keep_alive
+
+    async def _write_error(
+        self, writer: asyncio.StreamWriter, status: int, message: str, keep_alive: bool
+    ) -> None:
+        handler = MCPRequestHandler("-", "/", "HTTP/1.1", Headers(), b"", ("", 0))
+        handler.server_version = self.handler_class.server_version
+        handler.send_error(status, message)
+        try:
+            await self._write_response(writer, handler, keep_alive)
+        except ConnectionError:
+            pass
+
+
+def _compress_stream(chunks: Iterator[bytes], compressor: Any) -> Iterator[bytes]:
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def negotiate_encoding(accept: str) -> Optional[str]:
+    """Pick ``gzip`` or ``deflate`` from an ``Accept-Encoding`` value, or None for identity."""
+    weights: Dict[str, float] = {}
+    for item in accept.split(","):
+        coding, _, params = item.strip().partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding:
+            weights[coding.strip().lower()] = weight
+    wildcard = weights.get("*", 0.0)
+    best = max(("gzip", "deflate"), key=lambda coding: weights.get(coding, wildcard))
+    return best if weights.get(best, wildcard) > 0 else None
+
+
+def _reason(status: int) -> str:
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ""
+
+
+async def serve_async(
+    handler_class: Type[MCPRequestHandler], host: str, port: int, **options: Any
+) -> None:
+    """Serve until SIGINT/SIGTERM, then shut down gracefully."""
+    server = AsyncHTTPServer(handler_class, host, port, **options)
+    await server.start()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    try:
+        await stop.wait()
+    finally:
+        await server.shutdown()
+
+
+def serve(handler_class: Type[MCPRequestHandler], host: str, port: int, **options: Any) -> None:
+    asyncio.run(serve_async(handler_class, host, port, **options))
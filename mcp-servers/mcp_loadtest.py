@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Load generator and scenario suite for the ATLAS, OBI-WAN and DOJO nodes.
+
+For every store size the harness seeds a fresh temporary ``MCP_DATA_DIR``
+with that many records per store, starts each node in its own process on an
+ephemeral port (``node:0``), and drives it with concurrent keep-alive
+clients issuing a seeded read/write mix. It reports throughput and
+p50/p99/p999 latency overall and per operation, plus the store sizes the
+node ended up holding (from ``/metrics``), so per-request cost can be
+compared across store sizes and commits::
+
+    python3 mcp_loadtest.py --sizes 0,1000,100000,1000000 --clients 1,16
+    python3 mcp_loadtest.py --nodes dojo --duration 5 --output dojo.json
+
+Clients are threads in this process; for high client counts on a small
+machine the generator itself can become the bottleneck.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import importlib
+import json
+import math
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from mcp_runtime import NODE_MODULES, configure_logging, dumps, node_logger
+
+logger = node_logger("mcp_loadtest", "◎")
+
+HERE = Path(__file__).resolve().parent
+RESULTS_FORMAT = 1
+STARTUP_TIMEOUT = 120.0
+REQUEST_TIMEOUT = 120.0
+SEED_EPOCH = datetime(2025, 1, 1)
+LISTENING = re.compile(r"listening on port (\d+)")
+STORE_GAUGE = re.compile(r'^mcp_store_records\{node="[^"]*",store="([^"]+)"\} (\S+)$', re.MULTILINE)
+
+
+# -- seeding -------------------------------------------------------------------
+
+
+def _stamp(index: int) -> str:
+    return (SEED_EPOCH + timedelta(seconds=index)).isoformat()
+
+
+def write_list(path: Path, records: Iterable[Dict[str, Any]], chunk: int = 10_000) -> None:
+    """Stream records into a JSON list file without building the list in memory."""
+    with path.open("wb") as handle:
+        handle.write(b"[")
+        buffer: List[bytes] = []
+        first = True
+        for record in records:
+            buffer.append(dumps(record))
+            if len(buffer) >= chunk:
+                handle.write((b"" if first else b",") + b",".join(buffer))
+                buffer, first = [], False
+        if buffer:
+            handle.write((b"" if first else b",") + b",".join(buffer))
+        handle.write(b"]")
+
+
+def write_lines(path: Path, records: Iterable[Dict[str, Any]]) -> None:
+    with path.open("wb") as handle:
+        handle.writelines(dumps(record) + b"\n" for record in records)
+
+
+def seed_dojo(module: Any, data_dir: Path, size: int) -> None:
+    write_list(
+        data_dir / module.TRAINING_PATH.name,
+        ({"id": i + 1, "timestamp": _stamp(i), "config": {"seed": i}, "status": "started"} for i in range(size)),
+    )
+    write_list(
+        data_dir / module.EXECUTION_PATH.name,
+        ({"id": i + 1, "timestamp": _stamp(i), "task": {"seed": i}, "status": "completed"} for i in range(size)),
+    )
+
+
+def seed_obiwan(module: Any, data_dir: Path, size: int) -> None:
+    write_list(
+        data_dir / module.MEMORY_PATH.name,
+        (
+            {"memory_id": f"mem-seed-{i}", "title": f"seed {i}", "content": "", "tags": ["seed"], "created_at": _stamp(i)}
+            for i in range(size)
+        ),
+    )
+    write_list(
+        data_dir / module.OBSERVATION_PATH.name,
+        (
+            {"observation_id": f"obs-seed-{i}", "entity": f"entity-{i % 97}", "details": "", "confidence": 0.75, "timestamp": _stamp(i)}
+            for i in range(size)
+        ),
+    )
+
+
+def seed_atlas(module: Any, data_dir: Path, size: int) -> None:
+    write_lines(
+        data_dir / module.DESIGN_LOG_PATH.name,
+        (
+            {
+                "op": "create",
+                "design": {
+                    "name": f"seed-{i}",
+                    "intent": "",
+                    "geometry": "tetrahedral",
+                    "components": ["core", "boundary", "flow"],
+                    "created_at": _stamp(i),
+                    "version": 1,
+                },
+            }
+            for i in range(size)
+        ),
+    )
+    write_list(
+        data_dir / module.ANALYTICS_PATH.name,
+        (
+            {"pattern": f"seed-{i}", "intelligence_score": 0.5, "recognized_geometry": "tetrahedral", "timestamp": _stamp(i)}
+            for i in range(size)
+        ),
+    )
+
+
+SEEDERS: Dict[str, Callable[[Any, Path, int], None]] = {
+    "atlas": seed_atlas,
+    "obiwan": seed_obiwan,
+    "dojo": seed_dojo,
+}
+
+
+# -- traffic -------------------------------------------------------------------
+
+
+@dataclass
+class Operation:
+    name: str
+    write: bool
+    method: str
+    path: Callable[[random.Random, int], str]
+    body: Optional[Callable[[random.Random, int], Dict[str, Any]]] = None
+
+
+def _existing(prefix: str) -> Callable[[random.Random, int], str]:
+    """Path naming a seeded record (or a miss when the store started empty)."""
+    return lambda rng, size: f"{prefix}{rng.randrange(max(size, 1))}"
+
+
+OPERATIONS: Dict[str, List[Operation]] = {
+    "dojo": [
+        Operation("list_training", False, "GET", lambda rng, size: "/training?limit=50"),
+        Operation("list_executions", False, "GET", lambda rng, size: "/executions?limit=50"),
+        Operation("start_training", True, "POST", lambda rng, size: "/training/start", lambda rng, size: {"epochs": rng.randrange(1, 10)}),
+        Operation("run_execution", True, "POST", lambda rng, size: "/execution/run", lambda rng, size: {"task": "load"}),
+    ],
+    "obiwan": [
+        Operation("list_memories", False, "GET", lambda rng, size: "/memories?limit=50"),
+        Operation("get_memory", False, "GET", _existing("/memory/mem-seed-")),
+        Operation("list_observations", False, "GET", lambda rng, size: "/observations?limit=50"),
+        Operation(
+            "store_memory", True, "POST", lambda rng, size: "/memory/store",
+            lambda rng, size: {"title": "load", "content": "x" * rng.randrange(16, 256), "tags": ["load"]},
+        ),
+        Operation(
+            "record_observation", True, "POST", lambda rng, size: "/observe/record",
+            lambda rng, size: {"entity": f"entity-{rng.randrange(97)}", "details": "load", "confidence": 0.5},
+        ),
+    ],
+    "atlas": [
+        Operation("list_designs", False, "GET", lambda rng, size: "/designs?limit=50"),
+        Operation("get_design", False, "GET", _existing("/design/seed-")),
+        Operation("list_history", False, "GET", lambda rng, size: "/intelligence/history?limit=50"),
+        Operation(
+            "create_design", True, "POST", lambda rng, size: "/design/create",
+            lambda rng, size: {"name": f"load-{rng.randrange(1_000_000)}", "intent": "load"},
+        ),
+        Operation(
+            "analyze", True, "POST", lambda rng, size: "/intelligence/analyze",
+            lambda rng, size: {"pattern": "load", "vectors": [rng.random() for _ in range(8)]},
+        ),
+    ],
+}
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def latency_summary(samples: Sequence[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "p50": round(percentile(ordered, 0.50) * 1000, 3),
+        "p99": round(percentile(ordered, 0.99) * 1000, 3),
+        "p999": round(percentile(ordered, 0.999) * 1000, 3),
+        "max": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        "mean": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+    }
+
+
+class Client(threading.Thread):
+    """One keep-alive connection issuing operations until ``deadline``."""
+
+    def __init__(
+        self,
+        port: int,
+        operations: List[Operation],
+        write_ratio: float,
+        size: int,
+        seed: str,
+        start: threading.Barrier,
+        measure_from: List[float],
+        deadline: List[float],
+    ) -> None:
+        super().__init__(daemon=True)
+        self.port = port
+        self.reads = [op for op in operations if not op.write]
+        self.writes = [op for op in operations if op.write]
+        self.write_ratio = write_ratio
+        self.size = size
+        self.rng = random.Random(seed)
+        self.start_barrier = start
+        self.measure_from = measure_from
+        self.deadline = deadline
+        self.samples: List[Tuple[str, float, bool]] = []
+
+    def _pick(self) -> Operation:
+        use_writes = self.writes and (not self.reads or self.rng.random() < self.write_ratio)
+        return self.rng.choice(self.writes if use_writes else self.reads)
+
+    def run(self) -> None:
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=REQUEST_TIMEOUT)
+        self.start_barrier.wait()
+        while True:
+            now = time.perf_counter()
+            if now >= self.deadline[0]:
+                break
+            op = self._pick()
+            body = dumps(op.body(self.rng, self.size)) if op.body else None
+            headers = {"Content-Type": "application/json"} if body is not None else {}
+            began = time.perf_counter()
+            try:
+                connection.request(op.method, op.path(self.rng, self.size), body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                ok = response.status < 400
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=REQUEST_TIMEOUT)
+                ok = False
+            if began >= self.measure_from[0]:
+                self.samples.append((op.name, time.perf_counter() - began, ok))
+        connection.close()
+
+
+def drive(
+    port: int, node: str, size: int, clients: int, duration: float, warmup: float, write_ratio: float, seed: int
+) -> Dict[str, Any]:
+    """Run one scenario and summarize its measured window."""
+    barrier = threading.Barrier(clients + 1)
+    measure_from, deadline = [math.inf], [math.inf]
+    workers = [
+        Client(port, OPERATIONS[node], write_ratio, size, f"{seed}:{node}:{size}:{clients}:{index}", barrier, measure_from, deadline)
+        for index in range(clients)
+    ]
+    for worker in workers:
+        worker.start()
+    started = time.perf_counter()
+    measure_from[0] = started + warmup
+    deadline[0] = measure_from[0] + duration
+    barrier.wait()
+    for worker in workers:
+        worker.join()
+
+    samples = [sample for worker in workers for sample in worker.samples]
+    by_operation: Dict[str, List[Tuple[float, bool]]] = {}
+    for name, elapsed, ok in samples:
+        by_operation.setdefault(name, []).append((elapsed, ok))
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for _, _, ok in samples if not ok),
+        "throughput_rps": round(len(samples) / duration, 1),
+        "latency_ms": latency_summary([elapsed for _, elapsed, _ in samples]),
+        "operations": {
+            name: {
+                "requests": len(entries),
+                "errors": sum(1 for _, ok in entries if not ok),
+                "latency_ms": latency_summary([elapsed for elapsed, _ in entries]),
+            }
+            for name, entries in sorted(by_operation.items())
+        },
+    }
+
+
+# -- servers -------------------------------------------------------------------
+
+
+class NodeProcess:
+    """A node served by ``mcp_runtime.py <node>:0`` against a given data directory."""
+
+    def __init__(self, node: str, data_dir: Path, access_log_sample: float) -> None:
+        self.node = node
+        env = {
+            **os.environ,
+            "MCP_DATA_DIR": str(data_dir),
+            "MCP_LOG_FORMAT": "json",
+            "MCP_ACCESS_LOG_SAMPLE": str(access_log_sample),
+        }
+        self.process = subprocess.Popen(
+            [sys.executable, str(HERE / "mcp_runtime.py"), f"{node}:0"],
+            cwd=HERE,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        self.port = self._await_port()
+        self.errors: List[str] = []
+        threading.Thread(target=self._drain, daemon=True).start()
+
+    def _await_port(self) -> int:
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        assert self.process.stderr is not None
+        while time.monotonic() < deadline:
+            line = self.process.stderr.readline()
+            if not line:
+                break
+            try:
+                message = json.loads(line).get("message", "")
+            except ValueError:
+                continue
+            match = LISTENING.search(message)
+            if match:
+                return int(match.group(1))
+        self.stop()
+        raise RuntimeError(f"{self.node} did not start listening (exit code {self.process.poll()})")
+
+    def _drain(self) -> None:
+        assert self.process.stderr is not None
+        for line in self.process.stderr:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("level") in ("ERROR", "CRITICAL"):
+                self.errors.append(record.get("message", ""))
+
+    def store_sizes(self) -> Dict[str, int]:
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=REQUEST_TIMEOUT)
+        try:
+            connection.request("GET", "/metrics")
+            text = connection.getresponse().read().decode("utf-8")
+        except (OSError, http.client.HTTPException):
+            return {}
+        finally:
+            connection.close()
+        return {store: int(float(value)) for store, value in STORE_GAUGE.findall(text)}
+
+    def stop(self) -> None:
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def run_suite(
+    nodes: Sequence[str],
+    sizes: Sequence[int],
+    client_counts: Sequence[int],
+    duration: float,
+    warmup: float,
+    write_ratio: float,
+    seed: int,
+    access_log_sample: float = 0.0,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    results = []
+    for size in sizes:
+        for node in nodes:
+            module = importlib.import_module(NODE_MODULES[node])
+            for clients in client_counts:
+                # Fresh data per scenario so earlier writes do not grow the store.
+                data_dir = Path(tempfile.mkdtemp(prefix=f"mcp-load-{node}-"))
+                try:
+                    seeded = time.perf_counter()
+                    SEEDERS[node](module, data_dir, size)
+                    seed_seconds = time.perf_counter() - seeded
+                    server = NodeProcess(node, data_dir, access_log_sample)
+                    try:
+                        result = {
+                            "node": node,
+                            "store_size": size,
+                            "clients": clients,
+                            "seed_seconds": round(seed_seconds, 3),
+                            **drive(server.port, node, size, clients, duration, warmup, write_ratio, seed),
+                            "final_store_records": server.store_sizes(),
+                            "server_errors": server.errors[:10],
+                        }
+                    finally:
+                        server.stop()
+                finally:
+                    shutil.rmtree(data_dir, ignore_errors=True)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+    return {
+        "format": RESULTS_FORMAT,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "nodes": list(nodes),
+            "sizes": list(sizes),
+            "clients": list(client_counts),
+            "duration": duration,
+            "warmup": warmup,
+            "write_ratio": write_ratio,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def _report(result: Dict[str, Any]) -> None:
+    latency = result["latency_ms"]
+    print(
+        f"{result['node']:<7} size={result['store_size']:<9,} clients={result['clients']:<4} "
+        f"{result['throughput_rps']:>9,.1f} req/s  p50={latency['p50']:.2f}ms  p99={latency['p99']:.2f}ms  "
+        f"p999={latency['p999']:.2f}ms  errors={result['errors']}",
+        flush=True,
+    )
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item.replace("_", "")) for item in value.split(",") if item]
+
+
+def main(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the Sacred Trident HTTP nodes.")
+    parser.add_argument("--nodes", default=",".join(NODE_MODULES), help="comma-separated nodes to test")
+    parser.add_argument("--sizes", type=_int_list, default=[0, 1_000, 100_000, 1_000_000], help="records seeded per store")
+    parser.add_argument("--clients", type=_int_list, default=[1, 16], help="concurrent client counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each scenario")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="fraction of requests that write")
+    parser.add_argument("--seed", type=int, default=528)
+    parser.add_argument("--access-log-sample", type=float, default=0.0, help="MCP_ACCESS_LOG_SAMPLE for the servers")
+    parser.add_argument("--output", default="loadtest_results.json", help="results file (JSON)")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    nodes = [node for node in args.nodes.split(",") if node]
+    unknown = [node for node in nodes if node not in NODE_MODULES]
+    if unknown:
+        parser.error(f"unknown nodes: {', '.join(unknown)}")
+    document = run_suite(
+        nodes, args.sizes, args.clients, args.duration, args.warmup, args.write_ratio, args.seed,
+        args.access_log_sample, on_result=_report,
+    )
+    Path(args.output).write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    logger.info("Results written to %s", args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Non-blocking logging for the Sacred Trident servers.
+
+``install_queue_logging`` puts every root handler behind a bounded queue:
+request threads only append the raw ``LogRecord`` (message template and
+arguments, unformatted) and a single listener thread formats and writes it.
+A full queue drops the record instead of blocking; the listener reports how
+many were dropped. Before writing, the listener suppresses bursts of an
+identical record (same logger, level, template and arguments) beyond
+``DUPLICATE_BURST`` per ``DUPLICATE_WINDOW`` seconds, and notes the
+suppressed count on the next one it lets through.
+
+Access logs are sampled at the source with ``sample_access``
+(``MCP_ACCESS_LOG_SAMPLE``, default 1.0); error responses are always logged.
+``MCP_LOG_FORMAT=json`` switches the node format to one JSON object per
+line via ``StructuredFormatter``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+LOG_FORMAT = os.getenv("MCP_LOG_FORMAT", "text")
+ACCESS_LOG_SAMPLE = float(os.getenv("MCP_ACCESS_LOG_SAMPLE", "1.0"))
+QUEUE_SIZE = 10_000
+DUPLICATE_WINDOW = 10.0
+DUPLICATE_BURST = 5
+MAX_TRACKED = 4096
+
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "symbol"}
+
+
+def sample_access(status: int) -> bool:
+    """Whether to log an access line for a response with ``status``."""
+    return status >= 400 or ACCESS_LOG_SAMPLE >= 1.0 or random.random() < ACCESS_LOG_SAMPLE
+
+
+class LazyQueueHandler(QueueHandler):
+    """Enqueue records as-is; formatting happens on the listener thread.
+
+    Arguments are formatted later, so callers must not mutate objects they
+    pass as log arguments.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DuplicateSuppressor:
+    """Admit at most ``burst`` identical records per ``window`` seconds."""
+
+    def __init__(self, window: float = DUPLICATE_WINDOW, burst: int = DUPLICATE_BURST) -> None:
+        self.window = window
+        self.burst = burst
+        self._seen: Dict[Hashable, List[float]] = {}
+
+    def admit(self, record: logging.LogRecord) -> bool:
+        key: Tuple[Any, ...] = (record.name, record.levelno, record.msg, record.args)
+        try:
+            entry = self._seen.get(key)
+        except TypeError:  # unhashable arguments: never suppressed
+            return True
+        now = record.created
+        if entry is None or now - entry[0] >= self.window:
+            if entry is not None and entry[1] > self.burst:
+                record.suppressed = int(entry[1] - self.burst)
+            if len(self._seen) >= MAX_TRACKED:
+                self._prune(now)
+            self._seen[key] = [now, 1]
+            return True
+        entry[1] += 1
+        return entry[1] <= self.burst
+
+    def _prune(self, now: float) -> None:
+        self._seen = {key: entry for key, entry in self._seen.items() if now - entry[0] < self.window}
+        if len(self._seen) >= MAX_TRACKED:
+            self._seen.clear()
+
+
+class LogPipeline(QueueListener):
+    """Listener thread: suppress duplicates, then hand records to the real handlers."""
+
+    def __init__(self, source: LazyQueueHandler, *handlers: logging.Handler) -> None:
+        super().__init__(source.queue, *handlers, respect_handler_level=True)
+        self.source = source
+        self.suppressor = DuplicateSuppressor()
+        self._reported_drops = 0
+
+    def handle(self, record: logging.LogRecord) -> None:
+        dropped = self.source.dropped
+        if dropped > self._reported_drops:
+            super().handle(logging.makeLogRecord({
+                "name": "mcp_logging",
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": "Log queue full; dropped %d records",
+                "args": (dropped - self._reported_drops,),
+            }))
+            self._reported_drops = dropped
+        if not self.suppressor.admit(record):
+            return
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            record.msg = f"{record.msg} [{suppressed} duplicates suppressed]"
+        super().handle(record)
+
+    def restart_in_child(self) -> None:
+        """After ``fork`` the listener thread is gone; start a fresh one on a new queue."""
+        self.queue = self.source.queue = queue.Queue(QUEUE_SIZE)
+        self._thread = None
+        self.start()
+
+
+class StructuredFormatter(logging.Formatter):
+    """One JSON object per record, including any ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        payload.update((key, value) for key, value in vars(record).items() if key not in _RESERVED)
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+_PIPELINE: Optional[LogPipeline] = None
+
+
+def install_queue_logging(*handlers: logging.Handler, level: Optional[int] = None) -> LogPipeline:
+    """Move the root handlers (plus ``handlers``) behind a queue and start the listener."""
+    global _PIPELINE
+    root = logging.getLogger()
+    if _PIPELINE is not None:
+        for handler in handlers:
+            _PIPELINE.handlers += (handler,)
+        return _PIPELINE
+    targets = [handler for handler in root.handlers if not isinstance(handler, QueueHandler)] + list(handlers)
+    source = LazyQueueHandler(queue.Queue(QUEUE_SIZE))
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(source)
+    if level is not None:
+        root.setLevel(level)
+    _PIPELINE = LogPipeline(source, *targets)
+    _PIPELINE.start()
+    atexit.register(_PIPELINE.stop)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_PIPELINE.restart_in_child)
+    return _PIPELINE
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Process-wide metrics for the Sacred Trident HTTP MCP servers.
+
+Counters, gauges and fixed-bucket histograms rendered in the Prometheus text
+exposition format for ``GET /metrics``. Handler threads never contend on a
+shared lock to record a sample: every thread writes into its own shard
+(registered once, under a lock, the first time that thread touches a
+metric) and a scrape sums the shards. Gauges are either set directly or
+read from a callback at scrape time, which is how store sizes are exported.
+
+Each metric caps its number of label sets; samples beyond the cap are folded
+into a single series whose labels all read ``other`` so an unbounded path or
+entity label cannot grow memory without limit.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MAX_SERIES = 512
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), max_series: int = MAX_SERIES):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._overflow = ("other",) * len(self.labelnames)
+        self._lock = threading.Lock()
+        self._series: Dict[LabelValues, None] = {}
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        if key in self._series:
+            return key
+        with self._lock:
+            if key not in self._series and len(self._series) >= self.max_series:
+                return self._overflow
+            self._series[key] = None
+        return key
+
+    def _labels(self, key: LabelValues, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def collect(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self._samples()
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class _Sharded(Metric):
+    """Per-thread shards of ``{label values: cell}``, summed on collection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+        self._shards: List[Dict[LabelValues, list]] = []
+
+    def _shard(self) -> Dict[LabelValues, list]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def _new_cell(self) -> list:
+        raise NotImplementedError
+
+    def _cell(self, labels: Dict[str, str]) -> list:
+        shard = self._shard()
+        key = self._key(labels)
+        cell = shard.get(key)
+        if cell is None:
+            cell = shard[key] = self._new_cell()
+        return cell
+
+    def _merged(self) -> Dict[LabelValues, list]:
+        with self._lock:
+            shards = list(self._shards)
+        merged: Dict[LabelValues, list] = {}
+        for shard in shards:
+            for key, cell in list(shard.items()):
+                total = merged.get(key)
+                if total is None:
+                    merged[key] = list(cell)
+                else:
+                    for index, value in enumerate(cell):
+                        total[index] += value
+        return merged
+
+
+class Counter(_Sharded):
+    kind = "counter"
+
+    def _new_cell(self) -> list:
+        return [0.0]
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        self._cell(labels)[0] += amount
+
+    def value(self, **labels: str) -> float:
+        cell = self._merged().get(tuple(str(labels.get(name, "")) for name in self.labelnames))
+        return cell[0] if cell else 0.0
+
+    def _samples(self) -> Iterator[str]:
+        for key, (value,) in sorted(self._merged().items()):
+            yield f"{self.name}{self._labels(key)} {_number(value)}"
+
+
+class Histogram(_Sharded):
+    """Fixed upper bounds; a cell is ``[count per bucket..., +Inf count, sum]``."""
+
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_cell(self) -> list:
+        return [0] * (len(self.buckets) + 1) + [0.0]
+
+    def observe(self, value: float, **labels: str) -> None:
+        cell = self._cell(labels)
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def _samples(self) -> Iterator[str]:
+        for key, cell in sorted(self._merged().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), cell):
+                cumulative += count
+                le = 'le="%s"' % _number(bound)
+                yield f"{self.name}_bucket{self._labels(key, le)} {cumulative}"
+            yield f"{self.name}_sum{self._labels(key)} {_number(cell[-1])}"
+            yield f"{self.name}_count{self._labels(key)} {cumulative}"
+
+
+class Gauge(Metric):
+    """Last value set, or a callback evaluated at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+        self._functions: Dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def set_function(self, function: Callable[[], float], **labels: str) -> None:
+        self._functions[self._key(labels)] = function
+
+    def _samples(self) -> Iterator[str]:
+        values = dict(self._values)
+        for key, function in list(self._functions.items()):
+            try:
+                values[key] = function()
+            except Exception:  # noqa: BLE001 - one failing callback must not break the scrape
+                continue
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{self._labels(key)} {_number(value)}"
+
+
+class MetricsRegistry:
+    """Named metrics; asking twice for the same name returns the same metric."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+
+    def _get(self, cls, name: str, documentation: str, labelnames: Sequence[str], **options) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **options)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._get(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> bytes:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = [line for metric in metrics for line in metric.collect()]
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.counter("mcp_http_requests_total", "HTTP requests served.", ("node", "method", "route", "status"))
+REQUEST_SECONDS = REGISTRY.histogram(
+    "mcp_http_request_duration_seconds", "Time to build a response, excluding streamed bodies.", ("node", "method", "route")
+)
+STORE_RECORDS = REGISTRY.gauge("mcp_store_records", "Records held by an in-memory store.", ("node", "store"))
@@ -0,0 +1,583 @@
+#!/usr/bin/env python3
+"""
+Shared runtime for the Sacred Trident HTTP MCP servers.
+
+Holds what every node used to copy: JSON store helpers (created on first
+write or at startup, never at import), node-aware logging, one tuned JSON
+encoder for responses and store files (orjson when installed), POST
+envelope and batch (JSON array or NDJSON) parsing, NDJSON export chunking
+and a ``NodeRequestHandler`` base that records request metrics.
+``JSONListStore`` serves a JSON list file from memory with newest-first
+cursor pages, and ``ResponseCache`` keeps their serialized bodies per store
+version for ETag revalidation. ``serve_many`` hosts several nodes in one
+process and event loop, each on its own port::
+
+    python3 mcp_runtime.py atlas obiwan dojo
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+import logging
+import os
+import secrets
+import signal
+import sys
+import threading
+import time
+import zlib
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+import mcp_logging
+import mcp_metrics
+from mcp_http import AsyncHTTPServer, HTTPError, MCPRequestHandler
+
+try:
+    import orjson
+except ImportError:  # stdlib encoder below
+    orjson = None
+
+DATA_DIR = Path(os.getenv("MCP_DATA_DIR") or Path(__file__).with_name("data"))
+MAX_PAGE_LIMIT = 1000
+MAX_BATCH_ITEMS = 10_000
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+NODE_MODULES = {
+    "atlas": "atlas_mcp_server",
+    "obiwan": "obiwan_mcp_server",
+    "dojo": "dojo_mcp_server",
+}
+
+# Compact, UTF-8 and without the circular-reference walk: payloads are plain
+# trees built per request. orjson produces the same bytes several times faster.
+COMPACT_SEPARATORS = (",", ":")
+RESPONSE_ENCODER = json.JSONEncoder(ensure_ascii=False, check_circular=False, separators=COMPACT_SEPARATORS)
+
+_NODE_SYMBOLS: Dict[str, str] = {}
+
+
+def node_logger(name: str, symbol: str) -> logging.Logger:
+    """Logger whose records are prefixed with the node's symbol."""
+    _NODE_SYMBOLS[name] = symbol
+    return logging.getLogger(name)
+
+
+class NodeFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        record.symbol = _NODE_SYMBOLS.get(record.name, "◎")
+        return super().format(record)
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Install the shared node log format once per process, behind the non-blocking log queue."""
+    root = logging.getLogger()
+    if any(isinstance(handler, mcp_logging.LazyQueueHandler) for handler in root.handlers):
+        return
+    handler = logging.StreamHandler()
+    if mcp_logging.LOG_FORMAT == "json":
+        handler.setFormatter(mcp_logging.StructuredFormatter())
+    else:
+        handler.setFormatter(
+            NodeFormatter("%(symbol)s %(asctime)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+        )
+    mcp_logging.install_queue_logging(handler, level=level)
+
+
+logger = node_logger("mcp_runtime", "◎")
+
+
+def dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib encoder copes
+    return RESPONSE_ENCODER.encode(payload).encode("utf-8")
+
+
+def load_json(path: Path, default: Any) -> Any:
+    if not path.exists():
+        return default
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        logger.warning("Failed to parse %s; resetting.", path)
+        return default
+
+
+def save_json(path: Path, payload: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(dumps(payload))
+
+
+def ensure_store(*paths: Path) -> None:
+    """Create the data directory and any missing JSON list stores."""
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    for path in paths:
+        if not path.exists():
+            save_json(path, [])
+
+
+@dataclass
+class PageRequest:
+    """``limit``/``after``/``fields`` query parameters of a list endpoint."""
+
+    limit: Optional[int] = None
+    after: Optional[int] = None
+    fields: Optional[List[str]] = None
+
+    def project(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.fields:
+            return record
+        return {name: record[name] for name in self.fields if name in record}
+
+
+def page_newest(
+    records: Sequence[Dict[str, Any]], sequence: Sequence[int], request: PageRequest
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Newest-first page of ``records`` (oldest first, ``sequence`` ascending).
+
+    Only the requested slice at the tail is touched. The cursor is the
+    sequence number of the last record returned; the next page holds the
+    records older than it.
+    """
+    end = bisect_left(sequence, request.after) if request.after is not None else len(records)
+    start = max(0, end - request.limit) if request.limit else 0
+    items = [request.project(record) for record in reversed(records[start:end])]
+    return items, (str(sequence[start]) if start > 0 and items else None)
+
+
+class JSONListStore:
+    """JSON list file held in memory after first use.
+
+    Mutations rewrite the file, keeping the newest ``keep`` records. Every
+    record carries a process-local sequence number that backs the pagination
+    cursors; take ``lock`` to make a read-then-append atomic.
+    """
+
+    def __init__(self, path: Path, keep: Optional[int] = None) -> None:
+        self.path = path
+        self.keep = keep
+        self.lock = threading.RLock()
+        self._records: Optional[List[Dict[str, Any]]] = None
+        self._sequence: List[int] = []
+        self._next = 0
+        self.version = 0
+
+    def _loaded(self) -> List[Dict[str, Any]]:
+        if self._records is None:
+            records = load_json(self.path, [])
+            self._records = records if isinstance(records, list) else []
+            self._sequence = list(range(len(self._records)))
+            self._next = len(self._records)
+        return self._records
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self._loaded())
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return list(self._loaded())
+
+    def find(self, predicate: Callable[[Dict[str, Any]], bool]) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            return next((record for record in self._loaded() if predicate(record)), None)
+
+    def append(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            records = self._loaded()
+            records.append(record)
+            self._sequence.append(self._next)
+            self._next += 1
+            if self.keep and len(records) > self.keep:
+                del records[: -self.keep]
+                del self._sequence[: -self.keep]
+            self.version += 1
+            save_json(self.path, records)
+            return record
+
+    def extend(self, batch: Sequence[Dict[str, Any]]) -> None:
+        """Append many records under one lock with a single file rewrite."""
+        if not batch:
+            return
+        with self.lock:
+            records = self._loaded()
+            records.extend(batch)
+            self._sequence.extend(range(self._next, self._next + len(batch)))
+            self._next += len(batch)
+            if self.keep and len(records) > self.keep:
+                del records[: -self.keep]
+                del self._sequence[: -self.keep]
+            self.version += 1
+            save_json(self.path, records)
+
+    def remove(self, predicate: Callable[[Dict[str, Any]], bool]) -> int:
+        with self.lock:
+            records = self._loaded()
+            kept = [(seq, record) for seq, record in zip(self._sequence, records) if not predicate(record)]
+            removed = len(records) - len(kept)
+            self._sequence = [seq for seq, _ in kept]
+            self._records = [record for _, record in kept]
+            if removed:
+                self.version += 1
+            save_json(self.path, self._records)
+            return removed
+
+    def window(self, window: "TimeRange", key: str = "timestamp") -> List[Dict[str, Any]]:
+        """Records (oldest first) whose ``key`` timestamp falls inside ``window``."""
+        with self.lock:
+            records = self._loaded()
+            start = 0
+            if window.since is not None:
+                start = bisect_left(records, window.since, key=lambda record: str(record.get(key, "")))
+            return [record for record in records[start:] if record.get(key) in window]
+
+    def page(self, request: PageRequest) -> Tuple[List[Dict[str, Any]], Optional[str], int]:
+        """``(newest-first items, next cursor, total count)``"""
+        with self.lock:
+            records = self._loaded()
+            items, cursor = page_newest(records, self._sequence, request)
+            return items, cursor, len(records)
+
+
+class ResponseCache:
+    """Serialized bodies of one endpoint, keyed by query variant and valid for one store version.
+
+    ETags combine a per-instance token (versions restart with the process),
+    the store version and the variant, so revalidation needs no body at all.
+    They are weak: one version may go out identity- or gzip-encoded.
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries = max_entries
+        self.token = secrets.token_hex(4)
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._bodies: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def etag(self, version: int, variant: str) -> str:
+        return f'W/"{self.token}-{version}-{zlib.crc32(variant.encode("utf-8")):08x}"'
+
+    def body(self, version: int, variant: str, build: Callable[[], Any], current: Callable[[], int]) -> bytes:
+        """Cached body for ``(version, variant)``; ``build`` runs on a miss.
+
+        A body built while the store moved past ``version`` is served but
+        not cached, so a cached body never outlives its version.
+        """
+        with self._lock:
+            if self._version == version and variant in self._bodies:
+                self._bodies.move_to_end(variant)
+                return self._bodies[variant]
+        body = dumps(build())
+        with self._lock:
+            if current() == version:
+                if self._version != version:
+                    self._version = version
+                    self._bodies.clear()
+                self._bodies[variant] = body
+                while len(self._bodies) > self.max_entries:
+                    self._bodies.popitem(last=False)
+        return body
+
+
+def parse_json(raw: bytes) -> Any:
+    try:
+        return json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        raise HTTPError(400, "Invalid JSON payload")
+
+
+def parse_envelope(raw: bytes) -> Tuple[Dict[str, Any], Optional[Any]]:
+    """Decode a POST body, unwrapping ``{"payload": ..., "geometric_context": ...}``.
+
+    Returns the payload object and the geometric context, if any.
+    """
+    envelope = parse_json(raw)
+    context = envelope.get("geometric_context") if isinstance(envelope, dict) else None
+    data = envelope.get("payload") if isinstance(envelope, dict) and "payload" in envelope else envelope
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Payload must be a JSON object")
+    return data, context
+
+
+def ndjson_chunks(records: Iterable[Any], chunk_bytes: int = EXPORT_CHUNK_BYTES) -> Iterator[bytes]:
+    """Encode records one per line, yielding roughly ``chunk_bytes`` at a time."""
+    buffer: List[bytes] = []
+    size = 0
+    for record in records:
+        line = dumps(record) + b"\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+@dataclass
+class TimeRange:
+    """``since``/``until`` filter over ISO-8601 timestamp strings (both inclusive)."""
+
+    since: Optional[str] = None
+    until: Optional[str] = None
+
+    def __contains__(self, timestamp: Any) -> bool:
+        if not isinstance(timestamp, str):
+            return self.since is None and self.until is None
+        if self.since is not None and timestamp < self.since:
+            return False
+        return self.until is None or timestamp <= self.until
+
+
+class InvalidItem:
+    """Placeholder for an NDJSON line that failed to parse."""
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+
+def parse_batch(raw: bytes, content_type: str = "") -> List[Any]:
+    """Decode a batch body: a JSON array, ``{"items": [...]}`` (optionally
+    inside the ``payload`` envelope) or NDJSON, one item per line.
+
+    Unparseable NDJSON lines become ``InvalidItem`` so the rest of the batch
+    still applies.
+    """
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPError(400, "Batch must be UTF-8")
+    document: Any = None
+    if "ndjson" not in content_type:
+        try:
+            document = json.loads(text)
+        except json.JSONDecodeError:
+            document = None
+    if document is None:
+        items: List[Any] = []
+        for line_number, line in enumerate(text.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError:
+                items.append(InvalidItem(f"line {line_number}: invalid JSON"))
+    else:
+        if isinstance(document, dict) and "payload" in document:
+            document = document["payload"]
+        if isinstance(document, dict):
+            document = document.get("items", [document])
+        if not isinstance(document, list):
+            raise HTTPError(400, "Batch must be a JSON array or NDJSON")
+        items = document
+    if not items:
+        raise HTTPError(400, "Batch is empty")
+    if len(items) > MAX_BATCH_ITEMS:
+        raise HTTPError(413, f"Batch exceeds {MAX_BATCH_ITEMS} items")
+    return items
+
+
+def item_error(item: Any) -> Optional[str]:
+    if isinstance(item, InvalidItem):
+        return item.message
+    if not isinstance(item, dict):
+        return "item must be a JSON object"
+    return None
+
+
+def batch_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Wrap per-item results (each with ``index`` and ``status``) for a batch response."""
+    failed = sum(1 for result in results if result["status"] == "error")
+    applied = len(results) - failed
+    status = "completed" if not failed else ("partial" if applied else "failed")
+    return {"status": status, "count": len(results), "applied": applied, "failed": failed, "results": results}
+
+
+class NodeRequestHandler(MCPRequestHandler):
+    """``MCPRequestHandler`` with the shared encoder, envelope parsing, node logging and metrics."""
+
+    node_logger = logger
+    node_name = "mcp"
+    # GET paths under these prefixes carry an id; metrics label them ``<prefix>*``.
+    metric_prefixes: Tuple[str, ...] = ()
+
+    def handle_one(self) -> None:
+        started = time.perf_counter()
+        super().handle_one()
+        route = self.metric_route()
+        mcp_metrics.REQUEST_SECONDS.observe(
+            time.perf_counter() - started, node=self.node_name, method=self.command, route=route
+        )
+        mcp_metrics.REQUESTS.inc(node=self.node_name, method=self.command, route=route, status=str(self.status))
+
+    def metric_route(self) -> str:
+        if self.command == "GET":
+            for prefix in self.metric_prefixes:
+                if self.path.startswith(prefix):
+                    return prefix + "*"
+        return self.path
+
+    def send_metrics(self) -> None:
+        self.send_body(mcp_metrics.REGISTRY.render(), content_type=mcp_metrics.CONTENT_TYPE)
+
+    def send_json(self, payload: Any, status: int = 200) -> None:
+        self.send_body(dumps(payload), status=status)
+
+    def send_versioned_json(self, cache: ResponseCache, current: Callable[[], int], build: Callable[[], Any]) -> None:
+        """Answer a GET from ``cache`` with an ETag, or 304 when ``If-None-Match`` still matches."""
+        version = current()
+        variant = "&".join(f"{name}={','.join(values)}" for name, values in sorted(self.query.items()))
+        etag = cache.etag(version, variant)
+        # 304s skip encoding, so they carry the same validator and Vary as a 200 here
+        headers = [("ETag", etag), ("Cache-Control", "no-cache"), ("Vary", "Accept-Encoding")]
+        candidates = {tag.strip().removeprefix("W/") for tag in self.headers.get("if-none-match", "").split(",")}
+        if etag.removeprefix("W/") in candidates or "*" in candidates:
+            self.send_body(b"", status=304, headers=headers)
+            return
+        self.send_body(cache.body(version, variant, build, current), headers=headers)
+
+    def query_value(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        values = self.query.get(name)
+        return values[-1] if values else default
+
+    def query_int(self, name: str, minimum: int = 0) -> Optional[int]:
+        value = self.query_value(name)
+        if value in (None, ""):
+            return None
+        try:
+            number = int(value)
+        except ValueError:
+            raise HTTPError(400, f"{name} must be an integer")
+        if number < minimum:
+            raise HTTPError(400, f"{name} must be at least {minimum}")
+        return number
+
+    def time_range(self) -> TimeRange:
+        bounds = {}
+        for name in ("since", "until"):
+            value = self.query_value(name)
+            if value:
+                try:
+                    bounds[name] = datetime.fromisoformat(value).isoformat()
+                except ValueError:
+                    raise HTTPError(400, f"{name} must be an ISO-8601 timestamp")
+        return TimeRange(**bounds)
+
+    def page_request(self) -> PageRequest:
+        limit = self.query_int("limit", minimum=1)
+        fields = [name for name in (self.query_value("fields") or "").split(",") if name]
+        return PageRequest(
+            limit=min(limit, MAX_PAGE_LIMIT) if limit else None,
+            after=self.query_int("after"),
+            fields=fields or None,
+        )
+
+    def read_json(self) -> Any:
+        return parse_json(self.read_body())
+
+    def read_batch(self) -> List[Any]:
+        return parse_batch(self.read_body(), self.headers.get("content-type", ""))
+
+    def read_envelope(self) -> Dict[str, Any]:
+        data, context = parse_envelope(self.read_body())
+        if context:
+            self.node_logger.debug("Received geometric context: %s", context)
+        return data
+
+    def log_request(self, code: int, size: int) -> None:
+        if not mcp_logging.sample_access(code):
+            return
+        self.node_logger.info(
+            '%s - "%s" %s %s',
+            self.address_string(),
+            self.requestline,
+            code,
+            size,
+            extra={"access": True, "status": code, "bytes": size},
+        )
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A003
+        self.node_logger.info("%s - " + format, self.address_string(), *args)
+
+
+@dataclass
+class NodeSpec:
+    """How to serve one node: handler, bind address, server options and startup hook."""
+
+    name: str
+    handler_class: Type[MCPRequestHandler]
+    host: str
+    port: int
+    options: Dict[str, Any] = field(default_factory=dict)
+    startup: Optional[Callable[[], None]] = None
+    banner: List[str] = field(default_factory=list)
+
+
+def load_node(name: str) -> NodeSpec:
+    return importlib.import_module(NODE_MODULES.get(name, name)).NODE
+
+
+async def serve_many(nodes: Sequence[NodeSpec], ports: Optional[Dict[str, int]] = None) -> None:
+    """Serve every node in this event loop until SIGINT/SIGTERM."""
+    servers = []
+    for node in nodes:
+        node_log = getattr(node.handler_class, "node_logger", logger)
+        if node.startup:
+            node.startup()
+        server = AsyncHTTPServer(
+            node.handler_class, node.host, (ports or {}).get(node.name, node.port), **node.options
+        )
+        await server.start()
+        servers.append(server)
+        for line in node.banner:
+            node_log.info(line)
+        node_log.info("%s listening on port %s", node.name, server.port)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    try:
+        await stop.wait()
+    finally:
+        await asyncio.gather(*(server.shutdown() for server in servers))
+
+
+def run_nodes(nodes: Sequence[NodeSpec], ports: Optional[Dict[str, int]] = None) -> None:
+    configure_logging()
+    try:
+        asyncio.run(serve_many(nodes, ports))
+    except KeyboardInterrupt:
+        pass
+    for node in nodes:
+        getattr(node.handler_class, "node_logger", logger).info("Stopping %s MCP server", node.name)
+
+
+def main(argv: Sequence[str]) -> None:
+    """``mcp_runtime.py NODE[:PORT] ...`` hosts the named nodes in one process."""
+    names = list(argv) or list(NODE_MODULES)
+    nodes, ports = [], {}
+    for item in names:
+        name, _, port = item.partition(":")
+        node = load_node(name)
+        nodes.append(node)
+        if port:
+            ports[node.name] = int(port)
+    run_nodes(nodes, ports)
+
+
+if __name__ == "__main__":
+    # Re-import by name so node modules and this entry point share one runtime.
+    importlib.import_module("mcp_runtime").main(sys.argv[1:])
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Sacred Trident lattice supervisor.
+
+Hosts any subset of the HTTP nodes (ATLAS, OBI-WAN, DOJO) without one
+interpreter per node. Node modules are imported once, up front; then either
+
+* ``inline`` (default): every node shares this process and event loop, and a
+  watchdog restarts a node's listener when its ``/health`` stops answering;
+* ``--fork``: each ``+``-joined group runs in a child forked from the
+  pre-imported parent (modules and NumPy pages are shared copy-on-write).
+  Children that exit or fail consecutive health probes are terminated and
+  re-forked with exponential backoff.
+
+Usage::
+
+    python3 mcp_supervisor.py atlas obiwan dojo
+    python3 mcp_supervisor.py --fork atlas obiwan+dojo:13960
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import http.client
+import os
+import signal
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import mcp_runtime
+from mcp_http import AsyncHTTPServer
+from mcp_runtime import NodeSpec, configure_logging, load_node, node_logger
+
+logger = node_logger("mcp_supervisor", "◎")
+
+HEALTH_INTERVAL = 5.0
+HEALTH_TIMEOUT = 2.0
+HEALTH_FAILURES = 3
+STARTUP_GRACE = 10.0
+STOP_GRACE = 5.0
+MAX_BACKOFF = 30.0
+STABLE_AFTER = 60.0
+
+
+def probe(host: str, port: int, timeout: float = HEALTH_TIMEOUT) -> bool:
+    """True when ``GET /health`` answers 2xx within ``timeout``."""
+    connection = http.client.HTTPConnection(
+        "127.0.0.1" if host in ("", "0.0.0.0") else host, port, timeout=timeout
+    )
+    try:
+        connection.request("GET", "/health", headers={"Connection": "close"})
+        return 200 <= connection.getresponse().status < 300
+    except (OSError, http.client.HTTPException):
+        return False
+    finally:
+        connection.close()
+
+
+def parse_groups(items: Sequence[str]) -> Tuple[List[List[NodeSpec]], Dict[str, int]]:
+    """``atlas`` / ``obiwan:16390`` / ``atlas+dojo`` -> node groups plus port overrides."""
+    groups, ports = [], {}
+    for item in items:
+        group = []
+        for member in item.split("+"):
+            name, _, port = member.partition(":")
+            node = load_node(name)
+            group.append(node)
+            if port:
+                ports[node.name] = int(port)
+        groups.append(group)
+    return groups, ports
+
+
+# -- inline ------------------------------------------------------------------
+
+
+@dataclass
+class InlineNode:
+    spec: NodeSpec
+    port: int
+    server: Optional[AsyncHTTPServer] = None
+    failures: int = 0
+    restarts: int = 0
+
+    async def start(self) -> None:
+        self.server = AsyncHTTPServer(self.spec.handler_class, self.spec.host, self.port, **self.spec.options)
+        await self.server.start()
+        self.port = self.server.port
+        self.failures = 0
+
+
+async def supervise_inline(
+    nodes: Sequence[NodeSpec],
+    ports: Dict[str, int],
+    health_interval: float = HEALTH_INTERVAL,
+    health_failures: int = HEALTH_FAILURES,
+) -> None:
+    hosted = []
+    for spec in nodes:
+        if spec.startup:
+            spec.startup()
+        node = InlineNode(spec, ports.get(spec.name, spec.port))
+        await node.start()
+        hosted.append(node)
+        logger.info("%s hosted inline on port %s", spec.name, node.port)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    try:
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), health_interval)
+                break
+            except asyncio.TimeoutError:
+                pass
+            results = await asyncio.gather(
+                *(loop.run_in_executor(None, probe, node.spec.host, node.port) for node in hosted)
+            )
+            for node, healthy in zip(hosted, results):
+                node.failures = 0 if healthy else node.failures + 1
+                if node.failures >= health_failures:
+                    node.restarts += 1
+                    logger.warning(
+                        "%s failed %d health probes; restarting listener (restart #%d)",
+                        node.spec.name, node.failures, node.restarts,
+                    )
+                    await node.server.shutdown(grace=STOP_GRACE)
+                    await node.start()
+    finally:
+        await asyncio.gather(*(node.server.shutdown() for node in hosted if node.server))
+
+
+# -- fork --------------------------------------------------------------------
+
+
+@dataclass
+class Child:
+    nodes: List[NodeSpec]
+    pid: int = 0
+    started: float = 0.0
+    failures: int = 0
+    restarts: int = 0
+    backoff: float = 0.5
+    next_start: float = 0.0
+    ports: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def label(self) -> str:
+        return "+".join(node.name for node in self.nodes)
+
+
+class ForkSupervisor:
+    """Fork one child per node group and keep it healthy."""
+
+    def __init__(
+        self,
+        groups: Sequence[List[NodeSpec]],
+        ports: Dict[str, int],
+        health_interval: float = HEALTH_INTERVAL,
+        health_failures: int = HEALTH_FAILURES,
+    ) -> None:
+        self.children = [Child(list(group), ports={n.name: ports.get(n.name, n.port) for n in group}) for group in groups]
+        self.health_interval = health_interval
+        self.health_failures = health_failures
+        self._stopping = False
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        for child in self.children:
+            self._spawn(child)
+        next_probe = time.monotonic() + self.health_interval
+        try:
+            while not self._stopping:
+                time.sleep(0.2)
+                now = time.monotonic()
+                for child in self.children:
+                    if child.pid and self._reap(child):
+                        logger.warning("%s (pid %d) exited", child.label, child.pid)
+                        child.pid = 0
+                        self._schedule_restart(child, now)
+                    if not child.pid and now >= child.next_start and not self._stopping:
+                        self._spawn(child)
+                if now >= next_probe:
+                    next_probe = now + self.health_interval
+                    self._check_health(now)
+        finally:
+            self._stop_all()
+
+    def _request_stop(self, signum: int, frame: object) -> None:
+        self._stopping = True
+
+    def _spawn(self, child: Child) -> None:
+        pid = os.fork()
+        if pid == 0:
+            # Child: serve the group with default signal handling, never return.
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = 0
+            try:
+                mcp_runtime.run_nodes(child.nodes, child.ports)
+            except BaseException:  # noqa: BLE001 - report, then leave the child
+                logger.exception("%s crashed", child.label)
+                code = 1
+            finally:
+                os._exit(code)
+        child.pid = pid
+        child.started = time.monotonic()
+        child.failures = 0
+        logger.info("Forked %s as pid %d (ports %s)", child.label, pid, child.ports)
+
+    @staticmethod
+    def _reap(child: Child) -> bool:
+        try:
+            pid, _ = os.waitpid(child.pid, os.WNOHANG)
+        except ChildProcessError:
+            return True
+        return pid == child.pid
+
+    def _schedule_restart(self, child: Child, now: float) -> None:
+        if now - child.started >= STABLE_AFTER:
+            child.backoff = 0.5
+        child.restarts += 1
+        child.next_start = now + child.backoff
+        logger.info("Restarting %s in %.1fs (restart #%d)", child.label, child.backoff, child.restarts)
+        child.backoff = min(MAX_BACKOFF, child.backoff * 2)
+
+    def _check_health(self, now: float) -> None:
+        for child in self.children:
+            if not child.pid or now - child.started < STARTUP_GRACE:
+                continue
+            healthy = all(probe(node.host, child.ports[node.name]) for node in child.nodes)
+            child.failures = 0 if healthy else child.failures + 1
+            if child.failures >= self.health_failures:
+                logger.warning("%s failed %d health probes; terminating pid %d", child.label, child.failures, child.pid)
+                self._terminate(child)
+                child.pid = 0
+                self._schedule_restart(child, now)
+
+    def _terminate(self, child: Child) -> None:
+        try:
+            os.kill(child.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        deadline = time.monotonic() + STOP_GRACE
+        while time.monotonic() < deadline:
+            if self._reap(child):
+                return
+            time.sleep(0.05)
+        try:
+            os.kill(child.pid, signal.SIGKILL)
+            os.waitpid(child.pid, 0)
+        except (ProcessLookupError, ChildProcessError):
+            pass
+
+    def _stop_all(self) -> None:
+        for child in self.children:
+            if child.pid:
+                self._terminate(child)
+                child.pid = 0
+        logger.info("Lattice supervisor stopped")
+
+
+def main(argv: Sequence[str]) -> None:
+    parser = argparse.ArgumentParser(description="Host Sacred Trident MCP nodes in one supervised process tree.")
+    parser.add_argument("nodes", nargs="*", default=list(mcp_runtime.NODE_MODULES), help="node[:port], '+' groups nodes into one child")
+    parser.add_argument("--fork", action="store_true", help="fork one child per group from the pre-imported parent")
+    parser.add_argument("--health-interval", type=float, default=HEALTH_INTERVAL)
+    parser.add_argument("--health-failures", type=int, default=HEALTH_FAILURES)
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    groups, ports = parse_groups(args.nodes)
+    if args.fork:
+        ForkSupervisor(groups, ports, args.health_interval, args.health_failures).run()
+        return
+    nodes = [node for group in groups for node in group]
+    try:
+        asyncio.run(supervise_inline(nodes, ports, args.health_interval, args.health_failures))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -6,13 +6,24 @@ Frequency: 639 Hz (Port 6390)
 
 from __future__ import annotations
 
-import json
-import logging
+import uuid
 from datetime import datetime
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from socketserver import ThreadingMixIn
-from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+import mcp_metrics
+import mcp_runtime
+from mcp_runtime import (
+    DATA_DIR,
+    JSONListStore,
+    NodeRequestHandler,
+    NodeSpec,
+    ResponseCache,
+    batch_summary,
+    item_error,
+    ndjson_chunks,
+    node_logger,
+    run_nodes,
+)
 
 SYMBOL = "●"
 NAME = "OBI-WAN"
@@ -20,68 +31,83 @@ PORT = 6390
 FREQUENCY = 639
 FUNCTION = "Observer / Memory"
 VERSION = "1.0.0"
+# Room for a full batch (mcp_runtime.MAX_BATCH_ITEMS) of observations up to 4 KiB each
+MAX_BODY_BYTES = mcp_runtime.MAX_BATCH_ITEMS * 4096
 
-logging.basicConfig(
-    level=logging.INFO,
-    format=f"{SYMBOL} %(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
-logger = logging.getLogger(__name__)
+logger = node_logger(__name__, SYMBOL)
 
-DATA_DIR = Path(__file__).with_name("data")
 MEMORY_PATH = DATA_DIR / "memory_store.json"
 OBSERVATION_PATH = DATA_DIR / "observation_log.json"
 
-DATA_DIR.mkdir(exist_ok=True)
 
+MEMORIES = JSONListStore(MEMORY_PATH, keep=500)
+OBSERVATIONS = JSONListStore(OBSERVATION_PATH, keep=500)
+MEMORY_RESPONSES = ResponseCache()
+OBSERVATION_RESPONSES = ResponseCache()
+mcp_metrics.STORE_RECORDS.set_function(lambda: len(MEMORIES), node=NAME, store="memories")
+mcp_metrics.STORE_RECORDS.set_function(lambda: len(OBSERVATIONS), node=NAME, store="observations")
 
-def load_json(path: Path, default: Any) -> Any:
-    if not path.exists():
-        return default
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        logger.warning("Failed to parse %s; resetting.", path)
-        return default
 
+def ensure_store() -> None:
+    mcp_runtime.ensure_store(MEMORY_PATH, OBSERVATION_PATH)
 
-def save_json(path: Path, payload: Any) -> None:
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
+def memory_record(data: Dict[str, Any], memory_id: str) -> Dict[str, Any]:
+    return {
+        "memory_id": memory_id,
+        "title": data.get("title", "untitled_memory"),
+        "content": data.get("content", ""),
+        "tags": data.get("tags", []),
+        "created_at": datetime.now().isoformat(),
+    }
 
-def ensure_store() -> None:
-    if not MEMORY_PATH.exists():
-        save_json(MEMORY_PATH, [])
-    if not OBSERVATION_PATH.exists():
-        save_json(OBSERVATION_PATH, [])
 
+def observation_record(data: Dict[str, Any], observation_id: str) -> Dict[str, Any]:
+    return {
+        "observation_id": observation_id,
+        "entity": data.get("entity", "unspecified"),
+        "details": data.get("details", ""),
+        "confidence": data.get("confidence", 0.75),
+        "timestamp": datetime.now().isoformat(),
+    }
 
-ensure_store()
 
+def memory_error(data: Dict[str, Any]) -> Optional[str]:
+    if not isinstance(data.get("title", ""), str) or not isinstance(data.get("content", ""), str):
+        return "title and content must be strings"
+    tags = data.get("tags", [])
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        return "tags must be a list of strings"
+    return None
 
-class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
-    """Serve each request in its own thread."""
 
+def observation_error(data: Dict[str, Any]) -> Optional[str]:
+    if not isinstance(data.get("entity", ""), str):
+        return "entity must be a string"
+    confidence = data.get("confidence", 0.75)
+    if isinstance(confidence, bool) or not isinstance(confidence, (int, float)):
+        return "confidence must be a number"
+    return None
 
-class OBIWANRequestHandler(BaseHTTPRequestHandler):
-    server_version = f"{NAME}-MCP/{VERSION}"
 
-    def log_message(self, format: str, *args: Any) -> None:  # noqa: A003
-        logger.info("%s - %s", self.address_string(), format % args)
+class OBIWANRequestHandler(NodeRequestHandler):
+    server_version = f"{NAME}-MCP/{VERSION}"
+    node_logger = logger
+    node_name = NAME
+    metric_prefixes = ("/observe/", "/memory/")
 
     def _write_json(self, payload: Dict[str, Any]) -> None:
-        body = json.dumps(payload).encode("utf-8")
-        self.send_response(200)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(body)))
-        self.end_headers()
-        self.wfile.write(body)
+        self.send_json(payload)
 
     def do_GET(self) -> None:  # noqa: N802
         if self.path == "/health":
             self._write_json(self._health_payload())
+        elif self.path == "/metrics":
+            self.send_metrics()
         elif self.path == "/resonance":
             self._write_json(self._resonance_payload())
+        elif self.path == "/observations/export":
+            self._export_observations()
         elif self.path.startswith("/observe/"):
             entity = self.path.rsplit("/", 1)[-1]
             self._write_json(self._observe_entity(entity))
@@ -89,29 +115,20 @@ class OBIWANRequestHandler(BaseHTTPRequestHandler):
             memory_id = self.path.rsplit("/", 1)[-1]
             self._write_json(self._retrieve_memory(memory_id))
         elif self.path == "/memories":
-            self._write_json(self._list_memories())
+            self.send_versioned_json(MEMORY_RESPONSES, lambda: MEMORIES.version, self._list_memories)
         elif self.path == "/observations":
-            self._write_json(self._observation_history())
+            self.send_versioned_json(OBSERVATION_RESPONSES, lambda: OBSERVATIONS.version, self._observation_history)
         else:
             self._write_json(self._root_payload())
 
     def do_POST(self) -> None:  # noqa: N802
-        length = int(self.headers.get("Content-Length", "0") or "0")
-        raw = self.rfile.read(length)
-        try:
-            envelope = json.loads(raw.decode("utf-8"))
-        except json.JSONDecodeError:
-            self.send_error(400, "Invalid JSON payload")
+        if self.path == "/memory/store/batch":
+            self._write_json(self._store_memories(self.read_batch()))
             return
-
-        context = envelope.get("geometric_context") if isinstance(envelope, dict) else None
-        if context:
-            logger.debug("Received geometric context: %s", context)
-        data = envelope.get("payload") if isinstance(envelope, dict) and "payload" in envelope else envelope
-        if not isinstance(data, dict):
-            self.send_error(400, "Payload must be a JSON object")
+        if self.path == "/observe/record/batch":
+            self._write_json(self._record_observations(self.read_batch()))
             return
-
+        data = self.read_envelope()
         if self.path == "/memory/store":
             self._write_json(self._store_memory(data))
         elif self.path == "/observe/record":
@@ -148,14 +165,18 @@ class OBIWANRequestHandler(BaseHTTPRequestHandler):
             "function": FUNCTION,
             "endpoints": [
                 "/health",
+                "/metrics",
                 "/resonance",
                 "/observe/{entity}",
                 "/observe/record",
+                "/observe/record/batch",
                 "/memory/{id}",
                 "/memory/store",
+                "/memory/store/batch",
                 "/memory/retire",
                 "/memories",
                 "/observations",
+                "/observations/export",
             ],
             "description": "Observer and memory anchoring node for the Sacred FIELD lattice.",
         }
@@ -170,75 +191,96 @@ class OBIWANRequestHandler(BaseHTTPRequestHandler):
         }
 
     def _retrieve_memory(self, memory_id: str) -> Dict[str, Any]:
-        store: List[Dict[str, Any]] = load_json(MEMORY_PATH, [])
-        for memory in store:
-            if memory["memory_id"] == memory_id:
-                logger.info("Retrieving memory %s", memory_id)
-                memory["retrieved_at"] = datetime.now().isoformat()
-                return {"status": "found", "memory": memory}
+        memory = MEMORIES.find(lambda record: record["memory_id"] == memory_id)
+        if memory is not None:
+            logger.info("Retrieving memory %s", memory_id)
+            return {"status": "found", "memory": {**memory, "retrieved_at": datetime.now().isoformat()}}
         logger.info("Memory %s not found", memory_id)
         return {"status": "missing", "memory_id": memory_id}
 
     def _store_memory(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        title = data.get("title", "untitled_memory")
-        store: List[Dict[str, Any]] = load_json(MEMORY_PATH, [])
-        memory_record = {
-            "memory_id": f"mem-{datetime.now().timestamp():.0f}",
-            "title": title,
-            "content": data.get("content", ""),
-            "tags": data.get("tags", []),
-            "created_at": datetime.now().isoformat(),
-        }
-        logger.info("Storing memory %s (tags=%s)", title, ",".join(memory_record["tags"]))
-        store.append(memory_record)
-        save_json(MEMORY_PATH, store[-500:])
-        return {"status": "stored", "memory": memory_record}
+        record = memory_record(data, f"mem-{uuid.uuid4().hex}")
+        logger.info("Storing memory %s (tags=%s)", record["title"], ",".join(record["tags"]))
+        MEMORIES.append(record)
+        return {"status": "stored", "memory": record}
+
+    def _store_memories(self, items: List[Any]) -> Dict[str, Any]:
+        results, records = [], []
+        for index, item in enumerate(items):
+            error = item_error(item) or memory_error(item)
+            if error:
+                results.append({"index": index, "status": "error", "message": error})
+                continue
+            record = memory_record(item, f"mem-{uuid.uuid4().hex}")
+            records.append(record)
+            results.append({"index": index, "status": "stored", "memory": record})
+        MEMORIES.extend(records)
+        logger.info("Stored memory batch (stored=%d rejected=%d)", len(records), len(items) - len(records))
+        return batch_summary(results)
 
     def _record_observation(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        entity = data.get("entity", "unspecified")
-        observation = {
-            "observation_id": f"obs-{datetime.now().timestamp():.0f}",
-            "entity": entity,
-            "details": data.get("details", ""),
-            "confidence": data.get("confidence", 0.75),
-            "timestamp": datetime.now().isoformat(),
-        }
-        logger.info("Recording observation for %s (confidence=%.2f)", entity, observation["confidence"])
-        history: List[Dict[str, Any]] = load_json(OBSERVATION_PATH, [])
-        history.append(observation)
-        save_json(OBSERVATION_PATH, history[-500:])
+        observation = observation_record(data, f"obs-{uuid.uuid4().hex}")
+        logger.info(
+            "Recording observation for %s (confidence=%.2f)", observation["entity"], observation["confidence"]
+        )
+        OBSERVATIONS.append(observation)
         return {"status": "recorded", "observation": observation}
 
+    def _record_observations(self, items: List[Any]) -> Dict[str, Any]:
+        results, records = [], []
+        for index, item in enumerate(items):
+            error = item_error(item) or observation_error(item)
+            if error:
+                results.append({"index": index, "status": "error", "message": error})
+                continue
+            observation = observation_record(item, f"obs-{uuid.uuid4().hex}")
+            records.append(observation)
+            results.append({"index": index, "status": "recorded", "observation": observation})
+        OBSERVATIONS.extend(records)
+        logger.info("Recorded observation batch (recorded=%d rejected=%d)", len(records), len(items) - len(records))
+        return batch_summary(results)
+
     def _retire_memory(self, data: Dict[str, Any]) -> Dict[str, Any]:
         memory_id = data.get("memory_id")
         if not memory_id:
             return {"status": "error", "message": "memory_id required"}
-        store: List[Dict[str, Any]] = load_json(MEMORY_PATH, [])
-        retained = [memory for memory in store if memory["memory_id"] != memory_id]
-        removed = len(store) - len(retained)
-        save_json(MEMORY_PATH, retained)
+        removed = MEMORIES.remove(lambda memory: memory["memory_id"] == memory_id)
         logger.info("Retired memory %s (removed=%s)", memory_id, bool(removed))
         return {"status": "retired" if removed else "missing", "memory_id": memory_id}
 
+    def _export_observations(self) -> None:
+        """Stream observations as NDJSON, filtered by ``since``/``until`` and ``entity``."""
+        entity = self.query_value("entity")
+        observations = OBSERVATIONS.window(self.time_range())
+        if entity is not None:
+            observations = [observation for observation in observations if observation.get("entity") == entity]
+        self.send_stream(ndjson_chunks(observations))
+
     def _list_memories(self) -> Dict[str, Any]:
-        store: List[Dict[str, Any]] = load_json(MEMORY_PATH, [])
-        return {"count": len(store), "memories": store}
+        memories, cursor, total = MEMORIES.page(self.page_request())
+        return {"count": total, "memories": memories, "next": cursor}
 
     def _observation_history(self) -> Dict[str, Any]:
-        history: List[Dict[str, Any]] = load_json(OBSERVATION_PATH, [])
-        return {"count": len(history), "observations": history}
+        observations, cursor, total = OBSERVATIONS.page(self.page_request())
+        return {"count": total, "observations": observations, "next": cursor}
+
+
+NODE = NodeSpec(
+    name=NAME,
+    handler_class=OBIWANRequestHandler,
+    host="",
+    port=PORT,
+    options={"max_body_bytes": MAX_BODY_BYTES},
+    startup=ensure_store,
+    banner=[
+        f"Starting {SYMBOL} {NAME} MCP server on port {PORT}",
+        f"Frequency: {FREQUENCY} Hz — Function: {FUNCTION}",
+    ],
+)
 
 
 def run() -> None:
-    server = ThreadedHTTPServer(("", PORT), OBIWANRequestHandler)
-    logger.info("Starting %s %s MCP server on port %s", SYMBOL, NAME, PORT)
-    logger.info("Frequency: %s Hz — Function: %s", FREQUENCY, FUNCTION)
-    try:
-        server.serve_forever()
-    except KeyboardInterrupt:
-        logger.info("Stopping %s MCP server", NAME)
-    finally:
-        server.server_close()
+    run_nodes([NODE])
 
 
 if __name__ == "__main__":
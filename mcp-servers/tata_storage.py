@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+"""
+▼ TATA storage layer - pluggable, non-blocking record storage
+==============================================================
+
+``SacredRecordStore`` is the interface TATA talks to; ``create_store`` picks
+an implementation from the storage URL scheme:
+
+- ``postgresql://`` / ``postgres://`` - ``PostgresStore``: psycopg2 pool on a
+  dedicated executor, idle health checks, reconnect on failure and a
+  per-session statement timeout.
+- ``sqlite:///path/to.db`` / ``sqlite:///:memory:`` / ``memory://`` -
+  ``SQLiteStore``: WAL journal, cached prepared statements and batched
+  transactions, for laptops, CI and benchmarks without a database service.
+
+``ValidationRecordWriter`` buffers validation rows and flushes them in bulk
+(``COPY`` on PostgreSQL) inside one transaction, journaling failed batches to
+disk for replay.
+"""
+
+import asyncio
+import io
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+from urllib.parse import urlparse
+
+try:
+    import psycopg2
+    import psycopg2.pool
+except ImportError:
+    print("Warning: PostgreSQL driver not available. Install with: pip install psycopg2-binary")
+    psycopg2 = None
+
+logger = logging.getLogger('tata_anchor_mcp.storage')
+
+T = TypeVar("T")
+
+RECORD_TABLE = "sacred_field_records"
+RECORD_COLUMNS = ("frequency", "element", "field_path", "sacred_validation", "metadata", "content_hash")
+SEARCH_COLUMNS = "field_path, frequency, element, sacred_validation, created_at, id"
+
+
+@dataclass
+class RecordQuery:
+    """Search over sacred_field_records
+
+    ``text`` matches inside ``field_path``; ``status`` matches the stored
+    validation status; ``since``/``until`` bound ``created_at``. Results are
+    newest first and ``after`` is the opaque cursor returned with the
+    previous page (keyset pagination on ``created_at, id``).
+    """
+    text: str = ""
+    status: Optional[str] = None
+    element: Optional[str] = None
+    since: Optional[str] = None
+    until: Optional[str] = None
+    limit: int = 10
+    after: Optional[str] = None
+
+    def cursor_key(self) -> Optional[Tuple[str, int]]:
+        if not self.after:
+            return None
+        created_at, _, record_id = self.after.rpartition("|")
+        return created_at, int(record_id)
+
+
+def _contains_pattern(text: str) -> str:
+    """LIKE pattern matching ``text`` literally; pair with ESCAPE '\\'"""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _page(rows: List[tuple], limit: int) -> Tuple[List[tuple], Optional[str]]:
+    """Trim the extra look-ahead row and derive the next-page cursor"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, f"{rows[-1][4]}|{rows[-1][5]}"
+
+
+class StorageUnavailable(RuntimeError):
+    """Raised when the backend for a storage URL cannot be used here"""
+
+
+class SacredRecordStore:
+    """Interface for TATA truth storage backends"""
+
+    async def open(self):
+        raise NotImplementedError
+
+    async def close(self):
+        raise NotImplementedError
+
+    async def healthy(self) -> bool:
+        raise NotImplementedError
+
+    async def ensure_schema(self):
+        """Create sacred_field_records and its indexes if missing"""
+        raise NotImplementedError
+
+    async def insert_many(self, table: str, columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> None:
+        """Write rows in a single transaction"""
+        raise NotImplementedError
+
+    async def search_records(self, query: RecordQuery) -> Tuple[List[tuple], Optional[str]]:
+        """One page of matching records and the cursor for the next page"""
+        raise NotImplementedError
+
+    async def latest_validations(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Newest hashed ``(field_path, content_hash, metadata)`` per path"""
+        raise NotImplementedError
+
+
+def create_store(url: str, **options: Any) -> SacredRecordStore:
+    """Build the storage backend for ``url`` based on its scheme"""
+    scheme = urlparse(url).scheme
+    if scheme in ("postgresql", "postgres"):
+        if psycopg2 is None:
+            raise StorageUnavailable("psycopg2 is required for PostgreSQL storage")
+        return PostgresStore(url, **options)
+    if scheme == "sqlite":
+        # sqlite:///relative.db, sqlite:////absolute.db, sqlite:///:memory:
+        return SQLiteStore(url[len("sqlite:///"):] or ":memory:")
+    if scheme == "memory":
+        return SQLiteStore(":memory:")
+    raise StorageUnavailable(f"Unsupported storage URL scheme: {scheme or url}")
+
+
+class PostgresStore(SacredRecordStore):
+    """Connection-pooled PostgreSQL access with async execution"""
+
+    def __init__(
+        self,
+        url: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        statement_timeout_ms: int = 5000,
+        health_check_interval: float = 30.0,
+    ):
+        self.url = url
+        self.min_size = min_size
+        self.max_size = max_size
+        self.statement_timeout_ms = statement_timeout_ms
+        self.health_check_interval = health_check_interval
+        self.pool = None
+        self.executor = ThreadPoolExecutor(max_workers=max_size, thread_name_prefix="tata-db")
+        self._last_used: Dict[int, float] = {}
+
+    async def open(self):
+        """Create the pool and verify the first connection"""
+        loop = asyncio.get_running_loop()
+        self.pool = await loop.run_in_executor(self.executor, self._create_pool)
+        if not await self.healthy():
+            raise RuntimeError("PostgreSQL health check failed")
+        logger.info(f"🗄️ PostgreSQL pool ready ({self.min_size}-{self.max_size} connections)")
+
+    def _create_pool(self):
+        return psycopg2.pool.ThreadedConnectionPool(
+            self.min_size,
+            self.max_size,
+            dsn=self.url,
+            options=f"-c statement_timeout={self.statement_timeout_ms}",
+        )
+
+    async def run(self, work: Callable[[Any], T], transaction: bool = False) -> T:
+        """Run ``work(cursor)`` on a pooled connection off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._run_sync, work, transaction)
+
+    async def execute(self, sql: str, params: Optional[Sequence[Any]] = None) -> None:
+        await self.run(lambda cursor: cursor.execute(sql, params))
+
+    async def fetchall(self, sql: str, params: Optional[Sequence[Any]] = None) -> List[tuple]:
+        def work(cursor):
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        return await self.run(work)
+
+    async def insert_many(self, table: str, columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> None:
+        """Bulk-load rows with COPY in a single transaction"""
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_value(value) for value in row))
+            buffer.write("\n")
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+
+        def work(cursor):
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+        await self.run(work, transaction=True)
+
+    async def ensure_schema(self):
+        def create_schema(cursor):
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sacred_field_records (
+                    id SERIAL PRIMARY KEY,
+                    frequency INTEGER NOT NULL,
+                    element VARCHAR(50) NOT NULL,
+                    field_path TEXT NOT NULL,
+                    content_hash VARCHAR(64),
+                    sacred_validation BOOLEAN DEFAULT FALSE,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    metadata JSONB
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_field_frequency 
+                ON sacred_field_records(frequency)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_field_element 
+                ON sacred_field_records(element)
+            """)
+            # Keyset pagination and date-range filters
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_field_created
+                ON sacred_field_records(created_at DESC, id DESC)
+            """)
+            # Latest record per path (validation cache warm-up)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_field_path_latest
+                ON sacred_field_records(field_path, created_at DESC, id DESC)
+            """)
+            # Containment filters on metadata (status and friends)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_field_metadata
+                ON sacred_field_records USING GIN (metadata jsonb_path_ops)
+            """)
+        await self.run(create_schema)
+
+        def create_trigram_index(cursor):
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_field_path_trgm
+                ON sacred_field_records USING GIN (field_path gin_trgm_ops)
+            """)
+        try:
+            await self.run(create_trigram_index)
+        except psycopg2.Error as e:
+            logger.warning(f"⚠️ pg_trgm unavailable, field_path search will scan: {e}")
+
+    async def search_records(self, query: RecordQuery) -> Tuple[List[tuple], Optional[str]]:
+        clauses, params = [], []
+        if query.text:
+            clauses.append("field_path ILIKE %s ESCAPE '\\'")
+            params.append(_contains_pattern(query.text))
+        if query.status:
+            clauses.append("metadata @> %s::jsonb")
+            params.append(json.dumps({"status": query.status}))
+        if query.element:
+            clauses.append("element = %s")
+            params.append(query.element)
+        if query.since:
+            clauses.append("created_at >= %s")
+            params.append(query.since)
+        if query.until:
+            clauses.append("created_at < %s")
+            params.append(query.until)
+        if query.after:
+            clauses.append("(created_at, id) < (%s, %s)")
+            params.extend(query.cursor_key())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = await self.fetchall(f"""
+            SELECT {SEARCH_COLUMNS}
+            FROM sacred_field_records
+            {where}
+            ORDER BY created_at DESC, id DESC LIMIT %s
+        """, (*params, query.limit + 1))
+        return _page(rows, query.limit)
+
+    async def latest_validations(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        return await self.fetchall("""
+            SELECT DISTINCT ON (field_path) field_path, content_hash, metadata
+            FROM sacred_field_records
+            WHERE content_hash IS NOT NULL
+            ORDER BY field_path, created_at DESC, id DESC
+        """)
+
+    async def healthy(self) -> bool:
+        try:
+            return await self.fetchall("SELECT 1") == [(1,)]
+        except Exception as e:
+            logger.warning(f"PostgreSQL health check failed: {e}")
+            return False
+
+    async def close(self):
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
+        self.executor.shutdown(wait=False)
+
+    def _run_sync(self, work: Callable[[Any], T], transaction: bool) -> T:
+        # One retry on a fresh connection covers server restarts and dropped sockets.
+        for attempt in (1, 2):
+            conn = self._checkout()
+            try:
+                conn.autocommit = not transaction
+                with conn.cursor() as cursor:
+                    result = work(cursor)
+                if transaction:
+                    conn.commit()
+                self._checkin(conn)
+                return result
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                if not conn.closed:
+                    # Server-side errors (statement_timeout's QueryCanceled) leave the connection usable
+                    if transaction:
+                        conn.rollback()
+                    self._checkin(conn)
+                    raise
+                self._discard(conn)
+                if attempt == 2:
+                    raise
+                logger.warning(f"⚠️ PostgreSQL connection lost ({e}); reconnecting")
+            except Exception:
+                if transaction and not conn.closed:
+                    conn.rollback()
+                self._checkin(conn)
+                raise
+
+    def _checkout(self):
+        conn = self.pool.getconn()
+        idle = time.monotonic() - self._last_used.get(id(conn), time.monotonic())
+        if conn.closed or idle > self.health_check_interval:
+            try:
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                if conn.closed:
+                    self._discard(conn)
+                    conn = self.pool.getconn()
+        return conn
+
+    def _checkin(self, conn):
+        self._last_used[id(conn)] = time.monotonic()
+        self.pool.putconn(conn)
+
+    def _discard(self, conn):
+        self._last_used.pop(id(conn), None)
+        self.pool.putconn(conn, close=True)
+
+
+class SQLiteStore(SacredRecordStore):
+    """SQLite stand-in for local runs, CI and benchmarks
+
+    One connection in WAL mode is driven from a single-thread executor, so
+    calls never block the event loop and writes serialize as SQLite requires.
+    Statements use fixed SQL text and hit sqlite3's prepared-statement cache;
+    bulk inserts run as one ``executemany`` transaction.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.conn: Optional[sqlite3.Connection] = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tata-sqlite")
+
+    async def open(self):
+        await self.run(lambda _: None)
+        logger.info(f"🗄️ SQLite storage ready ({self.path})")
+
+    async def run(self, work: Callable[[sqlite3.Connection], T]) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._run_sync, work)
+
+    def _run_sync(self, work: Callable[[sqlite3.Connection], T]) -> T:
+        if self.conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=256)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        return work(self.conn)
+
+    async def ensure_schema(self):
+        def create_schema(conn):
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS sacred_field_records (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        frequency INTEGER NOT NULL,
+                        element VARCHAR(50) NOT NULL,
+                        field_path TEXT NOT NULL,
+                        content_hash VARCHAR(64),
+                        sacred_validation BOOLEAN DEFAULT FALSE,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        metadata TEXT
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_field_frequency ON sacred_field_records(frequency)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_field_element ON sacred_field_records(element)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_field_created ON sacred_field_records(created_at DESC, id DESC)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_field_path_latest ON sacred_field_records(field_path, id DESC)")
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_field_status "
+                    "ON sacred_field_records(json_extract(metadata, '$.status'))"
+                )
+        await self.run(create_schema)
+
+    async def insert_many(self, table: str, columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> None:
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+
+        def work(conn):
+            with conn:
+                conn.executemany(sql, rows)
+        await self.run(work)
+
+    async def search_records(self, query: RecordQuery) -> Tuple[List[tuple], Optional[str]]:
+        clauses, params = [], []
+        if query.text:
+            clauses.append("field_path LIKE ? ESCAPE '\\'")
+            params.append(_contains_pattern(query.text))
+        if query.status:
+            clauses.append("json_extract(metadata, '$.status') = ?")
+            params.append(query.status)
+        if query.element:
+            clauses.append("element = ?")
+            params.append(query.element)
+        if query.since:
+            clauses.append("created_at >= ?")
+            params.append(query.since.replace("T", " "))
+        if query.until:
+            clauses.append("created_at < ?")
+            params.append(query.until.replace("T", " "))
+        if query.after:
+            clauses.append("(created_at, id) < (?, ?)")
+            params.extend(query.cursor_key())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"""
+            SELECT {SEARCH_COLUMNS}
+            FROM sacred_field_records
+            {where}
+            ORDER BY created_at DESC, id DESC LIMIT ?
+        """
+        rows = await self.run(lambda conn: conn.execute(sql, (*params, query.limit + 1)).fetchall())
+        return _page(rows, query.limit)
+
+    async def latest_validations(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        rows = await self.run(lambda conn: conn.execute("""
+            SELECT field_path, content_hash, metadata
+            FROM sacred_field_records
+            WHERE id IN (
+                SELECT MAX(id) FROM sacred_field_records
+                WHERE content_hash IS NOT NULL GROUP BY field_path
+            )
+        """).fetchall())
+        return [(field_path, content_hash, json.loads(metadata)) for field_path, content_hash, metadata in rows]
+
+    async def healthy(self) -> bool:
+        try:
+            return await self.run(lambda conn: conn.execute("SELECT 1").fetchone()) == (1,)
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite health check failed: {e}")
+            return False
+
+    async def close(self):
+        if self.conn is not None:
+            await self.run(lambda conn: conn.close())
+            self.conn = None
+        self.executor.shutdown(wait=False)
+
+
+def _copy_value(value: Any) -> str:
+    """Encode one value for COPY text format"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    text = str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+class ValidationRecordWriter:
+    """Buffered bulk writer for sacred_field_records
+
+    Rows accumulate in memory and are flushed in one transaction once
+    ``batch_size`` rows are pending or ``flush_interval`` seconds have passed.
+    A batch that fails to write is appended to a JSONL journal, which is
+    replayed on the next ``start``; ``close`` flushes whatever is left.
+    ``on_flushed`` callbacks passed to ``add`` run once their row is durable,
+    i.e. written to the store or to the journal.
+    """
+
+    TABLE = RECORD_TABLE
+    COLUMNS = RECORD_COLUMNS
+
+    def __init__(self, store, journal_path: Path, batch_size: int = 1000, flush_interval: float = 1.0):
+        self.store = store
+        self.journal_path = Path(journal_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending: List[Sequence[Any]] = []
+        self._on_flushed: List[Callable[[], None]] = []
+        self.written = 0
+        self._flush_lock = asyncio.Lock()
+        self._ticker: Optional[asyncio.Task] = None
+
+    async def start(self):
+        await self.replay_journal()
+        self._ticker = asyncio.create_task(self._tick())
+
+    async def add(self, row: Sequence[Any], on_flushed: Optional[Callable[[], None]] = None):
+        self.pending.append(row)
+        if on_flushed is not None:
+            self._on_flushed.append(on_flushed)
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self.pending:
+                return 0
+            batch, self.pending = self.pending, []
+            callbacks, self._on_flushed = self._on_flushed, []
+            try:
+                await self.store.insert_many(self.TABLE, self.COLUMNS, batch)
+            except Exception as e:
+                logger.error(f"❌ Bulk write of {len(batch)} records failed ({e}); journaled for retry")
+                try:
+                    self._journal(batch)
+                except OSError:
+                    self.pending[:0] = batch
+                    self._on_flushed[:0] = callbacks
+                    raise
+                written = 0
+            else:
+                self.written += len(batch)
+                logger.info(f"💾 Flushed {len(batch)} validation records")
+                written = len(batch)
+            for callback in callbacks:
+                callback()
+            return written
+
+    async def replay_journal(self):
+        if not self.journal_path.exists():
+            return
+        rows = []
+        for line in self.journal_path.read_text(encoding="utf-8").splitlines():
+            try:
+                row = json.loads(line)
+                # Journals written before a column was added are padded with NULLs
+                rows.append(row + [None] * (len(self.COLUMNS) - len(row)))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt journal line in {self.journal_path}")
+        self.journal_path.unlink()
+        if rows:
+            logger.info(f"🔁 Replaying {len(rows)} journaled validation records")
+            self.pending[:0] = rows
+            await self.flush()
+
+    async def close(self):
+        if self._ticker:
+            self._ticker.cancel()
+            try:
+                await self._ticker
+            except asyncio.CancelledError:
+                pass
+            self._ticker = None
+        await self.flush()
+
+    async def _tick(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                # e.g. the journal itself is unwritable; keep ticking so later batches still flush
+                logger.error(f"❌ Periodic flush failed: {e}")
+
+    def _journal(self, batch: Sequence[Sequence[Any]]):
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.journal_path.open("a", encoding="utf-8") as handle:
+            handle.writelines(json.dumps(list(row)) + "\n" for row in batch)
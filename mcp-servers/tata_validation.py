@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+▼ TATA validation support - pattern scanning and incremental cache
+===================================================================
+
+``SacredPatternScanner`` finds every sacred pattern class (frequency,
+symbols, geometry) in one streaming pass over a file's bytes: small files
+are read in fixed-size chunks, large ones are scanned through mmap, and the
+scan stops as soon as every class has been seen.
+
+``ValidationCache`` remembers the verdict for every validated FIELD file
+together with its content hash, size and mtime. An unchanged stat returns
+the cached verdict without reading the file; a changed stat with identical
+content costs one hash pass but still skips the sacred scan.
+
+``walk_files`` and ``TreeCheckpoint`` support validating whole subtrees:
+a glob-filtered ``os.scandir`` walk and an append-only record of finished
+files so an interrupted run can resume where it stopped.
+"""
+
+import fnmatch
+import hashlib
+import json
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+SACRED_PATTERNS: Dict[str, Sequence[str]] = {
+    "frequency_alignment": ("432", "earth", "tata"),
+    "symbolic_coherence": ("◎", "●", "▼", "▲", "◼", "⦿", "⬡"),
+    "sacred_geometry": ("triangle", "circle", "square", "hexagon", "spiral", "trident"),
+}
+
+
+class SacredPatternScanner:
+    """Single-pass, case-insensitive multi-pattern scanner over file bytes
+
+    All outstanding patterns are compiled into one alternation, so each byte
+    is examined once per pass regardless of how many patterns remain. Once a
+    class is satisfied the alternation shrinks to the classes still missing.
+    Chunks overlap by the longest pattern length so matches spanning a chunk
+    boundary are not lost; memory stays at one chunk however large the file.
+    """
+
+    def __init__(
+        self,
+        categories: Dict[str, Sequence[str]] = SACRED_PATTERNS,
+        chunk_size: int = 1 << 20,
+        mmap_threshold: int = 64 << 20,
+    ):
+        self.categories = list(categories)
+        self.chunk_size = chunk_size
+        self.mmap_threshold = mmap_threshold
+        self._owner: Dict[bytes, str] = {}
+        for category, patterns in categories.items():
+            for pattern in patterns:
+                self._owner[pattern.lower().encode("utf-8")] = category
+        self._overlap = max(len(pattern) for pattern in self._owner) - 1
+        self._compiled: Dict[FrozenSet[str], "re.Pattern[bytes]"] = {}
+
+    def _regex(self, remaining: FrozenSet[str]) -> "re.Pattern[bytes]":
+        regex = self._compiled.get(remaining)
+        if regex is None:
+            alternatives = sorted(
+                (pattern for pattern, category in self._owner.items() if category in remaining),
+                key=len,
+                reverse=True,
+            )
+            regex = re.compile(b"|".join(re.escape(pattern) for pattern in alternatives), re.IGNORECASE)
+            self._compiled[remaining] = regex
+        return regex
+
+    def scan_file(self, path: Path) -> Dict[str, bool]:
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size and size >= self.mmap_threshold:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return self.scan_chunks([mapped])
+            return self.scan_chunks(iter(lambda: handle.read(self.chunk_size), b""))
+
+    def scan_chunks(self, chunks: Iterable[Any]) -> Dict[str, bool]:
+        """Scan a byte stream; stops reading once every class has matched"""
+        remaining = frozenset(self.categories)
+        tail = b""
+        for chunk in chunks:
+            window = tail + chunk if tail else chunk
+            position = 0
+            while remaining:
+                match = self._regex(remaining).search(window, position)
+                if match is None:
+                    break
+                remaining = remaining - {self._owner[match.group().lower()]}
+                # Resume inside the match: another class may overlap it ("squarearth")
+                position = match.start() + 1
+            if not remaining:
+                break
+            tail = bytes(window[-self._overlap:]) if self._overlap else b""
+        return {category: category not in remaining for category in self.categories}
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """Per-path cache of validation verdicts keyed by content hash"""
+
+    def __init__(self):
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, records: Iterable[Tuple[str, str, Dict[str, Any]]]):
+        """Warm the cache from stored ``(field_path, content_hash, metadata)`` rows"""
+        for field_path, content_hash, metadata in records:
+            if content_hash and metadata:
+                self.entries[field_path] = {**metadata, "content_hash": content_hash}
+
+    def fresh(self, key: str, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Cached verdict if size and mtime are unchanged"""
+        entry = self.entries.get(key)
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            self.hits += 1
+            return entry
+        return None
+
+    def matching(self, key: str, stat: os.stat_result, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Cached verdict if the content hash is unchanged; refreshes the stat"""
+        entry = self.entries.get(key)
+        if entry and entry.get("content_hash") == content_hash:
+            entry["size"] = stat.st_size
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def remember(self, key: str, validation: Dict[str, Any]):
+        self.entries[key] = validation
+
+
+def _matches(relative: str, name: str, patterns: Sequence[str]) -> bool:
+    return any(fnmatch.fnmatchcase(relative, p) or fnmatch.fnmatchcase(name, p) for p in patterns)
+
+
+def walk_files(root: Path, include: Sequence[str] = (), exclude: Sequence[str] = ()) -> Iterator[str]:
+    """Yield POSIX paths relative to ``root`` for every regular file beneath it
+
+    Directories are scanned with ``os.scandir`` in name order and symlinked
+    directories are not followed. Globs match the relative path or the bare
+    name; excluded directories are pruned, and when ``include`` is given a
+    file must match one of its globs.
+    """
+    stack = [""]
+    while stack:
+        prefix = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, prefix)) as scan:
+                entries = sorted(scan, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            relative = f"{prefix}/{entry.name}" if prefix else entry.name
+            if exclude and _matches(relative, entry.name, exclude):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(relative)
+                elif entry.is_file() and (not include or _matches(relative, entry.name, include)):
+                    yield relative
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
+
+
+def take(iterator: Iterator[str], count: int) -> List[str]:
+    """Pull up to ``count`` items; lets a blocking walk advance in batches off the event loop"""
+    batch = []
+    for item in iterator:
+        batch.append(item)
+        if len(batch) >= count:
+            break
+    return batch
+
+
+class TreeCheckpoint:
+    """Append-only JSONL record of files finished by a tree validation run"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._handle = None
+
+    def load(self) -> Set[str]:
+        done: Set[str] = set()
+        if not self.path.exists():
+            return done
+        with open(self.path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    done.add(json.loads(line))
+                except ValueError:
+                    continue  # torn final line from an interrupted run
+        return done
+
+    def mark(self, relatives: Iterable[str]):
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.path, "a", encoding="utf-8")
+        self._handle.writelines(json.dumps(relative) + "\n" for relative in relatives)
+        self._handle.flush()
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def clear(self):
+        self.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == "__main__":
+    # Regression check: a pattern overlapping an earlier match must still count
+    scanner = SacredPatternScanner()
+    for sample in (b"squarearth", b"circlearth", b"trianglearth", b"TRIANGLEARTH 432"):
+        verdict = scanner.scan_chunks([sample])
+        assert verdict["frequency_alignment"] and verdict["sacred_geometry"], (sample, verdict)
+    # ...including when the overlap straddles a chunk boundary
+    verdict = scanner.scan_chunks([b"squa", b"rearth"])
+    assert verdict["frequency_alignment"] and verdict["sacred_geometry"], verdict
+    print("SacredPatternScanner overlap checks passed")
@@ -0,0 +1,20 @@
+"""
+Shared setup for the MCP server tests.
+
+The node modules resolve ``MCP_DATA_DIR`` and build their stores at import
+time, so the data directory is pointed at a throwaway location before any
+test imports them. Run from the repository root or ``mcp-servers``::
+
+    python3 -m pytest mcp-servers/tests
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+SERVERS_DIR = Path(__file__).resolve().parent.parent
+
+os.environ["MCP_DATA_DIR"] = tempfile.mkdtemp(prefix="mcp-tests-")
+if str(SERVERS_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVERS_DIR))
@@ -0,0 +1,127 @@
+"""Input validation on the ATLAS design, batch analysis and similarity paths."""
+
+import uuid
+
+import pytest
+
+import atlas_mcp_server as atlas
+from atlas_mcp_server import ATLASRequestHandler, HTTPError
+
+np = pytest.importorskip("numpy")
+
+
+def unique(prefix):
+    return f"{prefix}-{uuid.uuid4().hex[:8]}"
+
+
+def random_vector(dim=16):
+    return np.random.default_rng().standard_normal(dim).tolist()
+
+
+@pytest.mark.parametrize("data, message", [
+    ({"name": ""}, "name must be a non-empty string"),
+    ({"name": 7}, "name must be a non-empty string"),
+    ({"name": "d", "components": "core"}, "components must be a list"),
+    ({"name": "d", "vectors": ["a", "b"]}, "vectors must be finite numbers"),
+    ({"name": "d", "vectors": [1.0, float("nan")]}, "vectors must be finite numbers"),
+    ({"name": "d", "vectors": [1.0, 1e39]}, "vectors must be finite numbers"),
+])
+def test_create_design_rejects_invalid_input(data, message):
+    with pytest.raises(HTTPError) as excinfo:
+        ATLASRequestHandler._create_design(None, data)
+    assert excinfo.value.status == 400
+    assert excinfo.value.message == message
+
+
+def test_create_design_indexes_vectors_for_similarity():
+    name, vector = unique("design"), random_vector()
+    created = ATLASRequestHandler._create_design(None, {"name": name, "vectors": vector})
+    assert created["design"]["version"] == 1
+
+    found = ATLASRequestHandler._similar_patterns(None, {"vectors": vector, "k": 1, "kind": "design"})
+    assert found["results"][0]["name"] == name
+    assert found["results"][0]["similarity"] == pytest.approx(1.0)
+
+
+def test_create_designs_reports_bad_items_and_keeps_the_rest():
+    good = unique("design")
+    summary = ATLASRequestHandler._create_designs(None, [
+        {"name": good, "vectors": random_vector()},
+        {"name": unique("design"), "vectors": [float("inf")]},
+        "not an object",
+    ])
+    assert (summary["status"], summary["applied"], summary["failed"]) == ("partial", 1, 2)
+    assert summary["results"][0]["design"]["name"] == good
+    assert summary["results"][1]["message"] == "vectors must be finite numbers"
+    assert summary["results"][2]["message"] == "item must be a JSON object"
+
+
+@pytest.mark.parametrize("patterns", [None, [], [{"pattern": "a"}, "b"]])
+def test_analyze_batch_rejects_malformed_patterns(patterns):
+    with pytest.raises(HTTPError) as excinfo:
+        ATLASRequestHandler._analyze_intelligence_batch(None, {"patterns": patterns})
+    assert excinfo.value.status == 400
+
+
+def test_analyze_batch_lists_nonfinite_items():
+    patterns = [
+        {"pattern": "ok", "vectors": [1.0, 2.0]},
+        {"pattern": "nan", "vectors": [float("nan"), 1.0]},
+        {"pattern": "huge", "vectors": [1e39]},
+    ]
+    with pytest.raises(HTTPError) as excinfo:
+        ATLASRequestHandler._analyze_intelligence_batch(None, {"patterns": patterns})
+    assert excinfo.value.status == 400
+    assert excinfo.value.message == "vectors must be finite numbers (items 1, 2)"
+
+
+def test_analyze_batch_reports_non_numeric_vectors():
+    result = ATLASRequestHandler._analyze_intelligence_batch(None, {"patterns": [{"vectors": ["x"]}]})
+    assert result == {"status": "error", "message": "vectors must be numeric"}
+
+
+def test_analyze_batch_skips_stored_designs_with_non_numeric_vectors():
+    # Written straight to the registry, as designs were before create validated vectors
+    atlas.DESIGN_REGISTRY.create({"name": unique("legacy"), "vectors": ["a", "b"]})
+    names, matrix = atlas.DESIGN_REGISTRY.vector_matrix()
+    assert len(names) == matrix.shape[0]
+
+    result = ATLASRequestHandler._analyze_intelligence_batch(
+        None, {"patterns": [{"pattern": "p", "vectors": [1.0, 2.0, 3.0]}]}
+    )
+    assert result["status"] == "analyzed"
+    assert result["count"] == 1
+
+
+def test_similarity_index_build_skips_unusable_stored_vectors():
+    atlas.HISTORY.append({"pattern": unique("stale"), "vectors": ["a"], "timestamp": "2024-01-01T00:00:00"})
+    atlas.HISTORY.append({"pattern": unique("stale"), "vectors": [1e39], "timestamp": "2024-01-01T00:00:01"})
+    with atlas.SIMILARITY.lock:
+        atlas.SIMILARITY._index = None
+
+    result = ATLASRequestHandler._similar_patterns(None, {"vectors": random_vector(), "k": 3})
+    assert result["status"] == "ok"
+    assert not any(match["name"].startswith("stale") for match in result["results"])
+
+
+@pytest.mark.parametrize("data, expected", [
+    ({}, "vectors required"),
+    ({"vectors": ["x"]}, "vectors must be numeric and k an integer"),
+    ({"vectors": [1.0], "k": "many"}, "vectors must be numeric and k an integer"),
+])
+def test_similar_reports_unusable_queries(data, expected):
+    assert ATLASRequestHandler._similar_patterns(None, data) == {"status": "error", "message": expected}
+
+
+def test_similar_rejects_nonfinite_query():
+    with pytest.raises(HTTPError) as excinfo:
+        ATLASRequestHandler._similar_patterns(None, {"vectors": [float("nan"), 1.0]})
+    assert excinfo.value.status == 400
+
+
+def test_similar_returns_k_matches():
+    ATLASRequestHandler._create_designs(None, [{"name": unique("design"), "vectors": random_vector()} for _ in range(5)])
+    result = ATLASRequestHandler._similar_patterns(None, {"vectors": random_vector(), "k": 3})
+    assert len(result["results"]) == 3
+    similarities = [match["similarity"] for match in result["results"]]
+    assert similarities == sorted(similarities, reverse=True)
@@ -0,0 +1,98 @@
+"""Newest-first cursor paging and time windows over ``JSONListStore``."""
+
+import json
+
+import pytest
+
+from mcp_runtime import JSONListStore, PageRequest, TimeRange
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JSONListStore(tmp_path / "records.json")
+    store.extend([{"id": n, "timestamp": f"2024-01-01T00:00:{n:02d}"} for n in range(10)])
+    return store
+
+
+def ids(items):
+    return [item["id"] for item in items]
+
+
+def walk(store, limit):
+    pages, after = [], None
+    while True:
+        items, cursor, total = store.page(PageRequest(limit=limit, after=after))
+        pages.append(ids(items))
+        if cursor is None:
+            return pages, total
+        after = int(cursor)
+
+
+def test_page_walks_newest_first_without_gaps(store):
+    pages, total = walk(store, 4)
+    assert pages == [[9, 8, 7, 6], [5, 4, 3, 2], [1, 0]]
+    assert total == 10
+
+
+def test_page_without_limit_returns_everything(store):
+    items, cursor, total = store.page(PageRequest())
+    assert ids(items) == list(range(9, -1, -1))
+    assert (cursor, total) == (None, 10)
+
+
+def test_page_cursor_survives_appends(store):
+    items, cursor, _ = store.page(PageRequest(limit=3))
+    assert ids(items) == [9, 8, 7]
+    store.append({"id": 10, "timestamp": "2024-01-01T00:00:10"})
+    items, _, total = store.page(PageRequest(limit=3, after=int(cursor)))
+    assert ids(items) == [6, 5, 4]
+    assert total == 11
+
+
+def test_page_cursor_survives_removal(store):
+    _, cursor, _ = store.page(PageRequest(limit=3))
+    assert store.remove(lambda record: record["id"] in (6, 4)) == 2
+    items, _, total = store.page(PageRequest(limit=3, after=int(cursor)))
+    assert ids(items) == [5, 3, 2]
+    assert total == 8
+
+
+def test_page_after_trim_to_keep(tmp_path):
+    store = JSONListStore(tmp_path / "kept.json", keep=5)
+    store.extend([{"id": n} for n in range(8)])
+    pages, total = walk(store, 2)
+    assert pages == [[7, 6], [5, 4], [3]]
+    assert total == 5
+    assert ids(json.loads(store.path.read_text())) == [3, 4, 5, 6, 7]
+
+
+def test_page_projects_fields(store):
+    items, _, _ = store.page(PageRequest(limit=1, fields=["id", "missing"]))
+    assert items == [{"id": 9}]
+
+
+def test_page_reloads_from_file(store):
+    reloaded = JSONListStore(store.path)
+    pages, total = walk(reloaded, 6)
+    assert pages == [[9, 8, 7, 6, 5, 4], [3, 2, 1, 0]]
+    assert total == 10
+
+
+@pytest.mark.parametrize("since, until, expected", [
+    (None, None, list(range(10))),
+    ("2024-01-01T00:00:03", None, list(range(3, 10))),
+    (None, "2024-01-01T00:00:02", [0, 1, 2]),
+    ("2024-01-01T00:00:04", "2024-01-01T00:00:06", [4, 5, 6]),
+    ("2024-01-01T00:00:04.5", "2024-01-01T00:00:06", [5, 6]),
+    ("2025-01-01", None, []),
+])
+def test_window_is_inclusive_and_oldest_first(store, since, until, expected):
+    assert ids(store.window(TimeRange(since, until))) == expected
+
+
+def test_window_on_other_key_skips_records_without_it(tmp_path):
+    store = JSONListStore(tmp_path / "events.json")
+    store.extend([{"id": 0}, {"id": 1, "at": "b"}, {"id": 2, "at": "d"}])
+    assert ids(store.window(TimeRange(since="a"), key="at")) == [1, 2]
+    assert ids(store.window(TimeRange(until="c"), key="at")) == [1]
+    assert ids(store.window(TimeRange(), key="at")) == [0, 1, 2]
@@ -0,0 +1,121 @@
+"""Content-coding negotiation and chunked request bodies in ``mcp_http``."""
+
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from mcp_http import AsyncHTTPServer, HTTPError, MCPRequestHandler, negotiate_encoding
+
+
+class EchoHandler(MCPRequestHandler):
+    compress_min_bytes = 0
+
+    def do_POST(self):  # noqa: N802
+        self.send_json({"length": len(self.body), "body": self.body.decode("utf-8")})
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("deflate", "deflate"),
+    ("gzip, deflate", "gzip"),
+    ("GZIP", "gzip"),
+    ("gzip;q=0.5, deflate", "deflate"),
+    ("deflate;q=0.2, gzip;q=0.8", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=0, deflate;q=0", None),
+    ("*", "gzip"),
+    ("*;q=0", None),
+    ("*, gzip;q=0", "deflate"),
+    ("br, *;q=0.1", "gzip"),
+    ("gzip;q=bogus, deflate", "deflate"),
+    (" gzip ; q=1.0 ", "gzip"),
+])
+def test_negotiate_encoding(accept, expected):
+    assert negotiate_encoding(accept) == expected
+
+
+def read_chunked(raw, **options):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await AsyncHTTPServer(MCPRequestHandler, **options)._read_chunked(reader)
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (b"0\r\n\r\n", b""),
+    (b"5\r\nhello\r\n0\r\n\r\n", b"hello"),
+    (b"5\r\nhello\r\n1\r\n \r\nA\r\n0123456789\r\n0\r\n\r\n", b"hello 0123456789"),
+    (b"5;name=value\r\nhello\r\n0\r\n\r\n", b"hello"),
+    (b"5\r\nhello\r\n0\r\nX-Checksum: abc\r\nX-Other: 1\r\n\r\n", b"hello"),
+])
+def test_read_chunked_decodes_body(raw, expected):
+    assert read_chunked(raw) == expected
+
+
+@pytest.mark.parametrize("raw, status", [
+    (b"zz\r\nhello\r\n0\r\n\r\n", 400),
+    (b"-5\r\nhello\r\n0\r\n\r\n", 400),
+    (b"5\r\nhelloXX0\r\n\r\n", 400),
+    (b"8\r\n01234567\r\n0\r\n\r\n", 413),
+])
+def test_read_chunked_rejects_bad_framing(raw, status):
+    with pytest.raises(HTTPError) as excinfo:
+        read_chunked(raw, max_body_bytes=6)
+    assert excinfo.value.status == status
+
+
+def test_read_chunked_truncated_body_raises():
+    with pytest.raises(asyncio.IncompleteReadError):
+        read_chunked(b"5\r\nhel")
+
+
+async def exchange(server, request):
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    writer.write(request)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {name.lower(): value.strip() for name, _, value in (line.partition(":") for line in lines[1:])}
+    return int(lines[0].split()[1]), headers, body
+
+
+def serve_and_send(request):
+    async def run():
+        server = AsyncHTTPServer(EchoHandler, "127.0.0.1", 0)
+        await server.start()
+        try:
+            return await exchange(server, request)
+        finally:
+            await server.shutdown(grace=1)
+    return asyncio.run(run())
+
+
+def test_server_accepts_chunked_upload_and_gzips_reply():
+    status, headers, body = serve_and_send(
+        b"POST /echo HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+        b"Transfer-Encoding: chunked\r\nAccept-Encoding: gzip\r\n\r\n"
+        b"6\r\n{\"a\":1\r\n1\r\n}\r\n0\r\n\r\n"
+    )
+    assert status == 200
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert json.loads(gzip.decompress(body)) == {"length": 7, "body": '{"a":1}'}
+
+
+@pytest.mark.parametrize("framing, status", [
+    (b"Transfer-Encoding: gzip\r\n", 501),
+    (b"Transfer-Encoding: chunked\r\nContent-Length: 5\r\n", 400),
+])
+def test_server_rejects_unsupported_transfer_coding(framing, status):
+    answer, _, _ = serve_and_send(
+        b"POST /echo HTTP/1.1\r\nHost: test\r\n" + framing + b"\r\n5\r\nhello\r\n0\r\n\r\n"
+    )
+    assert answer == status
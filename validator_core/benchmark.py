@@ -0,0 +1,401 @@
+"""
+Micro-benchmarks for the validator, coherence checker, observer and flow pipeline.
+
+Each case is timed single-threaded over several repeats and then across a
+process pool; results (ns/call, allocations, environment) are written as
+JSON and can be compared against an earlier run to catch regressions. The
+module uses package-relative imports, so run it from the repository root::
+
+    python3 -m validator_core.benchmark --quick
+    python3 -m validator_core.benchmark --only harmonic --workers 4
+    python3 -m validator_core.benchmark --compare validator_benchmark.json --threshold 1.10
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .coherence_check import CrossValidatorCoherence
+from .observer_interface import ObserverAction, ObserverCommand, ObserverInterface
+from .tracing import RingBufferExporter, Tracer
+from .validation_flow import ValidationFlowPipeline
+from .validator import FieldValidator
+
+CONFIG_PATH = str(Path(__file__).with_name("validator_config.yaml"))
+RESULTS_FORMAT = 1
+POOL_SIZE = 256
+DOMAINS = ['OBI-WAN', 'BERJAK', 'INFINITY']
+GATES = ["🜂", "🜄", "🜃", "🜁"]
+
+Workload = Tuple[Callable[..., Any], List[Tuple[Any, ...]]]
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    build: Callable[[random.Random, Dict[str, Any]], Workload]
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        suffix = ",".join(f"{name}={value}" for name, value in self.params.items())
+        return f"{self.name}[{suffix}]" if suffix else self.name
+
+
+# Workload generators ---------------------------------------------------------
+
+def _is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    for i in range(3, int(n ** 0.5) + 1, 2):
+        if n % i == 0:
+            return False
+    return True
+
+
+def prime_run(rng: random.Random, length: int, magnitude: int) -> List[int]:
+    """Consecutive primes starting at a random point below ``magnitude``."""
+    candidate = rng.randrange(2, max(3, magnitude))
+    primes: List[int] = []
+    while len(primes) < length:
+        if _is_prime(candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def corrupt_sequence(rng: random.Random, sequence: List[int]) -> List[int]:
+    """Breaks a prime run by inserting a composite or swapping two neighbours."""
+    sequence = list(sequence)
+    index = rng.randrange(len(sequence))
+    if len(sequence) > 1 and rng.random() < 0.5:
+        index = min(index, len(sequence) - 2)
+        sequence[index], sequence[index + 1] = sequence[index + 1], sequence[index]
+    else:
+        sequence[index] = sequence[index] + 1 if sequence[index] > 2 else 4
+    return sequence
+
+
+def field_coordinates(rng: random.Random, node: int, invalid: bool = False) -> Dict[str, str]:
+    coordinates = {
+        'latitude': f"FIELD/node-{rng.randrange(100)}/{node:03d}",
+        'longitude': f"{rng.choice(DOMAINS)}/personal",
+        'temporal': f"{rng.randrange(10 ** 13, 10 ** 14)}Z"
+    }
+    if invalid:
+        broken = rng.choice(list(coordinates))
+        coordinates[broken] = {
+            'latitude': f"FIELD/node {node}",
+            'longitude': "UNKNOWN/personal",
+            'temporal': "2025-06-12T09:14:27Z"
+        }[broken]
+    return coordinates
+
+
+def build_prime_sequence(rng: random.Random, params: Dict[str, Any]) -> Workload:
+    validator = FieldValidator(CONFIG_PATH, tracer=Tracer(sample_rate=0.0))
+    items = []
+    for _ in range(POOL_SIZE):
+        sequence = prime_run(rng, params['length'], params['magnitude'])
+        if rng.random() < params['invalid']:
+            sequence = corrupt_sequence(rng, sequence)
+        items.append((sequence,))
+    return validator.validate_prime_sequence, items
+
+
+def build_harmonic_ratios(rng: random.Random, params: Dict[str, Any]) -> Workload:
+    validator = FieldValidator(CONFIG_PATH, tracer=Tracer(sample_rate=0.0))
+    runs = []
+    for _ in range(8):  # long runs are slow to generate; cycle a few of them
+        sequence = prime_run(rng, params['length'], params['magnitude'])
+        if rng.random() < params['invalid']:
+            sequence = corrupt_sequence(rng, sequence)
+        runs.append((sequence,))
+    return validator.validate_harmonic_ratios, [runs[i % len(runs)] for i in range(POOL_SIZE)]
+
+
+def build_harmonic_batch(rng: random.Random, params: Dict[str, Any]) -> Workload:
+    validator = FieldValidator(CONFIG_PATH, tracer=Tracer(sample_rate=0.0))
+    sequences = []
+    for _ in range(params['batch']):
+        sequence = prime_run(rng, params['length'], 1000)
+        if rng.random() < params['invalid']:
+            sequence = corrupt_sequence(rng, sequence)
+        sequences.append(sequence)
+    return validator.validate_harmonic_batch, [(sequences,)]
+
+
+def build_field_address(rng: random.Random, params: Dict[str, Any]) -> Workload:
+    validator = FieldValidator(CONFIG_PATH, tracer=Tracer(sample_rate=0.0))
+    items = []
+    for _ in range(POOL_SIZE):
+        coordinates = field_coordinates(rng, rng.randrange(1000), rng.random() < params['invalid'])
+        items.append((coordinates['latitude'], coordinates['longitude'], coordinates['temporal']))
+    return validator.validate_field_address, items
+
+
+def build_gate_transition(rng: random.Random, params: Dict[str, Any]) -> Workload:
+    validator = FieldValidator(CONFIG_PATH, tracer=Tracer(sample_rate=0.0))
+    items = []
+    for _ in range(POOL_SIZE):
+        if rng.random() < params['invalid']:
+            items.append((rng.choice(GATES + ["🜔"]), rng.choice(DOMAINS + ["VOID"]), rng.choice(DOMAINS)))
+        else:
+            items.append((GATES[0], 'OBI-WAN', 'BERJAK'))
+    return validator.validate_gate_transition, items
+
+
+def build_full_field_coherence(rng: random.Random, params: Dict[str, Any]) -> Workload:
+    checker = CrossValidatorCoherence(tracer=Tracer(sample_rate=0.0))
+    items = []
+    for _ in range(POOL_SIZE):
+        sequence = prime_run(rng, params['length'], 1000)
+        coordinates = field_coordinates(rng, rng.choice(sequence))
+        coordinates['longitude'] = "OBI-WAN/personal"
+        if rng.random() < params['invalid']:
+            coordinates['latitude'] = f"FIELD/node-1/{sequence[-1] + 1}"
+        items.append((sequence, coordinates, GATES[0], 'BERJAK', []))
+    return checker.check_full_field_coherence, items
+
+
+def build_observer_command(rng: random.Random, params: Dict[str, Any]) -> Workload:
+    pipeline = ValidationFlowPipeline(CONFIG_PATH, tracer=Tracer(RingBufferExporter(), sample_rate=params['trace_sample']))
+    observer = ObserverInterface(pipeline)
+    timestamp = datetime(2025, 6, 12).isoformat() + 'Z'
+    items = []
+    for _ in range(POOL_SIZE):
+        roll = rng.random()
+        if roll < 0.5:
+            sequence = prime_run(rng, 8, 1000)
+            if rng.random() < params['invalid']:
+                sequence = corrupt_sequence(rng, sequence)
+            command = ObserverCommand(
+                ObserverAction.ADVANCE, {'step_type': 'prime_sequence', 'params': {'sequence': sequence}}, timestamp
+            )
+        elif roll < 0.8:
+            command = ObserverCommand(ObserverAction.INSPECT, {}, timestamp)
+        else:
+            command = ObserverCommand(ObserverAction.TRACE, {'limit': 10}, timestamp)
+        items.append((command,))
+
+    def execute(command: ObserverCommand) -> Any:
+        # Keep the flow history bounded so long runs measure steady state
+        del pipeline.flow_context.validation_history[:-100]
+        return observer.execute_command(command)
+
+    return execute, items
+
+
+CASES = [
+    BenchmarkCase("validate_prime_sequence", build_prime_sequence, {'length': 8, 'magnitude': 1000, 'invalid': 0.2}),
+    BenchmarkCase("validate_prime_sequence", build_prime_sequence, {'length': 64, 'magnitude': 100_000, 'invalid': 0.2}),
+    BenchmarkCase("validate_prime_sequence", build_prime_sequence, {'length': 512, 'magnitude': 1_000_000, 'invalid': 0.2}),
+    BenchmarkCase("validate_harmonic_ratios", build_harmonic_ratios, {'length': 8, 'magnitude': 1000, 'invalid': 0.2}),
+    BenchmarkCase("validate_harmonic_ratios", build_harmonic_ratios, {'length': 4096, 'magnitude': 1_000_000, 'invalid': 0.2}),
+    BenchmarkCase("validate_harmonic_batch", build_harmonic_batch, {'batch': 1024, 'length': 32, 'invalid': 0.2}),
+    BenchmarkCase("validate_field_address", build_field_address, {'invalid': 0.2}),
+    BenchmarkCase("validate_gate_transition", build_gate_transition, {'invalid': 0.2}),
+    BenchmarkCase("check_full_field_coherence", build_full_field_coherence, {'length': 16, 'invalid': 0.2}),
+    BenchmarkCase("execute_command", build_observer_command, {'invalid': 0.2, 'trace_sample': 0.0}),
+]
+
+
+# Measurement -----------------------------------------------------------------
+
+def _case(key: str) -> BenchmarkCase:
+    return next(case for case in CASES if case.key == key)
+
+
+def _seed(seed: int, case: BenchmarkCase, worker: int = 0) -> random.Random:
+    return random.Random(f"{seed}:{case.key}:{worker}")
+
+
+def _timed_loop(target: Callable[..., Any], items: List[Tuple[Any, ...]], loops: int) -> float:
+    count = len(items)
+    start = time.perf_counter()
+    for index in range(loops):
+        target(*items[index % count])
+    return time.perf_counter() - start
+
+
+def calibrate(target: Callable[..., Any], items: List[Tuple[Any, ...]], min_time: float) -> int:
+    """Number of calls that takes at least ``min_time`` seconds."""
+    loops = 1
+    while True:
+        if _timed_loop(target, items, loops) >= min_time or loops >= 10_000_000:
+            return loops
+        loops *= 2
+
+
+def _outcome(result: Any) -> bool:
+    if isinstance(result, list):
+        return all(_outcome(item) for item in result)
+    for name in ('is_valid', 'is_coherent', 'success'):
+        if hasattr(result, name):
+            return bool(getattr(result, name))
+    return bool(result)
+
+
+def memory_per_result(target: Callable[..., Any], items: List[Tuple[Any, ...]], count: int = 200) -> float:
+    """Bytes still allocated per result when ``count`` results are kept alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        results = [target(*items[index % len(items)]) for index in range(count)]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del results
+    return allocated / count
+
+
+def _shard(key: str, seed: int, worker: int, loops: int) -> float:
+    """Process-pool entry point: rebuild the workload in the worker and time ``loops`` calls."""
+    logging.disable(logging.INFO)
+    case = _case(key)
+    target, items = case.build(_seed(seed, case, worker), case.params)
+    _timed_loop(target, items, min(loops, len(items)))
+    return loops / _timed_loop(target, items, loops)
+
+
+def run_case(case: BenchmarkCase, seed: int, repeats: int, min_time: float, workers: int) -> Dict[str, Any]:
+    target, items = case.build(_seed(seed, case), case.params)
+    valid = sum(_outcome(target(*args)) for args in items) / len(items)
+    loops = calibrate(target, items, min_time)
+    per_call = sorted(_timed_loop(target, items, loops) / loops for _ in range(repeats))
+    single_ops = 1 / per_call[len(per_call) // 2]
+
+    result = {
+        'case': case.key,
+        'function': case.name,
+        'params': case.params,
+        'valid_fraction': round(valid, 4),
+        'loops': loops,
+        'repeats': repeats,
+        'ns_per_call': {
+            'min': round(per_call[0] * 1e9, 1),
+            'median': round(per_call[len(per_call) // 2] * 1e9, 1),
+            'max': round(per_call[-1] * 1e9, 1)
+        },
+        'ops_per_sec': round(single_ops, 1),
+        'bytes_per_result': round(memory_per_result(target, items), 1)
+    }
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rates = list(pool.map(_shard, [case.key] * workers, [seed] * workers, range(1, workers + 1), [loops] * workers))
+        result['multi'] = {
+            'workers': workers,
+            'ops_per_sec': round(sum(rates), 1),
+            'speedup': round(sum(rates) / single_ops, 2)
+        }
+    return result
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=Path(__file__).parent, capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def run_suite(
+    seed: int = 432,
+    repeats: int = 5,
+    min_time: float = 0.2,
+    workers: int = 0,
+    only: Optional[str] = None
+) -> Dict[str, Any]:
+    """Runs every benchmark case; returns the machine-readable results document."""
+    workers = workers or os.cpu_count() or 1
+    logging.disable(logging.INFO)
+    try:
+        results = []
+        for case in CASES:
+            if only and only not in case.key:
+                continue
+            result = run_case(case, seed, repeats, min_time, workers)
+            results.append(result)
+            print(
+                f"{case.key:<75} {result['ns_per_call']['median']:>14,.0f} ns/call  "
+                f"{result['bytes_per_result']:>8,.0f} B/result  valid={result['valid_fraction']:.2f}"
+                + (f"  x{workers}: {result['multi']['ops_per_sec']:,.0f} ops/s" if 'multi' in result else ""),
+                file=sys.stderr
+            )
+    finally:
+        logging.disable(logging.NOTSET)
+    return {
+        'format': RESULTS_FORMAT,
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'min_time': min_time,
+        'results': results
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Median ns/call ratio (current / baseline) for every case present in both runs."""
+    previous = {result['case']: result for result in baseline.get('results', [])}
+    changes = []
+    for result in current['results']:
+        before = previous.get(result['case'])
+        if before:
+            ratio = result['ns_per_call']['median'] / before['ns_per_call']['median']
+            changes.append({'case': result['case'], 'ratio': round(ratio, 3)})
+    return changes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the FIELD validator core.")
+    parser.add_argument('--output', default="validator_benchmark.json", help="results file (JSON)")
+    parser.add_argument('--compare', help="earlier results file; exits 1 if a case regressed past --threshold")
+    parser.add_argument('--threshold', type=float, default=1.10, help="ns/call ratio treated as a regression")
+    parser.add_argument('--seed', type=int, default=432)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds per timed repeat")
+    parser.add_argument('--workers', type=int, default=0, help="processes for the multi-core run (default: CPU count)")
+    parser.add_argument('--only', help="run only cases whose key contains this text")
+    parser.add_argument('--quick', action='store_true', help="short repeats for a smoke run")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.repeats, args.min_time = 3, 0.05
+    document = run_suite(args.seed, args.repeats, args.min_time, args.workers, args.only)
+    Path(args.output).write_text(json.dumps(document, indent=2, ensure_ascii=False) + "\n", encoding='utf-8')
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        changes = compare(json.loads(Path(args.compare).read_text(encoding='utf-8')), document)
+        regressed = [change for change in changes if change['ratio'] > args.threshold]
+        for change in changes:
+            marker = "REGRESSED" if change in regressed else ""
+            print(f"{change['case']:<75} x{change['ratio']:.3f} {marker}", file=sys.stderr)
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
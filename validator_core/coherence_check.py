@@ -5,6 +5,12 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+try:
+    from .rule_metrics import RuleMetrics
+    from .tracing import TRACER, Tracer, traced
+except ImportError:  # run as a script: python3 coherence_check.py
+    from rule_metrics import RuleMetrics
+    from tracing import TRACER, Tracer, traced
 
 class CoherenceState(Enum):
     COHERENT = "coherent"
@@ -23,11 +29,14 @@ class CoherenceResult:
     details: Dict[str, Any] = None
 
 class CrossValidatorCoherence:
-    def __init__(self):
+    def __init__(self, metrics: Optional[RuleMetrics] = None, tracer: Optional[Tracer] = None):
         self.logger = logging.getLogger("CrossValidatorCoherence")
+        self.metrics = metrics or RuleMetrics()
+        self.tracer = tracer or TRACER
         self.coherence_state = CoherenceState.COHERENT
         self.drift_history: List[Dict[str, Any]] = []
 
+    @traced("coherence.prime_spatial")
     def check_prime_spatial_coherence(
         self,
         prime_sequence: List[int],
@@ -40,7 +49,9 @@ class CrossValidatorCoherence:
             node_id = latitude.split('/')[-1] if latitude else ''
             
             # Verify node ID aligns with prime sequence
-            if node_id and not self._validate_node_prime_alignment(int(node_id), prime_sequence):
+            if node_id and not self.metrics.check(
+                "prime_spatial", self._validate_node_prime_alignment, int(node_id), prime_sequence
+            ):
                 return CoherenceResult(
                     is_coherent=False,
                     state=CoherenceState.CRITICAL_DRIFT,
@@ -61,6 +72,7 @@ class CrossValidatorCoherence:
             self.logger.error(f"Prime-spatial coherence check error: {str(e)}")
             return self._create_error_result("COHERENCE_CHECK_ERROR", str(e))
 
+    @traced("coherence.gate_temporal")
     def check_gate_temporal_coherence(
         self,
         gate: str,
@@ -70,7 +82,9 @@ class CrossValidatorCoherence:
         """Validates coherence between gate transition and temporal sequence."""
         try:
             # Verify temporal sequence of gates
-            if not self._validate_gate_temporal_sequence(gate, temporal_marker, active_gates):
+            if not self.metrics.check(
+                "gate_temporal", self._validate_gate_temporal_sequence, gate, temporal_marker, active_gates
+            ):
                 return CoherenceResult(
                     is_coherent=False,
                     state=CoherenceState.PARTIAL_DRIFT,
@@ -91,6 +105,7 @@ class CrossValidatorCoherence:
             self.logger.error(f"Gate-temporal coherence check error: {str(e)}")
             return self._create_error_result("COHERENCE_CHECK_ERROR", str(e))
 
+    @traced("coherence.spatial_gate")
     def check_spatial_gate_coherence(
         self,
         field_coordinates: Dict[str, str],
@@ -103,7 +118,9 @@ class CrossValidatorCoherence:
             current_domain = field_coordinates.get('longitude', '').split('/')[0]
             
             # Verify domain transition is valid for gate
-            if not self._validate_domain_gate_compatibility(current_domain, target_domain, gate):
+            if not self.metrics.check(
+                "spatial_gate", self._validate_domain_gate_compatibility, current_domain, target_domain, gate
+            ):
                 return CoherenceResult(
                     is_coherent=False,
                     state=CoherenceState.CRITICAL_DRIFT,
@@ -124,6 +141,7 @@ class CrossValidatorCoherence:
             self.logger.error(f"Spatial-gate coherence check error: {str(e)}")
             return self._create_error_result("COHERENCE_CHECK_ERROR", str(e))
 
+    @traced("coherence.full_field")
     def check_full_field_coherence(
         self,
         prime_sequence: List[int],
@@ -242,3 +260,5 @@ if __name__ == "__main__":
     )
     print(f"Full Field Coherence: {result}")
 
+    print(f"Rule Metrics: {coherence_checker.metrics.snapshot()}")
+
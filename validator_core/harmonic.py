@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+import re
+from dataclasses import dataclass, field
+from fractions import Fraction
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_PATTERN = "[1:2,2:3,3:5,5:7,7:11]"
+DEFAULT_TOLERANCE = 0.05
+VECTOR_THRESHOLD = 64
+
+
+@dataclass
+class HarmonicReport:
+    coherent: bool
+    violations: List[int] = field(default_factory=list)
+    max_deviation: float = 0.0
+
+
+def parse_ratio_pattern(pattern: str) -> List[Fraction]:
+    """Parses "[1:2,2:3,...]" into the ratios a/b."""
+    pairs = re.findall(r"(\d+)\s*:\s*(\d+)", pattern)
+    if not pairs:
+        raise ValueError(f"Invalid harmonic ratio pattern: {pattern}")
+    return [Fraction(int(a), int(b)) for a, b in pairs]
+
+
+class HarmonicRatioEngine:
+    """Checks consecutive-term ratios s[i]/s[i+1] against a harmonic pattern.
+
+    A sequence whose first term is one of the pattern's anchors (the chain
+    1, 2, 3, 5, 7, 11 for the default pattern) is aligned with it, and every
+    overlapping ratio must be within ``tolerance`` of the pattern ratio.
+    Every ratio, inside or beyond the pattern, must also lie in the harmonic
+    band [min pattern ratio - tolerance, 1). Sequences at least
+    ``vector_threshold`` long, and all batches, are checked with NumPy.
+    """
+
+    def __init__(self, pattern: str = DEFAULT_PATTERN, tolerance: float = DEFAULT_TOLERANCE,
+                 vector_threshold: int = VECTOR_THRESHOLD):
+        ratios = parse_ratio_pattern(pattern)
+        self.ratios = [float(ratio) for ratio in ratios]
+        self.tolerance = tolerance
+        self.vector_threshold = vector_threshold
+        self.band_low = min(self.ratios) - tolerance
+        # The chain a0:a1, a1:a2, ... names its anchor terms a0..an
+        anchors = [ratio.numerator for ratio in ratios] + [ratios[-1].denominator]
+        self.anchors = {anchor: index for index, anchor in enumerate(anchors)}
+        if np is not None:
+            self._pattern = np.append(np.asarray(self.ratios, dtype=np.float64), np.nan)
+            self._anchor_values = np.asarray(sorted(self.anchors), dtype=np.float64)
+            self._anchor_offsets = np.asarray([self.anchors[a] for a in sorted(self.anchors)], dtype=np.int64)
+
+    def check(self, sequence: Sequence[float]) -> HarmonicReport:
+        """Checks one sequence."""
+        if np is not None and len(sequence) >= self.vector_threshold:
+            return self.check_batch([sequence])[0]
+        violations, max_deviation = [], 0.0
+        offset = self.anchors.get(sequence[0]) if len(sequence) else None
+        for i in range(len(sequence) - 1):
+            try:
+                ratio = sequence[i] / sequence[i+1]
+            except ZeroDivisionError:
+                violations.append(i)
+                continue
+            bad = not self.band_low <= ratio < 1
+            if offset is not None and offset + i < len(self.ratios):
+                deviation = abs(ratio - self.ratios[offset + i])
+                max_deviation = max(max_deviation, deviation)
+                bad = bad or deviation > self.tolerance
+            if bad:
+                violations.append(i)
+        return HarmonicReport(coherent=not violations, violations=violations, max_deviation=float(max_deviation))
+
+    def check_batch(self, sequences: Sequence[Sequence[float]]) -> List[HarmonicReport]:
+        """Checks many sequences in one vectorized pass (ragged lengths are NaN-padded)."""
+        if np is None:
+            return [self.check(sequence) for sequence in sequences]
+        if not len(sequences):
+            return []
+        terms = self._matrix(sequences)
+        coherent, violations, deviation = self.evaluate(terms)
+        rows, columns = np.nonzero(violations)
+        per_row: List[List[int]] = [[] for _ in range(len(sequences))]
+        for row, column in zip(rows.tolist(), columns.tolist()):
+            per_row[row].append(column)
+        return [
+            HarmonicReport(coherent=bool(ok), violations=indices, max_deviation=float(worst))
+            for ok, indices, worst in zip(coherent, per_row, deviation)
+        ]
+
+    def evaluate(self, terms: "np.ndarray"):
+        """Vectorized core over a (sequences, terms) float array, NaN-padded on the right.
+
+        Returns per-sequence coherence, the (sequences, terms - 1) violation
+        mask and each sequence's largest deviation from the pattern.
+        """
+        count, length = terms.shape
+        if length < 2:
+            return np.ones(count, dtype=bool), np.zeros((count, 0), dtype=bool), np.zeros(count)
+        left, right = terms[:, :-1], terms[:, 1:]
+        pairs = ~(np.isnan(left) | np.isnan(right))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = left / right
+        in_band = (ratios >= self.band_low) & (ratios < 1)
+
+        violations = pairs & ~in_band
+
+        # Only the first len(pattern) ratios of an anchored sequence can align with the pattern
+        first = terms[:, 0]
+        slot = np.searchsorted(self._anchor_values, first).clip(max=len(self._anchor_values) - 1)
+        offsets = np.where(self._anchor_values[slot] == first, self._anchor_offsets[slot], -1)
+        width = min(len(self.ratios), length - 1)
+        index = offsets[:, None] + np.arange(width)[None, :]
+        # Zero denominators are already band violations; like check(), they add no deviation
+        aligned = (offsets[:, None] >= 0) & (index < len(self.ratios)) & pairs[:, :width] & (right[:, :width] != 0)
+        expected = self._pattern[np.where(aligned, index, len(self.ratios))]
+        deviation = np.where(aligned, np.abs(ratios[:, :width] - expected), 0.0)
+        deviation = np.where(np.isnan(deviation), np.inf, deviation)
+        violations[:, :width] |= deviation > self.tolerance
+
+        return ~violations.any(axis=1), violations, deviation.max(axis=1)
+
+    @staticmethod
+    def _matrix(sequences: Sequence[Sequence[float]]) -> "np.ndarray":
+        try:
+            return np.asarray(sequences, dtype=np.float64).reshape(len(sequences), -1)
+        except ValueError:
+            pass
+        width = max(len(sequence) for sequence in sequences)
+        terms = np.full((len(sequences), width), np.nan)
+        for row, sequence in enumerate(sequences):
+            terms[row, :len(sequence)] = sequence
+        return terms
+
+
+def engine_from_config(rule: Optional[dict]) -> HarmonicRatioEngine:
+    """Builds the engine for a ``harmonic_ratios`` rule; missing settings use the defaults."""
+    rule = rule or {}
+    return HarmonicRatioEngine(
+        rule.get('pattern') or DEFAULT_PATTERN,
+        float(rule.get('tolerance', DEFAULT_TOLERANCE)),
+        int(rule.get('vector_threshold', VECTOR_THRESHOLD))
+    )
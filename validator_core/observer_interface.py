@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from .validation_flow import ValidationFlowPipeline, ValidationFlowState
+from .tracing import TRACER
 
 class ObserverAction(Enum):
     PAUSE = "pause"
@@ -37,12 +38,22 @@ class ObserverInterface:
         self.flow_controller = flow_controller
         self.command_history: List[ObserverCommand] = []
         self.active_overrides: Dict[str, Any] = {}
+        self.tracer = getattr(flow_controller, 'tracer', TRACER)
         
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger("ObserverInterface")
 
     def execute_command(self, command: ObserverCommand) -> ObserverResponse:
-        """Executes an Observer command and returns response."""
+        """Executes an Observer command inside a trace rooted at its trace_id."""
+        with self.tracer.span(f"observer.{command.action.value}", trace_id=command.trace_id) as span:
+            response = self._dispatch_command(command)
+            span.ok = response.success
+        if not response.trace_id:
+            response.trace_id = span.trace_id
+        return response
+
+    def _dispatch_command(self, command: ObserverCommand) -> ObserverResponse:
+        """Routes a command to its handler."""
         try:
             if command.action == ObserverAction.PAUSE:
                 return self._pause_flow(command)
@@ -171,11 +182,13 @@ class ObserverInterface:
         """Retrieves the validation history trace."""
         limit = command.parameters.get('limit', 10)
         history = self.flow_controller.flow_context.validation_history[-limit:]
+        trace_id = command.parameters.get('trace_id', '')
+        spans = self.tracer.spans(trace_id)[-limit:] if trace_id else []
         self._log_command(command, "History traced")
         return ObserverResponse(
             success=True,
             message="History trace complete",
-            state={'history': history},
+            state={'history': history, 'spans': spans},
             timestamp=datetime.utcnow().isoformat() + 'Z',
             trace_id=command.trace_id
         )
@@ -183,10 +196,7 @@ class ObserverInterface:
     def _log_command(self, command: ObserverCommand, message: str) -> None:
         """Logs the observer command execution."""
         self.command_history.append(command)
-        self.logger.info(
-            f"Observer Command: {command.action.value} | "
-            f"Message: {message}"
-        )
+        self.logger.info("Observer Command: %s | Message: %s", command.action.value, message)
 
 if __name__ == "__main__":
     flow_controller = ValidationFlowPipeline("validation_chain.yaml")
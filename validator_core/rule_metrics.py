@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+
+@dataclass
+class RuleStats:
+    passed: int = 0
+    failed: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        count = self.passed + self.failed
+        return {
+            'passed': self.passed,
+            'failed': self.failed,
+            'count': count,
+            'total_seconds': self.total_seconds,
+            'mean_seconds': self.total_seconds / count if count else 0.0,
+            'max_seconds': self.max_seconds
+        }
+
+
+class RuleMetrics:
+    """Per-rule pass/fail counts and timing for a validator."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rules: Dict[str, RuleStats] = {}
+
+    def record(self, rule: str, passed: bool, seconds: float) -> None:
+        """Records one evaluation of a rule."""
+        with self._lock:
+            stats = self._rules.get(rule)
+            if stats is None:
+                stats = self._rules[rule] = RuleStats()
+            if passed:
+                stats.passed += 1
+            else:
+                stats.failed += 1
+            stats.total_seconds += seconds
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+
+    def record_batch(self, rule: str, passed: int, failed: int, seconds: float) -> None:
+        """Records a batch of evaluations that took ``seconds`` in total."""
+        count = passed + failed
+        if not count:
+            return
+        with self._lock:
+            stats = self._rules.get(rule)
+            if stats is None:
+                stats = self._rules[rule] = RuleStats()
+            stats.passed += passed
+            stats.failed += failed
+            stats.total_seconds += seconds
+            if seconds / count > stats.max_seconds:
+                stats.max_seconds = seconds / count
+
+    def check(self, rule: str, predicate: Callable[..., bool], *args: Any) -> bool:
+        """Evaluates a rule predicate, recording its outcome and duration; errors count as failures."""
+        start = time.perf_counter()
+        passed = False
+        try:
+            passed = bool(predicate(*args))
+            return passed
+        finally:
+            self.record(rule, passed, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns a copy of the statistics for every rule evaluated so far."""
+        with self._lock:
+            return {rule: stats.to_dict() for rule, stats in sorted(self._rules.items())}
+
+    def reset(self) -> None:
+        """Clears all recorded statistics."""
+        with self._lock:
+            self._rules.clear()
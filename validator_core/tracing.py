@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+import functools
+import json
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+DEFAULT_SAMPLE_RATE = 0.01
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("field_trace_span", default=None)
+
+
+def _new_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "sampled", "start", "duration", "ok", "attributes")
+
+    def __init__(self, trace_id: str, parent_id: str, name: str, sampled: bool, attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = _new_id() if sampled else ""
+        self.parent_id = parent_id
+        self.name = name
+        self.sampled = sampled
+        self.start = time.time()
+        self.duration = 0.0
+        self.ok = True
+        self.attributes = attributes
+
+    def set(self, key: str, value: Any) -> None:
+        """Attaches an attribute to the span."""
+        if self.sampled:
+            self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact export form; durations in milliseconds."""
+        record = {
+            'trace': self.trace_id,
+            'span': self.span_id,
+            'parent': self.parent_id,
+            'name': self.name,
+            'ts': round(self.start, 6),
+            'ms': round(self.duration * 1000, 4),
+            'ok': self.ok
+        }
+        if self.attributes:
+            record['attrs'] = self.attributes
+        return record
+
+
+class RingBufferExporter:
+    """Keeps the most recent finished spans in memory."""
+
+    def __init__(self, capacity: int = 4096):
+        self._spans: deque = deque(maxlen=capacity)
+
+    def export(self, span: Span) -> None:
+        self._spans.append(span)
+
+    def spans(self, trace_id: str = "") -> List[Dict[str, Any]]:
+        """Returns buffered spans, oldest first, optionally for one trace."""
+        return [span.to_dict() for span in list(self._spans) if not trace_id or span.trace_id == trace_id]
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+
+class FileExporter:
+    """Appends spans as compact JSON lines, writing in batches."""
+
+    def __init__(self, path: str, batch_size: int = 256):
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._pending.append(span)
+            if len(self._pending) < self.batch_size:
+                return
+            pending, self._pending = self._pending, []
+        self._write(pending)
+
+    def flush(self) -> None:
+        """Writes any buffered spans."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        self._write(pending)
+
+    def _write(self, spans: List[Span]) -> None:
+        if not spans:
+            return
+        lines = "".join(json.dumps(span.to_dict(), separators=(",", ":"), default=str) + "\n" for span in spans)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+
+
+class Tracer:
+    """Context-var based tracer with head sampling.
+
+    The sampling decision is taken once per trace, at its root span; spans
+    nested under an unsampled root cost a context-var lookup. A root started
+    with an explicit trace id (e.g. from an Observer command) is always
+    sampled.
+    """
+
+    def __init__(self, exporter: Optional[Any] = None, sample_rate: float = DEFAULT_SAMPLE_RATE):
+        self.exporter = exporter if exporter is not None else RingBufferExporter()
+        self.sample_rate = sample_rate
+
+    @contextmanager
+    def span(self, name: str, trace_id: str = "", **attributes: Any) -> Iterator[Span]:
+        """Times the enclosed block as a child of the current span, or as a new trace root."""
+        parent = _current_span.get()
+        if parent is not None and (not trace_id or trace_id == parent.trace_id):
+            if not parent.sampled:
+                yield parent
+                return
+            span = Span(parent.trace_id, parent.span_id, name, True, attributes)
+        else:
+            sampled = bool(trace_id) or random.random() < self.sample_rate
+            span = Span(trace_id or _new_id(), "", name, sampled, attributes if sampled else {})
+
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            span.ok = False
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            _current_span.reset(token)
+            if span.sampled:
+                self.exporter.export(span)
+
+    def spans(self, trace_id: str = "") -> List[Dict[str, Any]]:
+        """Buffered spans when the exporter keeps them in memory."""
+        spans = getattr(self.exporter, "spans", None)
+        return spans(trace_id) if spans else []
+
+
+TRACER = Tracer()
+
+
+def current_trace_id() -> str:
+    """Returns the trace id of the active span, or an empty string."""
+    span = _current_span.get()
+    return span.trace_id if span is not None else ""
+
+
+def _outcome(result: Any) -> bool:
+    if isinstance(result, bool):
+        return result
+    for field in ('is_valid', 'is_coherent'):
+        if hasattr(result, field):
+            return bool(getattr(result, field))
+    return True
+
+
+def traced(name: str) -> Callable:
+    """Wraps a method in a span from ``self.tracer``; the span's ``ok`` follows the result."""
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.tracer.span(name) as span:
+                result = method(self, *args, **kwargs)
+                span.ok = _outcome(result)
+                return result
+        return wrapper
+    return decorate
+
+
+def summarize(spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per-name count, failures and total/max milliseconds, slowest total first."""
+    summary: Dict[str, Dict[str, Any]] = {}
+    for span in spans:
+        entry = summary.setdefault(span['name'], {'count': 0, 'failed': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        entry['count'] += 1
+        entry['failed'] += 0 if span['ok'] else 1
+        entry['total_ms'] += span['ms']
+        entry['max_ms'] = max(entry['max_ms'], span['ms'])
+    return dict(sorted(summary.items(), key=lambda item: item[1]['total_ms'], reverse=True))
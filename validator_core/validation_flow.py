@@ -8,6 +8,7 @@ from datetime import datetime
 from enum import Enum
 from .validator import FieldValidator
 from .coherence_check import CrossValidatorCoherence, CoherenceResult
+from .tracing import TRACER, Tracer, current_trace_id, traced
 
 class ValidationFlowState(Enum):
     INITIALIZING = "initializing"
@@ -29,12 +30,13 @@ class ValidationFlowContext:
     timestamp: str
 
 class ValidationFlowPipeline:
-    def __init__(self, config_path: str):
+    def __init__(self, config_path: str, tracer: Optional[Tracer] = None):
         with open(config_path, 'r') as f:
             self.config = yaml.safe_load(f)
         
-        self.validator = FieldValidator(config_path)
-        self.coherence_checker = CrossValidatorCoherence()
+        self.tracer = tracer or TRACER
+        self.validator = FieldValidator(config_path, tracer=self.tracer)
+        self.coherence_checker = CrossValidatorCoherence(tracer=self.tracer)
         self.flow_context = ValidationFlowContext(
             state=ValidationFlowState.INITIALIZING,
             prime_sequence=[],
@@ -71,34 +73,41 @@ class ValidationFlowPipeline:
 
     def process_validation_step(self, step_type: str, params: Dict[str, Any]) -> bool:
         """Processes a single validation step in the flow."""
-        try:
-            self.flow_context.state = ValidationFlowState.VALIDATING
-            
-            if step_type == "prime_sequence":
-                result = self.validator.validate_prime_sequence(params['sequence'])
-            elif step_type == "field_address":
-                result = self.validator.validate_field_address(
-                    params['latitude'],
-                    params['longitude'],
-                    params['temporal']
-                )
-            elif step_type == "gate_transition":
-                result = self.validator.validate_gate_transition(
-                    params['gate'],
-                    params['from_domain'],
-                    params['to_domain']
-                )
-            else:
-                raise ValueError(f"Unknown validation step type: {step_type}")
-
-            self._update_flow_state(result)
-            return result.is_valid
-
-        except Exception as e:
-            self.logger.error(f"Validation step error: {str(e)}")
-            self.flow_context.state = ValidationFlowState.ERROR
-            return False
+        with self.tracer.span(f"flow.{step_type}") as span:
+            try:
+                self.flow_context.state = ValidationFlowState.VALIDATING
+
+                if step_type == "prime_sequence":
+                    result = self.validator.validate_prime_sequence(params['sequence'])
+                elif step_type == "harmonic_ratios":
+                    result = self.validator.validate_harmonic_ratios(params['sequence'])
+                elif step_type == "field_address":
+                    result = self.validator.validate_field_address(
+                        params['latitude'],
+                        params['longitude'],
+                        params['temporal']
+                    )
+                elif step_type == "gate_transition":
+                    result = self.validator.validate_gate_transition(
+                        params['gate'],
+                        params['from_domain'],
+                        params['to_domain']
+                    )
+                else:
+                    raise ValueError(f"Unknown validation step type: {step_type}")
+
+                self._update_flow_state(result)
+                span.ok = result.is_valid
+                return result.is_valid
+
+            except Exception as e:
+                self.logger.error(f"Validation step error: {str(e)}")
+                self.flow_context.state = ValidationFlowState.ERROR
+                span.ok = False
+                span.set('error', str(e))
+                return False
 
+    @traced("flow.field_coherence")
     def check_field_coherence(self) -> CoherenceResult:
         """Checks overall field coherence."""
         try:
@@ -149,7 +158,9 @@ class ValidationFlowPipeline:
     def _update_flow_state(self, validation_result: Any) -> None:
         """Updates flow state based on validation result."""
         if not validation_result.is_valid:
-            if validation_result.alert_level == "critical":
+            if (validation_result.details or {}).get('error_action') == "quarantine_state":
+                self.flow_context.state = ValidationFlowState.QUARANTINED
+            elif validation_result.alert_level == "critical":
                 self.flow_context.state = ValidationFlowState.ERROR
             elif validation_result.alert_level == "high":
                 self.flow_context.state = ValidationFlowState.QUARANTINED
@@ -164,15 +175,17 @@ class ValidationFlowPipeline:
             'timestamp': datetime.utcnow().isoformat() + 'Z',
             'event_type': event_type,
             'result': result,
-            'flow_state': self.flow_context.state.value
+            'flow_state': self.flow_context.state.value,
+            'trace_id': current_trace_id()
         })
 
     def _notify_observer(self, message: str) -> None:
         """Notifies observer of flow state changes."""
         self.logger.info(
-            f"Observer Notification: {message} | "
-            f"State: {self.flow_context.state.value} | "
-            f"Coherence: {self.flow_context.coherence_state}"
+            "Observer Notification: %s | State: %s | Coherence: %s",
+            message,
+            self.flow_context.state.value,
+            self.flow_context.coherence_state
         )
 
     def get_flow_status(self) -> Dict[str, Any]:
@@ -2,9 +2,21 @@
 
 import yaml
 import logging
+import time
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from pathlib import Path
+try:
+    from .harmonic import HarmonicReport, engine_from_config
+    from .rule_metrics import RuleMetrics
+    from .tracing import TRACER, Tracer, traced
+except ImportError:  # run as a script: python3 validator.py
+    from harmonic import HarmonicReport, engine_from_config
+    from rule_metrics import RuleMetrics
+    from tracing import TRACER, Tracer, traced
+
+MAX_REPORTED_VIOLATIONS = 20
 
 @dataclass
 class ValidationResult:
@@ -16,25 +28,34 @@ class ValidationResult:
     details: Dict[str, Any] = None
 
 class FieldValidator:
-    def __init__(self, config_path: str):
+    def __init__(self, config_path: str, metrics: Optional[RuleMetrics] = None, tracer: Optional[Tracer] = None):
         with open(config_path, 'r') as f:
             self.config = yaml.safe_load(f)
+
+        self.metrics = metrics or RuleMetrics()
+        self.tracer = tracer or TRACER
+        self.harmonic_rule = (
+            self.config.get('prime_sequence_validator', {}).get('validation_rules', {}).get('harmonic_ratios', {})
+        )
+        self.harmonic = engine_from_config(self.harmonic_rule)
         
         self.validation_state = {
             "last_valid_state": None,
             "current_prime_sequence": [],
             "active_gates": [],
-            "field_coordinates": None
+            "field_coordinates": None,
+            "quarantined": []
         }
         
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger("FieldValidator")
 
+    @traced("validator.prime_sequence")
     def validate_prime_sequence(self, sequence: List[int]) -> ValidationResult:
         """Validates prime number sequence and progression."""
         try:
             # Check if sequence is strictly increasing
-            if not all(sequence[i] < sequence[i+1] for i in range(len(sequence)-1)):
+            if not self.metrics.check("prime_sequence_validator.prime_progression", self._is_increasing, sequence):
                 return ValidationResult(
                     is_valid=False,
                     error_code="INVALID_PRIME_PROGRESSION",
@@ -44,15 +65,17 @@ class FieldValidator:
                 )
 
             # Verify each number is prime
-            for num in sequence:
-                if not self._is_prime(num):
-                    return ValidationResult(
-                        is_valid=False,
-                        error_code="NON_PRIME_DETECTED",
-                        error_message=f"Non-prime number {num} detected in sequence",
-                        alert_level="critical",
-                        timestamp=datetime.utcnow().isoformat() + 'Z'
-                    )
+            start = time.perf_counter()
+            num = next((num for num in sequence if not self._is_prime(num)), None)
+            self.metrics.record("prime_sequence_validator.primality", num is None, time.perf_counter() - start)
+            if num is not None:
+                return ValidationResult(
+                    is_valid=False,
+                    error_code="NON_PRIME_DETECTED",
+                    error_message=f"Non-prime number {num} detected in sequence",
+                    alert_level="critical",
+                    timestamp=datetime.utcnow().isoformat() + 'Z'
+                )
 
             return ValidationResult(
                 is_valid=True,
@@ -69,12 +92,67 @@ class FieldValidator:
                 timestamp=datetime.utcnow().isoformat() + 'Z'
             )
 
+    @traced("validator.harmonic_ratios")
+    def validate_harmonic_ratios(self, sequence: List[int]) -> ValidationResult:
+        """Validates consecutive prime ratios against the configured harmonic pattern."""
+        try:
+            report = self._check_harmonic(sequence)
+            if not report.coherent:
+                return self._harmonic_failure(sequence, report)
+            return ValidationResult(
+                is_valid=True,
+                timestamp=datetime.utcnow().isoformat() + 'Z',
+                details={"max_deviation": report.max_deviation}
+            )
+
+        except Exception as e:
+            self.logger.error(f"Harmonic ratio validation error: {str(e)}")
+            return ValidationResult(
+                is_valid=False,
+                error_code="VALIDATION_ERROR",
+                error_message=str(e),
+                alert_level="critical",
+                timestamp=datetime.utcnow().isoformat() + 'Z'
+            )
+
+    @traced("validator.harmonic_batch")
+    def validate_harmonic_batch(self, sequences: List[List[int]]) -> List[ValidationResult]:
+        """Validates many sequences' harmonic ratios in one vectorized pass."""
+        try:
+            start = time.perf_counter()
+            reports = self.harmonic.check_batch(sequences)
+            passed = sum(report.coherent for report in reports)
+            self.metrics.record_batch(
+                "prime_sequence_validator.harmonic_ratios", passed, len(reports) - passed, time.perf_counter() - start
+            )
+            timestamp = datetime.utcnow().isoformat() + 'Z'
+            return [
+                ValidationResult(is_valid=True, timestamp=timestamp, details={"max_deviation": report.max_deviation})
+                if report.coherent else self._harmonic_failure(sequence, report)
+                for sequence, report in zip(sequences, reports)
+            ]
+
+        except Exception as e:
+            self.logger.error(f"Harmonic batch validation error: {str(e)}")
+            timestamp = datetime.utcnow().isoformat() + 'Z'
+            return [
+                ValidationResult(
+                    is_valid=False,
+                    error_code="VALIDATION_ERROR",
+                    error_message=str(e),
+                    alert_level="critical",
+                    timestamp=timestamp
+                )
+                for _ in sequences
+            ]
+
+    @traced("validator.field_address")
     def validate_field_address(self, latitude: str, longitude: str, temporal: str) -> ValidationResult:
         """Validates spatiotemporal field address."""
         try:
             # Validate latitude (field coordinate)
             lat_pattern = self.config['field_address_validator']['validation_rules']['latitude']['pattern']
-            if not self._matches_pattern(latitude, lat_pattern):
+            if not self.metrics.check("field_address_validator.latitude", self._matches_pattern, latitude, lat_pattern):
                 return ValidationResult(
                     is_valid=False,
                     error_code="INVALID_FIELD_COORDINATE",
@@ -85,7 +163,7 @@ class FieldValidator:
 
             # Validate longitude (domain alignment)
             long_pattern = self.config['field_address_validator']['validation_rules']['longitude']['pattern']
-            if not self._matches_pattern(longitude, long_pattern):
+            if not self.metrics.check("field_address_validator.longitude", self._matches_pattern, longitude, long_pattern):
                 return ValidationResult(
                     is_valid=False,
                     error_code="INVALID_DOMAIN_ALIGNMENT",
@@ -96,7 +174,7 @@ class FieldValidator:
 
             # Validate temporal marker
             temp_pattern = self.config['field_address_validator']['validation_rules']['temporal']['pattern']
-            if not self._matches_pattern(temporal, temp_pattern):
+            if not self.metrics.check("field_address_validator.temporal", self._matches_pattern, temporal, temp_pattern):
                 return ValidationResult(
                     is_valid=False,
                     error_code="INVALID_TEMPORAL_MARKER",
@@ -120,13 +198,14 @@ class FieldValidator:
                 timestamp=datetime.utcnow().isoformat() + 'Z'
             )
 
+    @traced("validator.gate_transition")
     def validate_gate_transition(self, gate: str, from_domain: str, to_domain: str) -> ValidationResult:
         """Validates alchemical gate transitions."""
         try:
             gate_sequence = self.config['gate_validator']['gate_sequence']
             
             # Check if gate is valid
-            if gate not in gate_sequence:
+            if not self.metrics.check("gate_validator.gate_symbol", gate_sequence.__contains__, gate):
                 return ValidationResult(
                     is_valid=False,
                     error_code="INVALID_GATE",
@@ -136,7 +215,7 @@ class FieldValidator:
                 )
 
             # Check domain compatibility
-            if not self._are_domains_compatible(from_domain, to_domain):
+            if not self.metrics.check("gate_validator.domain_compatibility", self._are_domains_compatible, from_domain, to_domain):
                 return ValidationResult(
                     is_valid=False,
                     error_code="INCOMPATIBLE_DOMAINS",
@@ -146,7 +225,12 @@ class FieldValidator:
                 )
 
             # Check gate sequence integrity
-            if not self._is_valid_gate_sequence(gate, self.validation_state['active_gates']):
+            if not self.metrics.check(
+                "gate_validator.sequence_integrity",
+                self._is_valid_gate_sequence,
+                gate,
+                self.validation_state['active_gates']
+            ):
                 return ValidationResult(
                     is_valid=False,
                     error_code="INVALID_GATE_SEQUENCE",
@@ -170,6 +254,34 @@ class FieldValidator:
                 timestamp=datetime.utcnow().isoformat() + 'Z'
             )
 
+    def _check_harmonic(self, sequence: List[int]) -> HarmonicReport:
+        """Runs the harmonic engine on one sequence and records the rule metric."""
+        start = time.perf_counter()
+        report = self.harmonic.check(sequence)
+        self.metrics.record("prime_sequence_validator.harmonic_ratios", report.coherent, time.perf_counter() - start)
+        return report
+
+    def _harmonic_failure(self, sequence: List[int], report: HarmonicReport) -> ValidationResult:
+        """Builds the failure result for the harmonic_ratios rule, carrying its error action."""
+        first = report.violations[0]
+        return ValidationResult(
+            is_valid=False,
+            error_code="HARMONIC_RATIO_INCOHERENCE",
+            error_message=f"Ratio {sequence[first]}:{sequence[first+1]} breaks the harmonic pattern",
+            alert_level=self.harmonic_rule.get('alert_level', 'high'),
+            timestamp=datetime.utcnow().isoformat() + 'Z',
+            details={
+                "error_action": self.harmonic_rule.get('error_action', 'quarantine_state'),
+                "violations": report.violations[:MAX_REPORTED_VIOLATIONS],
+                "violation_count": len(report.violations),
+                "max_deviation": report.max_deviation
+            }
+        )
+
+    def _is_increasing(self, sequence: List[int]) -> bool:
+        """Helper function to check that a sequence is strictly increasing."""
+        return all(sequence[i] < sequence[i+1] for i in range(len(sequence)-1))
+
     def _is_prime(self, n: int) -> bool:
         """Helper function to check if a number is prime."""
         if n < 2:
@@ -205,16 +317,22 @@ class FieldValidator:
                 'timestamp': result.timestamp,
                 'details': result.details
             }
+        elif (result.details or {}).get('error_action') == 'quarantine_state':
+            self.validation_state['quarantined'].append({
+                'timestamp': result.timestamp,
+                'error_code': result.error_code,
+                'details': result.details
+            })
         self._notify_observer(result)
 
     def _notify_observer(self, result: ValidationResult) -> None:
         """Notifies observer of validation results."""
         if result.alert_level in ['high', 'critical']:
-            self.logger.warning(f"Observer Alert: {result.error_code} - {result.error_message}")
+            self.logger.warning("Observer Alert: %s - %s", result.error_code, result.error_message)
 
 if __name__ == "__main__":
     # Example usage
-    validator = FieldValidator("validator_config.yaml")
+    validator = FieldValidator(str(Path(__file__).with_name("validator_config.yaml")))
     
     # Test prime sequence validation
     result = validator.validate_prime_sequence([2, 3, 5, 7, 11])
@@ -232,3 +350,5 @@ if __name__ == "__main__":
     result = validator.validate_gate_transition("🜂", "OBI-WAN", "BERJAK")
     print(f"Gate Transition Validation: {result}")
 
+    print(f"Rule Metrics: {validator.metrics.snapshot()}")
+